@@ -1,17 +1,356 @@
+from collections.abc import Iterable
+from functools import partial
+from src.Batch import BatchBalancer, BatchItemResult
+from src.Budget import BalanceBudget, BudgetExceeded
+from src.Cache import BalanceCache
+from src.Dedup import DeduplicatingBalancer
+from src.Incremental import IncrementalBalancer
 from src.LinearEquationsSystem import Generator
+from src.Mechanism import Mechanism, ReactionReport
+from src.Parser import EquationParser
+from src.Result import BalanceResult
+from src.Solver import EquationSolution, ReactionBasis, Solver
 from utils.ChemicalEquationRewriter import Rewriter
+from utils.Metrics import StageMetrics, instrumentation
 
+balance_cache: BalanceCache = BalanceCache(max_size=1024)
 
-def execute(input_chemical_equation: str) -> str:
 
-    linear_equations_system_object: object = Generator.FileMaker(
+def configureCache(max_size: int) -> None:
+
+    # resizing drops the cached results, 0 disables the cache
+    balance_cache.max_size = max_size
+    balance_cache.clear()
+
+
+def cacheStats() -> dict:
+    return balance_cache.stats()
+
+
+result_store = None
+"""ResultStore: The persistent result store, None until configureStore is called."""
+
+
+def configureStore(database_path: str = None) -> None:
+
+    # opt-in persistent results shared across processes; sqlite3 is only
+    # imported when a store is configured, None closes the store
+    global result_store
+    if result_store is not None:
+        result_store.close()
+        result_store = None
+    if database_path is not None:
+        from src.Store import ResultStore
+
+        result_store = ResultStore(database_path=database_path)
+
+
+balance_budget: BalanceBudget = None
+"""BalanceBudget: The limits applied to every balance, None until configureBudget is called."""
+
+
+def configureBudget(
+    max_formula_length: int = None,
+    max_atom_count: int = None,
+    max_species_count: int = None,
+    max_seconds: float = None,
+) -> None:
+
+    # limits checked cooperatively by the lexer and the solver; a balance over
+    # budget raises BudgetExceeded, all None removes the limits
+    global balance_budget
+    limits: tuple = (max_formula_length, max_atom_count, max_species_count, max_seconds)
+    balance_budget = (
+        None
+        if all(limit is None for limit in limits)
+        else BalanceBudget(
+            max_formula_length=max_formula_length,
+            max_atom_count=max_atom_count,
+            max_species_count=max_species_count,
+            max_seconds=max_seconds,
+        )
+    )
+
+
+def solveChemicalEquation(
+    input_chemical_equation: str,
+    use_cache: bool,
+    running_budget: BalanceBudget,
+    stage_metrics: StageMetrics,
+) -> tuple[EquationSolution, EquationParser, int]:
+
+    # the cache, parse and solve stages shared by execute() and balance(); the
+    # equation is parsed once and the parser shared with the Rewriter (None on
+    # a text cache hit), the nullity is -1 on any cache hit; only nullity 0
+    # or 1 is cached, which BalanceResult relies on to call a hit unambiguous
+    equation_parser_object: EquationParser = None
+    nullity: int = -1
+    equation_solution: EquationSolution = (
+        balance_cache.getByText(chemical_equation=input_chemical_equation)
+        if use_cache
+        else None
+    )
+    stage_metrics.mark(stage="cache")
+    if equation_solution is None:
+        equation_parser_object = EquationParser(
+            chemical_equation=input_chemical_equation, budget=running_budget
+        )
+        equation_parser_object.parse()
+        generator_object: Generator = Generator(
+            chemical_equation=input_chemical_equation,
+            equation_parser=equation_parser_object,
+        )
+        stage_metrics.mark(stage="parse")
+        stage_metrics.count(
+            name="species_count",
+            value=len(generator_object.reactants_list)
+            + len(generator_object.products_list),
+        )
+        stage_metrics.count(
+            name="element_count", value=len(equation_parser_object.present_elements)
+        )
+
+        equation_solution = (
+            balance_cache.getByGenerator(generator=generator_object)
+            if use_cache
+            else None
+        )
+        if equation_solution is None and use_cache and result_store is not None:
+            equation_solution = result_store.getByGenerator(generator=generator_object)
+            if equation_solution is not None:
+                balance_cache.put(
+                    chemical_equation=input_chemical_equation,
+                    generator=generator_object,
+                    equation_solution=equation_solution,
+                )
+        stage_metrics.mark(stage="cache")
+        if equation_solution is None:
+            solver_object: Solver = Solver(
+                generator=generator_object, budget=running_budget
+            )
+            equation_solution = solver_object.execute()
+            nullity = solver_object.nullity
+            stage_metrics.mark(stage="solve")
+            stage_metrics.count(name="nullity", value=solver_object.nullity)
+            stage_metrics.count(
+                name="matrix_rank",
+                value=len(solver_object.species_list) - solver_object.nullity,
+            )
+            # an ambiguous balance depends on the species order, so it is not shared
+            if use_cache and solver_object.nullity in (0, 1):
+                balance_cache.put(
+                    chemical_equation=input_chemical_equation,
+                    generator=generator_object,
+                    equation_solution=equation_solution,
+                )
+                if result_store is not None:
+                    result_store.put(
+                        generator=generator_object, equation_solution=equation_solution
+                    )
+                stage_metrics.mark(stage="cache")
+    stage_metrics.count(
+        name="cache_hit", value=int("solve" not in stage_metrics.stage_timings)
+    )
+    return equation_solution, equation_parser_object, nullity
+
+
+def execute(
+    input_chemical_equation: str,
+    export_file_path: str = None,
+    use_cache: bool = True,
+    budget: BalanceBudget = None,
+) -> str:
+
+    # stage timings and counters are only recorded once an exporter is added to
+    # CREB.instrumentation, otherwise stage_metrics is a shared no-op object
+    stage_metrics: StageMetrics = instrumentation.start(
         chemical_equation=input_chemical_equation
     )
-    linear_equations_system_object.generateEquationAndSaveSolverFile()
-    linear_equations_system_object.executeSolverFile()
-    return Rewriter().executeRewriter(chemical_equation=input_chemical_equation)
+    # a given budget replaces the configured one for this call only
+    if budget is None:
+        budget = balance_budget
+    running_budget: BalanceBudget = budget.start() if budget is not None else None
+    try:
+        equation_solution, equation_parser_object, nullity = solveChemicalEquation(
+            input_chemical_equation=input_chemical_equation,
+            use_cache=use_cache,
+            running_budget=running_budget,
+            stage_metrics=stage_metrics,
+        )
+
+        # file persistence is opt-in, the result itself never touches the disk
+        if export_file_path is not None:
+            equation_solution.exportJson(file_path=export_file_path)
+            stage_metrics.mark(stage="export")
+        # an ambiguous or sign-mixed balance is an error here, as in balance()
+        BalanceResult.checkBalanced(
+            integer_coefficients=equation_solution.integer_coefficients,
+            error_msg=equation_solution.error_msg,
+            nullity=nullity,
+        )
+
+        balanced_equation: str = Rewriter().executeRewriter(
+            chemical_equation=input_chemical_equation,
+            equation_solution=equation_solution.equation_solution,
+            equation_parser=equation_parser_object,
+        )
+        stage_metrics.mark(stage="rewrite")
+        return balanced_equation
+    except Exception as error:
+        stage_metrics.fail(error_msg=f"{type(error).__name__}: {error}")
+        raise
+    finally:
+        instrumentation.finish(stage_metrics=stage_metrics)
+
+
+def balance(
+    input_chemical_equation: str, use_cache: bool = True, budget: BalanceBudget = None
+) -> BalanceResult:
+
+    # the structured counterpart of execute(): species, sides, integer and
+    # rational coefficients and a status, with no string built unless
+    # BalanceResult.render() is called; errors are reported in the status
+    stage_metrics: StageMetrics = instrumentation.start(
+        chemical_equation=input_chemical_equation
+    )
+    if budget is None:
+        budget = balance_budget
+    running_budget: BalanceBudget = budget.start() if budget is not None else None
+    try:
+        equation_solution, _, nullity = solveChemicalEquation(
+            input_chemical_equation=input_chemical_equation,
+            use_cache=use_cache,
+            running_budget=running_budget,
+            stage_metrics=stage_metrics,
+        )
+        if equation_solution.error_msg:
+            stage_metrics.fail(error_msg=f"ValueError: {equation_solution.error_msg}")
+        return BalanceResult.fromSolution(
+            chemical_equation=input_chemical_equation,
+            equation_solution=equation_solution,
+            nullity=nullity,
+        )
+    except BudgetExceeded as error:
+        stage_metrics.fail(error_msg=f"{type(error).__name__}: {error}")
+        return BalanceResult.fromError(
+            chemical_equation=input_chemical_equation,
+            status="budget_exceeded",
+            error_msg=str(error),
+        )
+    except ValueError as error:
+        stage_metrics.fail(error_msg=f"{type(error).__name__}: {error}")
+        return BalanceResult.fromError(
+            chemical_equation=input_chemical_equation, status="invalid", error_msg=str(error)
+        )
+    finally:
+        instrumentation.finish(stage_metrics=stage_metrics)
+
+
+def enumerateReactions(
+    input_chemical_equation: str, max_reactions: int = 256
+) -> ReactionBasis:
+
+    # every minimal non-negative balance instead of the single (possibly
+    # parametric) one execute() picks when the equation is underdetermined
+    return Solver(
+        generator=Generator(chemical_equation=input_chemical_equation)
+    ).enumerateReactions(max_reactions=max_reactions)
+
+
+async def executeAsync(
+    input_chemical_equation: str,
+    executor: object = None,
+    export_file_path: str = None,
+    use_cache: bool = True,
+    budget: BalanceBudget = None,
+) -> str:
+
+    # execute() only shares the locked cache and store, the configured budget
+    # (read, never changed) and the metrics exporters, so it can run on any
+    # concurrent.futures executor (None for the loop's default thread pool); a
+    # ProcessPoolExecutor sidesteps the GIL but uses the configuration of its
+    # own worker processes. A budget starts when execute() does, so the time
+    # spent waiting for the executor is not counted
+    import asyncio
+
+    return await asyncio.get_running_loop().run_in_executor(
+        executor,
+        partial(
+            execute,
+            input_chemical_equation=input_chemical_equation,
+            export_file_path=export_file_path,
+            use_cache=use_cache,
+            budget=budget,
+        ),
+    )
+
+
+def executeMany(
+    input_chemical_equations: Iterable[str],
+    workers: int = None,
+    chunk_size: int = 64,
+    deduplicate: bool = False,
+    return_stats: bool = False,
+) -> list[BatchItemResult] | tuple[list[BatchItemResult], dict]:
+
+    # each equation is balanced by execute() in a worker process; failures are
+    # reported per item through BatchItemResult.error_msg. deduplicate parses
+    # the whole batch first and solves each distinct composition matrix once,
+    # with the configured cache, store and budget like execute(); return_stats
+    # also returns its counters (see DeduplicatingBalancer.stats)
+    if return_stats and not deduplicate:
+        raise ValueError("return_stats needs deduplicate=True")
+    if deduplicate:
+        deduplicating_balancer: DeduplicatingBalancer = DeduplicatingBalancer(
+            workers=workers,
+            chunk_size=chunk_size,
+            balance_cache=balance_cache,
+            result_store=result_store,
+            budget=balance_budget,
+        )
+        results_list: list[BatchItemResult] = deduplicating_balancer.execute(
+            chemical_equations=input_chemical_equations
+        )
+        if return_stats:
+            return results_list, deduplicating_balancer.stats()
+        return results_list
+    return BatchBalancer(
+        balance_function=execute, workers=workers, chunk_size=chunk_size
+    ).execute(chemical_equations=input_chemical_equations)
+
+
+def executeMechanism(input_chemical_equations: Iterable[str]) -> list[ReactionReport]:
+
+    # species shared between reactions are parsed once for the whole mechanism
+    return Mechanism(chemical_equations=list(input_chemical_equations)).execute()
 
 
 # a simple usage
 # print(execute(input_chemical_equation="H2 + O2 = H2O"))
-# should out put : (H2) + 1/2 (O2) = (H2O)
\ No newline at end of file
+# should out put : (H2) + 1/2 (O2) = (H2O)
+# balance_result = balance(input_chemical_equation="H2 + O2 = H2O")
+# print(balance_result.status, balance_result.integer_coefficients, balance_result.toJson())
+# print(executeMany(input_chemical_equations=["H2 + O2 = H2O", "Fe + O2 = Fe2O3"]))
+# print(executeMany(input_chemical_equations=["H2 + O2 = H2O", "O2 + H2 = H2O"], deduplicate=True, return_stats=True))
+# configureStore(database_path="results.sqlite")
+# configureBudget(max_formula_length=256, max_atom_count=10**6, max_species_count=64, max_seconds=0.5)
+# print(enumerateReactions(input_chemical_equation="C + O2 = CO + CO2"))
+# incremental_balancer = IncrementalBalancer.fromEquation(chemical_equation="H2 + O2 = H2O")
+# incremental_balancer.addSpecies(chemical_formula="H2O2", side="product")
+# print(incremental_balancer.execute())
+# print(asyncio.run(executeAsync(input_chemical_equation="H2 + O2 = H2O")))
+# print(executeMechanism(input_chemical_equations=["2 H2 + O2 = 2 H2O", "H + O2 = OH + O"]))
+
+
+# command-line usage (one equation per line, one JSON result per line) :
+# cat equations.txt | python CREB.py --workers 4 > results.jsonl
+# long-running local server (one JSON request and response per line) :
+# python -m utils.Server --port 8765
+if __name__ == "__main__":
+    import sys
+    from utils.CommandLine import runCommandLine
+
+    # balance through the importable CREB module so worker processes can pickle it
+    import CREB
+
+    sys.exit(runCommandLine(argv=sys.argv[1:], balance_function=CREB.execute))
@@ -0,0 +1,266 @@
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from benchmarks.Corpus import corpus_dict
+from src.LinearEquationsSystem import Generator
+from src.Parser import EquationParser
+from src.Solver import Solver
+from utils.ChemicalEquationRewriter import Rewriter
+
+stage_names: list[str] = ["parse", "matrix", "solve", "rewrite"]
+"""list[str]: The timed stages of the balance pipeline, in order."""
+
+# region Benchmark
+
+
+class Benchmark:
+    """
+    A class to time the stages of the balance pipeline over the graded corpus.
+
+    Attributes:
+        grades_list : list[str]
+            The corpus grades to run.
+        repeat : int
+            Number of timed passes over each equation.
+        backend : str
+            The solver backend ("native", "modular" or "sympy").
+        timings_dict : dict[str, dict[str, list[float]]]
+            Seconds per stage (and "total") of every timed pass, per grade.
+        peak_memory : int
+            Peak traced memory, in bytes, of one pass over the corpus.
+
+    Methods:
+        runEquation(chemical_equation: str) -> dict[str, float]:
+            Balances one equation and returns the seconds spent in each stage.
+        run() -> None:
+            Times every equation of the selected grades.
+        measurePeakMemory() -> None:
+            Measures the peak memory of one pass over the selected grades.
+        report() -> dict:
+            Returns percentiles, throughput and peak memory.
+    """
+
+    def __init__(
+        self, grades_list: list[str] = None, repeat: int = 20, backend: str = "native"
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the Benchmark object.
+
+        Parameters:
+            grades_list : list[str]
+                The corpus grades to run, all of them by default.
+            repeat : int
+                Number of timed passes over each equation.
+            backend : str
+                The solver backend ("native", "modular" or "sympy").
+        """
+        self.grades_list: list[str] = grades_list or list(corpus_dict)
+        self.repeat: int = repeat
+        self.backend: str = backend
+        self.timings_dict: dict[str, dict[str, list[float]]] = {}
+        self.peak_memory: int = 0
+
+    def runEquation(self, chemical_equation: str) -> dict[str, float]:
+        """
+        Balances one equation and returns the seconds spent in each stage.
+        The "matrix" stage builds the sparse composition matrix the native and
+        modular backends solve from, and "solve" reuses it; the sympy backend
+        builds its own dense matrix, which is counted in "solve".
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation to be balanced.
+
+        Returns:
+            dict[str, float]: Seconds per stage.
+        """
+        timer = time.perf_counter
+        start_time: float = timer()
+        equation_parser: EquationParser = EquationParser(
+            chemical_equation=chemical_equation
+        )
+        equation_parser.parse()
+        parse_time: float = timer()
+
+        solver_object: Solver = Solver(
+            generator=Generator(
+                chemical_equation=chemical_equation, equation_parser=equation_parser
+            ),
+            backend=self.backend,
+        )
+        solver_object.buildSparseCompositionMatrix()
+        matrix_time: float = timer()
+
+        equation_solution: tuple = solver_object.solve()
+        solve_time: float = timer()
+
+        Rewriter().executeRewriter(
+            chemical_equation=chemical_equation,
+            equation_solution=equation_solution,
+            equation_parser=equation_parser,
+        )
+        rewrite_time: float = timer()
+
+        return {
+            "parse": parse_time - start_time,
+            "matrix": matrix_time - parse_time,
+            "solve": solve_time - matrix_time,
+            "rewrite": rewrite_time - solve_time,
+        }
+
+    def run(self) -> None:
+        """
+        Times every equation of the selected grades, after one warm-up pass.
+        """
+        for grade in self.grades_list:
+            grade_timings: dict[str, list[float]] = {
+                stage: [] for stage in stage_names + ["total"]
+            }
+            for chemical_equation in corpus_dict[grade]:
+                self.runEquation(chemical_equation=chemical_equation)
+                for _ in range(self.repeat):
+                    stage_timings: dict[str, float] = self.runEquation(
+                        chemical_equation=chemical_equation
+                    )
+                    for stage, seconds in stage_timings.items():
+                        grade_timings[stage].append(seconds)
+                    grade_timings["total"].append(sum(stage_timings.values()))
+            self.timings_dict[grade] = grade_timings
+
+    def measurePeakMemory(self) -> None:
+        """
+        Measures the peak memory of one pass over the selected grades. It is a
+        separate pass because tracing memory slows every allocation down.
+        """
+        tracemalloc.start()
+        for grade in self.grades_list:
+            for chemical_equation in corpus_dict[grade]:
+                self.runEquation(chemical_equation=chemical_equation)
+        self.peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    @staticmethod
+    def percentile(sorted_values: list[float], percent: float) -> float:
+        """
+        Returns the nearest-rank percentile of already sorted values.
+        """
+        rank: int = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+        return sorted_values[rank - 1]
+
+    def report(self) -> dict:
+        """
+        Returns the latency percentiles (microseconds) of each stage, the
+        throughput (equations/s) of each grade and the peak memory.
+
+        Returns:
+            dict: The benchmark report, JSON-serializable.
+        """
+        grades_report: dict[str, dict] = {}
+        for grade, grade_timings in self.timings_dict.items():
+            stages_report: dict[str, dict[str, float]] = {}
+            for stage, timings_list in grade_timings.items():
+                sorted_timings: list[float] = sorted(timings_list)
+                stages_report[stage] = {
+                    f"p{percent}": round(
+                        self.percentile(sorted_timings, percent) * 1e6, 2
+                    )
+                    for percent in (50, 90, 99)
+                }
+            total_seconds: float = sum(grade_timings["total"])
+            grades_report[grade] = {
+                "equations": len(grade_timings["total"]),
+                "throughput": round(len(grade_timings["total"]) / total_seconds, 1),
+                "stages": stages_report,
+            }
+        return {
+            "python": platform.python_version(),
+            "backend": self.backend,
+            "repeat": self.repeat,
+            "peak_memory": self.peak_memory,
+            "grades": grades_report,
+        }
+
+
+# end region
+
+# region Baseline Comparison
+
+
+def compareReports(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compares the median latency of every grade and stage with a baseline.
+
+    Parameters:
+        report : dict
+            The current benchmark report.
+        baseline : dict
+            A report saved by an earlier run.
+        tolerance : float
+            Allowed relative slowdown, e.g. 0.2 for 20 %.
+
+    Returns:
+        list[str]: One line per regression, empty when there is none.
+    """
+    regressions_list: list[str] = []
+    for grade, grade_report in report["grades"].items():
+        baseline_grade: dict = baseline["grades"].get(grade)
+        if baseline_grade is None:
+            continue
+        for stage, stage_report in grade_report["stages"].items():
+            # stages renamed since the baseline was saved are not compared
+            if stage not in baseline_grade["stages"]:
+                continue
+            baseline_median: float = baseline_grade["stages"][stage]["p50"]
+            current_median: float = stage_report["p50"]
+            if baseline_median and current_median > baseline_median * (1 + tolerance):
+                regressions_list.append(
+                    f"{grade}/{stage}: p50 {current_median} us vs {baseline_median} us "
+                    f"(+{(current_median / baseline_median - 1) * 100:.0f} %)"
+                )
+    return regressions_list
+
+
+# end region
+
+
+# usage (from the project folder) :
+# python -m benchmarks.Benchmark --save baseline.json
+# python -m benchmarks.Benchmark --compare baseline.json
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Time the CREB balance pipeline stage by stage over the graded corpus."
+    )
+    argument_parser.add_argument("--grades", nargs="*", choices=list(corpus_dict))
+    argument_parser.add_argument("--repeat", type=int, default=20)
+    argument_parser.add_argument("--backend", default="native", choices=["native", "modular", "sympy"])
+    argument_parser.add_argument("--save", help="write the report to this JSON file")
+    argument_parser.add_argument("--compare", help="compare with a report saved earlier")
+    argument_parser.add_argument("--tolerance", type=float, default=0.2)
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    benchmark: Benchmark = Benchmark(
+        grades_list=arguments.grades, repeat=arguments.repeat, backend=arguments.backend
+    )
+    benchmark.run()
+    benchmark.measurePeakMemory()
+    benchmark_report: dict = benchmark.report()
+    print(json.dumps(benchmark_report, indent=2))
+
+    if arguments.save:
+        with open(arguments.save, "w") as report_file:
+            json.dump(benchmark_report, report_file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare, "r") as baseline_file:
+            regressions_list: list[str] = compareReports(
+                report=benchmark_report,
+                baseline=json.load(baseline_file),
+                tolerance=arguments.tolerance,
+            )
+        for regression in regressions_list:
+            print(f"regression: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions_list else 0)
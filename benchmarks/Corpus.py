@@ -0,0 +1,87 @@
+from utils import Assets
+
+# region Benchmark Corpus
+
+
+def chainEquation(elements_count: int) -> str:
+    """
+    Returns an equation with one binary reactant per pair of neighbouring
+    elements of Assets.elements_list and a single product holding all of
+    them, e.g. "HHe + He2Li2 = HHe5Li4" for three elements. The reactant
+    columns of its composition matrix are independent, so the nullspace has
+    exactly one dimension however many species there are.
+
+    Parameters:
+        elements_count : int
+            Number of elements, one more than the number of reactants.
+
+    Returns:
+        str: The chemical equation.
+    """
+    elements_list: list[str] = Assets.elements_list[:elements_count]
+    product_counts: list[int] = [0] * elements_count
+    reactants_list: list[str] = []
+    for index in range(elements_count - 1):
+        first_count: int = index % 3 + 1
+        second_count: int = index % 2 + 1
+        coefficient: int = index % 4 + 1
+        product_counts[index] += coefficient * first_count
+        product_counts[index + 1] += coefficient * second_count
+        reactants_list.append(
+            f"{elements_list[index]}{first_count if first_count > 1 else ''}"
+            f"{elements_list[index + 1]}{second_count if second_count > 1 else ''}"
+        )
+    return (
+        " + ".join(reactants_list)
+        + " = "
+        + "".join(
+            f"{element}{count if count > 1 else ''}"
+            for element, count in zip(elements_list, product_counts)
+        )
+    )
+
+
+corpus_dict: dict[str, list[str]] = {
+    "trivial": [
+        "H2 + O2 = H2O",
+        "Fe + O2 = Fe2O3",
+        "N2 + H2 = NH3",
+        "Na + Cl2 = NaCl",
+    ],
+    "combustion": [
+        "CH4 + O2 = CO2 + H2O",
+        "C3H8 + O2 = CO2 + H2O",
+        "C8H18 + O2 = CO2 + H2O",
+        "C2H5OH + O2 = CO2 + H2O",
+        "C6H12O6 + O2 = CO2 + H2O",
+        "C12H22O11 + O2 = CO2 + H2O",
+        "C57H110O6 + O2 = CO2 + H2O",
+    ],
+    "redox": [
+        "KMnO4 + HCl = KCl + MnCl2 + H2O + Cl2",
+        "K2Cr2O7 + HCl = KCl + CrCl3 + H2O + Cl2",
+        "Cu + HNO3 = Cu(NO3)2 + NO + H2O",
+        "FeSO4 + KMnO4 + H2SO4 = Fe2(SO4)3 + K2SO4 + MnSO4 + H2O",
+        "Cr2(SO4)3 + KI + KIO3 + H2O = Cr(OH)3 + K2SO4 + I2",
+        "K4Fe(CN)6 + KMnO4 + H2SO4 = KHSO4 + Fe2(SO4)3 + MnSO4 + HNO3 + CO2 + H2O",
+    ],
+    "nested": [
+        "Ca3(PO4)2 + SiO2 + C = CaSiO3 + P4 + CO",
+        "Al2(SO4)3 + Ca(OH)2 = Al(OH)3 + CaSO4",
+        "(NH4)2Cr2O7 = Cr2O3 + N2 + H2O",
+        "Ca5(PO4)3(OH) + H3PO4 = Ca(H2PO4)2 + H2O",
+        "((CH3)3Si)2O + O2 = SiO2 + CO2 + H2O",
+        "Mg(Al(OH)4)2 + HCl = MgCl2 + AlCl3 + H2O",
+        "(C6H10O5)100 + O2 = CO2 + H2O",
+        "((C2H4)500)20 + O2 = CO2 + H2O",
+    ],
+    "large": [
+        # one species per element, so the balance stays unique at any size
+        chainEquation(elements_count=60),
+        chainEquation(elements_count=len(Assets.elements_list)),
+    ],
+}
+"""dict[str, list[str]]: Benchmark equations graded from trivial to large; every one of them has a unique, positive balance."""
+
+
+# end region
@@ -0,0 +1,267 @@
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from itertools import islice
+from src.Budget import BudgetExceeded
+
+# region Batch Item Result
+
+
+class BatchItemResult:
+    """
+    A class to hold the outcome of balancing one equation of a batch.
+
+    Attributes:
+        index : int
+            Position of the equation in the input batch.
+        chemical_equation : str
+            The chemical equation as given.
+        balanced_equation : str
+            The balanced chemical equation, empty when balancing failed.
+        error_msg : str
+            The error message, empty when balancing succeeded.
+        budget_exceeded : dict
+            The limit hit (see BudgetExceeded.toDict), None when the balance
+            stayed within its budget.
+
+    Methods:
+        toDict() -> dict:
+            Returns the result as a JSON-serializable dictionary.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        chemical_equation: str,
+        balanced_equation: str = "",
+        error_msg: str = "",
+        budget_exceeded: dict = None,
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the BatchItemResult object.
+
+        Parameters:
+            index : int
+                Position of the equation in the input batch.
+            chemical_equation : str
+                The chemical equation as given.
+            balanced_equation : str
+                The balanced chemical equation, empty when balancing failed.
+            error_msg : str
+                The error message, empty when balancing succeeded.
+            budget_exceeded : dict
+                The limit hit, None when the balance stayed within its budget.
+        """
+        self.index: int = index
+        self.chemical_equation: str = chemical_equation
+        self.balanced_equation: str = balanced_equation
+        self.error_msg: str = error_msg
+        self.budget_exceeded: dict = budget_exceeded
+
+    def toDict(self) -> dict:
+        """
+        Returns the result as a JSON-serializable dictionary.
+
+        Returns:
+            dict: The index, the equation, the balanced equation and the error,
+            with the limit hit under "budget_exceeded" when there is one.
+        """
+        result_dict: dict = {
+            "index": self.index,
+            "chemical_equation": self.chemical_equation,
+            "balanced_equation": self.balanced_equation,
+            "error_msg": self.error_msg,
+        }
+        if self.budget_exceeded is not None:
+            result_dict["budget_exceeded"] = self.budget_exceeded
+        return result_dict
+
+    def __repr__(self) -> str:
+        if self.error_msg:
+            return f"BatchItemResult({self.index}, error={self.error_msg!r})"
+        return f"BatchItemResult({self.index}, {self.balanced_equation!r})"
+
+
+# end region
+
+# region Batch Balancer
+
+
+def balanceSafely(
+    balance_function: Callable[[str], str], indexed_equation: tuple[int, str]
+) -> BatchItemResult:
+    """
+    Balances one equation and turns any error into a reported result, so a
+    single bad input never aborts the batch.
+
+    Parameters:
+        balance_function : Callable[[str], str]
+            The function balancing a single equation (e.g. CREB.execute).
+        indexed_equation : tuple[int, str]
+            Position of the equation in the batch and the equation itself.
+
+    Returns:
+        BatchItemResult: The outcome for this equation.
+    """
+    index, chemical_equation = indexed_equation
+    try:
+        balanced_equation: str = balance_function(chemical_equation)
+    except Exception as error:
+        return BatchItemResult(
+            index=index,
+            chemical_equation=chemical_equation,
+            error_msg=f"{type(error).__name__}: {error}",
+            budget_exceeded=error.toDict() if isinstance(error, BudgetExceeded) else None,
+        )
+    return BatchItemResult(
+        index=index,
+        chemical_equation=chemical_equation,
+        balanced_equation=balanced_equation,
+    )
+
+
+def balanceChunk(
+    balance_function: Callable[[str], str], indexed_equations: list[tuple[int, str]]
+) -> list[BatchItemResult]:
+    """
+    Balances a chunk of equations in one worker call.
+
+    Parameters:
+        balance_function : Callable[[str], str]
+            The function balancing a single equation.
+        indexed_equations : list[tuple[int, str]]
+            Positions in the batch and equations of the chunk.
+
+    Returns:
+        list[BatchItemResult]: The outcomes of the chunk, in order.
+    """
+    return [
+        balanceSafely(balance_function, indexed_equation)
+        for indexed_equation in indexed_equations
+    ]
+
+
+def mapChunks(
+    chunk_function: Callable[[list], list], items: Iterable, workers: int, chunk_size: int
+) -> Iterator:
+    """
+    Applies a function to consecutive chunks of items, over a process pool
+    when workers > 1, and yields its outputs in input order as soon as their
+    chunk is done. The input is consumed chunk by chunk and at most two chunks
+    per worker are in flight, so memory stays bounded however long the input
+    is.
+
+    Parameters:
+        chunk_function : Callable[[list], list]
+            Returns one output per item of a chunk; it must be picklable, i.e.
+            defined at module level (or a partial of such a function).
+        items : Iterable
+            The items to process.
+        workers : int
+            Number of worker processes; 1 processes in the calling process.
+        chunk_size : int
+            Number of items sent to a worker at once.
+
+    Yields:
+        object: One output per item, in input order.
+    """
+    items_iterator: Iterator = iter(items)
+    chunks: Iterator[list] = iter(lambda: list(islice(items_iterator, chunk_size)), [])
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from chunk_function(chunk)
+        return
+
+    # imported here since multiprocessing is slow to import and a single
+    # balance never needs it
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending_chunks: deque = deque()
+        for chunk in chunks:
+            pending_chunks.append(executor.submit(chunk_function, chunk))
+            if len(pending_chunks) >= 2 * workers:
+                yield from pending_chunks.popleft().result()
+        while pending_chunks:
+            yield from pending_chunks.popleft().result()
+
+
+class BatchBalancer:
+    """
+    A class to balance many chemical equations over a process pool.
+
+    Attributes:
+        balance_function : Callable[[str], str]
+            The function balancing a single equation; it must be picklable,
+            i.e. defined at module level.
+        workers : int
+            Number of worker processes; 1 balances in the calling process.
+        chunk_size : int
+            Number of equations sent to a worker at once.
+
+    Methods:
+        iterate(chemical_equations: Iterable[str]) -> Iterator[BatchItemResult]:
+            Balances the equations and yields the results in input order.
+        execute(chemical_equations: Iterable[str]) -> list[BatchItemResult]:
+            Balances the equations and returns the results in input order.
+    """
+
+    def __init__(
+        self,
+        balance_function: Callable[[str], str],
+        workers: int = None,
+        chunk_size: int = 64,
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the BatchBalancer object.
+
+        Parameters:
+            balance_function : Callable[[str], str]
+                The function balancing a single equation.
+            workers : int
+                Number of worker processes, defaults to the number of CPUs.
+            chunk_size : int
+                Number of equations sent to a worker at once.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.balance_function: Callable[[str], str] = balance_function
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunk_size: int = chunk_size
+
+    def iterate(self, chemical_equations: Iterable[str]) -> Iterator[BatchItemResult]:
+        """
+        Balances the equations and yields the results in input order as soon
+        as their chunk is done, with bounded memory (see mapChunks).
+
+        Parameters:
+            chemical_equations : Iterable[str]
+                The chemical equations to be balanced.
+
+        Yields:
+            BatchItemResult: One result per equation, in input order.
+        """
+        yield from mapChunks(
+            chunk_function=partial(balanceChunk, self.balance_function),
+            items=enumerate(chemical_equations),
+            workers=self.workers,
+            chunk_size=self.chunk_size,
+        )
+
+    def execute(self, chemical_equations: Iterable[str]) -> list[BatchItemResult]:
+        """
+        Balances the equations and returns the results in input order.
+
+        Parameters:
+            chemical_equations : Iterable[str]
+                The chemical equations to be balanced.
+
+        Returns:
+            list[BatchItemResult]: One result per equation, in input order.
+        """
+        return list(self.iterate(chemical_equations=chemical_equations))
+
+
+# end region
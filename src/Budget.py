@@ -0,0 +1,202 @@
+import time
+
+# region Budget Exceeded
+
+
+class BudgetExceeded(ValueError):
+    """
+    The error raised when a balance goes over one of the limits of its
+    BalanceBudget. It is a ValueError, so callers handling invalid equations
+    handle it too, and it carries the limit that was hit.
+
+    Attributes:
+        limit : str
+            The limit hit: "formula_length", "atom_count", "species_count" or
+            "seconds".
+        value : float
+            The value that went over the limit.
+        maximum : float
+            The limit itself.
+        stage : str
+            The stage that stopped: "parse" or "solve".
+
+    Methods:
+        toDict() -> dict:
+            Returns the error as a JSON-serializable dictionary.
+    """
+
+    def __init__(self, limit: str, value: float, maximum: float, stage: str) -> None:
+        """
+        Constructs all the necessary attributes for the BudgetExceeded object.
+
+        Parameters:
+            limit : str
+                The limit hit.
+            value : float
+                The value that went over the limit.
+            maximum : float
+                The limit itself.
+            stage : str
+                The stage that stopped.
+        """
+        super().__init__(f"Budget exceeded: {limit} {value} > {maximum} during {stage}")
+        self.limit: str = limit
+        self.value: float = value
+        self.maximum: float = maximum
+        self.stage: str = stage
+
+    def toDict(self) -> dict:
+        """
+        Returns the error as a JSON-serializable dictionary.
+
+        Returns:
+            dict: The limit, the value, the maximum and the stage.
+        """
+        return {
+            "limit": self.limit,
+            "value": self.value,
+            "maximum": self.maximum,
+            "stage": self.stage,
+        }
+
+    def __reduce__(self) -> tuple:
+        # keeps the attributes when the error crosses a process boundary
+        return (type(self), (self.limit, self.value, self.maximum, self.stage))
+
+
+# end region
+
+# region Balance Budget
+
+
+class BalanceBudget:
+    """
+    A class to bound the work spent on one balance.
+
+    The stages check the budget cooperatively as they go: the lexer checks
+    every species as soon as it is read (formula length, expanded atom count,
+    species count and time), the nullspace checks the time after every pivot
+    column or prime. A stage over budget stops at its next check and raises
+    BudgetExceeded instead of running to the end. A limit of None is not
+    checked.
+
+    A budget holds the limits; start() returns a copy whose clock runs from
+    that moment, so one budget can be shared by concurrent calls.
+
+    Attributes:
+        max_formula_length : int
+            Maximum number of characters of a species.
+        max_atom_count : int
+            Maximum number of atoms of a species, after group multipliers.
+        max_species_count : int
+            Maximum number of species of an equation.
+        max_seconds : float
+            Maximum wall-clock time of a balance.
+        deadline : float
+            The time.monotonic() value past which the balance stops, None
+            before start().
+
+    Methods:
+        start() -> BalanceBudget:
+            Returns a copy of the budget whose clock starts now.
+        checkTime(stage: str) -> None:
+            Raises BudgetExceeded when the deadline has passed.
+        checkSpecies(formula_length: int, atom_count: int, species_count: int) -> None:
+            Raises BudgetExceeded when a species goes over a size limit.
+    """
+
+    def __init__(
+        self,
+        max_formula_length: int = None,
+        max_atom_count: int = None,
+        max_species_count: int = None,
+        max_seconds: float = None,
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the BalanceBudget object.
+
+        Parameters:
+            max_formula_length : int
+                Maximum number of characters of a species.
+            max_atom_count : int
+                Maximum number of atoms of a species, after group multipliers.
+            max_species_count : int
+                Maximum number of species of an equation.
+            max_seconds : float
+                Maximum wall-clock time of a balance.
+        """
+        self.max_formula_length: int = max_formula_length
+        self.max_atom_count: int = max_atom_count
+        self.max_species_count: int = max_species_count
+        self.max_seconds: float = max_seconds
+        self.start_time: float = None
+        self.deadline: float = None
+
+    def start(self) -> "BalanceBudget":
+        """
+        Returns a copy of the budget whose clock starts now.
+
+        Returns:
+            BalanceBudget: The running budget of one balance.
+        """
+        running_budget: BalanceBudget = BalanceBudget(
+            max_formula_length=self.max_formula_length,
+            max_atom_count=self.max_atom_count,
+            max_species_count=self.max_species_count,
+            max_seconds=self.max_seconds,
+        )
+        running_budget.start_time = time.monotonic()
+        if self.max_seconds is not None:
+            running_budget.deadline = running_budget.start_time + self.max_seconds
+        return running_budget
+
+    def checkTime(self, stage: str) -> None:
+        """
+        Raises BudgetExceeded when the deadline has passed.
+
+        Parameters:
+            stage : str
+                The stage doing the check.
+        """
+        if self.deadline is not None:
+            current_time: float = time.monotonic()
+            if current_time > self.deadline:
+                raise BudgetExceeded(
+                    limit="seconds",
+                    value=round(current_time - self.start_time, 6),
+                    maximum=self.max_seconds,
+                    stage=stage,
+                )
+
+    def checkSpecies(self, formula_length: int, atom_count: int, species_count: int) -> None:
+        """
+        Raises BudgetExceeded when a species just read goes over a size limit,
+        or the deadline has passed.
+
+        Parameters:
+            formula_length : int
+                Number of characters of the species.
+            atom_count : int
+                Number of atoms of the species, after group multipliers.
+            species_count : int
+                Number of species read so far, this one included.
+        """
+        for limit, value, maximum in (
+            ("formula_length", formula_length, self.max_formula_length),
+            ("atom_count", atom_count, self.max_atom_count),
+            ("species_count", species_count, self.max_species_count),
+        ):
+            if maximum is not None and value > maximum:
+                raise BudgetExceeded(limit=limit, value=value, maximum=maximum, stage="parse")
+        self.checkTime(stage="parse")
+
+    def __repr__(self) -> str:
+        return (
+            f"BalanceBudget(max_formula_length={self.max_formula_length}, "
+            f"max_atom_count={self.max_atom_count}, "
+            f"max_species_count={self.max_species_count}, "
+            f"max_seconds={self.max_seconds})"
+        )
+
+
+# end region
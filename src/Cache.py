@@ -0,0 +1,292 @@
+import threading
+from collections import OrderedDict
+from src.LinearEquationsSystem import Generator
+from src.Solver import EquationSolution, Solver
+
+# region Balance Cache
+
+
+class BalanceCache:
+    """
+    A bounded LRU cache of balanced results placed in front of the solver.
+
+    Entries are stored under two kinds of keys:
+        - the equation text without whitespace, so an exact repeat skips
+          parsing and solving;
+        - the canonical form of the equation (the sorted species compositions
+          of each side), so the same reaction written in another species order
+          or spelling skips solving.
+    Coefficients are kept in canonical order and mapped back to the species
+    order of the caller on every hit.
+
+    Attributes:
+        max_size : int
+            Maximum number of entries; 0 disables the cache.
+        entries : OrderedDict
+            The cached entries, least recently used first.
+        hits : int
+            Number of lookups answered from the cache.
+        misses : int
+            Number of lookups that had to be solved.
+        evictions : int
+            Number of entries dropped to respect max_size.
+
+    Methods:
+        getByText(chemical_equation: str) -> EquationSolution:
+            Looks the equation up by its text.
+        getByGenerator(generator: Generator) -> EquationSolution:
+            Looks the equation up by its canonical form.
+        put(chemical_equation: str, generator: Generator, equation_solution: EquationSolution) -> None:
+            Stores a solved equation under both keys.
+        stats() -> dict:
+            Returns the size and the hit/miss/eviction counters.
+        clear() -> None:
+            Drops every entry and resets the counters.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        """
+        Constructs all the necessary attributes for the BalanceCache object.
+
+        Parameters:
+            max_size : int
+                Maximum number of entries; 0 disables the cache.
+        """
+        self.max_size: int = max_size
+        self.entries: OrderedDict = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def textKey(chemical_equation: str) -> tuple:
+        """
+        Returns the text key of an equation (all whitespace removed).
+        """
+        return ("text", "".join(chemical_equation.split()))
+
+    @staticmethod
+    def canonicalKey(generator: Generator) -> tuple[tuple, list[int]]:
+        """
+        Returns the canonical key of an equation and the permutation mapping
+        canonical positions to the species positions of the generator.
+
+        Parameters:
+            generator : Generator
+                The generator holding the parsed reactants and products.
+
+        Returns:
+            tuple[tuple, list[int]]: The key and the species order.
+        """
+        compositions: list[tuple] = [
+            tuple(sorted((element, count) for element, count in counts.items() if count))
+            for counts in [
+                generator.parsed_reactants[reactant]
+                for reactant in generator.reactants_list
+            ]
+            + [generator.parsed_products[product] for product in generator.products_list]
+        ]
+        reactants_count: int = len(generator.reactants_list)
+        reactants_order: list[int] = sorted(
+            range(reactants_count), key=compositions.__getitem__
+        )
+        products_order: list[int] = sorted(
+            range(reactants_count, len(compositions)), key=compositions.__getitem__
+        )
+        key: tuple = (
+            "canonical",
+            tuple(compositions[i] for i in reactants_order),
+            tuple(compositions[i] for i in products_order),
+        )
+        return key, reactants_order + products_order
+
+    def getEntry(self, key: tuple) -> tuple:
+        """
+        Returns the entry stored under key and marks it as recently used.
+        """
+        with self.lock:
+            entry: tuple = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def putEntry(self, key: tuple, entry: tuple) -> None:
+        """
+        Stores an entry and evicts the least recently used ones beyond max_size.
+        """
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def getByText(self, chemical_equation: str) -> EquationSolution:
+        """
+        Looks the equation up by its text. A miss is not counted, since the
+        canonical lookup follows.
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation as given.
+
+        Returns:
+            EquationSolution: The cached solution, or None.
+        """
+        if self.max_size <= 0:
+            return None
+        entry: tuple = self.getEntry(key=self.textKey(chemical_equation))
+        if entry is None:
+            return None
+        with self.lock:
+            self.hits += 1
+        species_list, reactants_count, integer_coefficients, error_msg = entry
+        return self.makeSolution(
+            species_list, integer_coefficients, error_msg, reactants_count
+        )
+
+    def getByGenerator(self, generator: Generator) -> EquationSolution:
+        """
+        Looks the equation up by its canonical form.
+
+        Parameters:
+            generator : Generator
+                The generator holding the parsed reactants and products.
+
+        Returns:
+            EquationSolution: The cached solution in the species order of the
+            generator, or None.
+        """
+        if self.max_size <= 0:
+            return None
+        key, species_order = self.canonicalKey(generator=generator)
+        entry: tuple = self.getEntry(key=key)
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        canonical_coefficients, error_msg = entry
+        return self.canonicalSolution(
+            generator, species_order, canonical_coefficients, error_msg
+        )
+
+    def put(
+        self,
+        chemical_equation: str,
+        generator: Generator,
+        equation_solution: EquationSolution,
+    ) -> None:
+        """
+        Stores a solved equation under its text and canonical keys. Only results
+        that do not depend on the species order (a unique balance or an error)
+        should be stored.
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation as given.
+            generator : Generator
+                The generator holding the parsed reactants and products.
+            equation_solution : EquationSolution
+                The result of the solver.
+        """
+        if self.max_size <= 0:
+            return
+        integer_coefficients: tuple = tuple(equation_solution.integer_coefficients)
+        key, species_order = self.canonicalKey(generator=generator)
+        canonical_coefficients: tuple = (
+            tuple(integer_coefficients[i] for i in species_order)
+            if integer_coefficients
+            else ()
+        )
+        self.putEntry(key=key, entry=(canonical_coefficients, equation_solution.error_msg))
+        self.putEntry(
+            key=self.textKey(chemical_equation),
+            entry=(
+                tuple(equation_solution.species_list),
+                len(generator.reactants_list),
+                integer_coefficients,
+                equation_solution.error_msg,
+            ),
+        )
+
+    @classmethod
+    def canonicalSolution(
+        cls,
+        generator: Generator,
+        species_order: list[int],
+        canonical_coefficients: tuple,
+        error_msg: str,
+    ) -> EquationSolution:
+        """
+        Rebuilds an EquationSolution from coefficients in canonical order,
+        moving them to the species order of the generator.
+        """
+        integer_coefficients: list[int] = [0] * len(species_order)
+        for canonical_index, species_index in enumerate(species_order):
+            if canonical_coefficients:
+                integer_coefficients[species_index] = canonical_coefficients[
+                    canonical_index
+                ]
+        return cls.makeSolution(
+            generator.reactants_list + generator.products_list,
+            integer_coefficients if canonical_coefficients else [],
+            error_msg,
+            len(generator.reactants_list),
+        )
+
+    @staticmethod
+    def makeSolution(
+        species_list: list[str],
+        integer_coefficients: list[int],
+        error_msg: str,
+        reactants_count: int = -1,
+    ) -> EquationSolution:
+        """
+        Rebuilds an EquationSolution from cached integer coefficients.
+        """
+        if error_msg or not integer_coefficients:
+            return EquationSolution(
+                species_list=list(species_list),
+                error_msg=error_msg,
+                reactants_count=reactants_count,
+            )
+        return EquationSolution(
+            species_list=list(species_list),
+            equation_solution=Solver.scaleToLastCoefficient(
+                integer_coefficients=integer_coefficients
+            ),
+            integer_coefficients=list(integer_coefficients),
+            reactants_count=reactants_count,
+        )
+
+    def stats(self) -> dict:
+        """
+        Returns the size and the hit/miss/eviction counters.
+
+        Returns:
+            dict: The cache statistics.
+        """
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        """
+        Drops every entry and resets the counters.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+# end region
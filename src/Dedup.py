@@ -0,0 +1,538 @@
+import os
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from src.Batch import BatchItemResult
+from src.Budget import BalanceBudget, BudgetExceeded
+from src.Cache import BalanceCache
+from src.LinearEquationsSystem import Generator
+from src.Nullspace import IntegerNullspace
+from src.Parser import EquationParser
+from src.Result import BalanceResult
+from src.Solver import EquationSolution, Solver
+from utils.ChemicalEquationRewriter import Rewriter
+
+
+def matrixKey(generator: Generator) -> tuple[tuple, list[int]]:
+    """
+    Returns a key of the composition matrix of an equation that ignores the
+    species order and the element symbols, and the permutation mapping the
+    key columns to the species positions of the generator.
+
+    Rows (elements) are ordered by their counts and the kinds of species they
+    appear in, then the columns of each side by their values in that row
+    order. The key is the permuted matrix itself, so equal keys always mean
+    equal matrices; "H2 + O2 = H2O" and "O2 + H2 = H2O" share a key, and so
+    do "H2 + S2 = H2S" and the same equation with other symbols.
+
+    Parameters:
+        generator : Generator
+            The generator holding the parsed reactants and products.
+
+    Returns:
+        tuple[tuple, list[int]]: The key and the species order.
+    """
+    compositions: list = [
+        generator.parsed_reactants[reactant] for reactant in generator.reactants_list
+    ] + [generator.parsed_products[product] for product in generator.products_list]
+    reactants_count: int = len(generator.reactants_list)
+
+    column_signatures: list[tuple] = [
+        tuple(sorted(count for count in counts.values() if count)) for counts in compositions
+    ]
+    element_entries: dict[str, list[tuple[int, int]]] = {}
+    for column, counts in enumerate(compositions):
+        for element, count in counts.items():
+            if count:
+                element_entries.setdefault(element, []).append((column, count))
+    # the symbol only breaks ties, which can cost a shared key but never a wrong one
+    elements_order: list[str] = sorted(
+        element_entries,
+        key=lambda element: (
+            sorted(
+                (column >= reactants_count, column_signatures[column], count)
+                for column, count in element_entries[element]
+            ),
+            element,
+        ),
+    )
+
+    column_vectors: list[list[tuple[int, int]]] = [[] for _ in compositions]
+    for row, element in enumerate(elements_order):
+        for column, count in element_entries[element]:
+            column_vectors[column].append((row, count))
+    reactants_order: list[int] = sorted(
+        range(reactants_count), key=column_vectors.__getitem__
+    )
+    products_order: list[int] = sorted(
+        range(reactants_count, len(compositions)), key=column_vectors.__getitem__
+    )
+    species_order: list[int] = reactants_order + products_order
+    key: tuple = (
+        reactants_count,
+        tuple(tuple(column_vectors[column]) for column in species_order),
+    )
+    return key, species_order
+
+
+def solveGenerator(
+    generator: Generator, running_budget: BalanceBudget = None
+) -> tuple[list[int], str, int, dict]:
+    """
+    Solves a parsed equation within its running budget.
+
+    Parameters:
+        generator : Generator
+            The generator holding the parsed reactants and products.
+        running_budget : BalanceBudget
+            The budget started when the equation was parsed, None for no limits.
+
+    Returns:
+        tuple[list[int], str, int, dict]: The integer coefficients in the
+        species order of the generator, the error message, the nullity and the
+        limit hit (see BudgetExceeded.toDict), None within the budget.
+    """
+    solver_object: Solver = Solver(generator=generator, budget=running_budget)
+    try:
+        equation_solution: EquationSolution = solver_object.execute()
+    except BudgetExceeded as error:
+        return [], str(error), 0, error.toDict()
+    return (
+        equation_solution.integer_coefficients,
+        equation_solution.error_msg,
+        solver_object.nullity,
+        None,
+    )
+
+
+def solveEquation(
+    chemical_equation: str, running_budget: BalanceBudget = None
+) -> tuple[list[int], str, int, dict]:
+    """
+    Parses and solves an equation in a worker process, which is cheaper than
+    sending the parsed generator over. The parse was already checked against
+    the budget, so only the solve is.
+    """
+    return solveGenerator(
+        generator=Generator(chemical_equation=chemical_equation),
+        running_budget=running_budget,
+    )
+
+
+# region Deduplicating Balancer
+
+
+class DeduplicatingBalancer:
+    """
+    A class to balance a batch of equations solving every distinct
+    composition matrix only once.
+
+    Every equation is parsed first with EquationParser and keyed by matrixKey,
+    so equations that differ only in species order, spelling or element
+    symbols fall in one group. One equation per group is looked up in the
+    cache and the store, or else solved, over a process pool when workers > 1;
+    its coefficients are moved to the species order of every other equation of
+    the group before rewriting. A group shares its error too: an unbalanceable or
+    ambiguous balance is one for every order of the species. New unique
+    balances and errors are put in the cache and the store, like CREB.execute
+    does.
+
+    Every equation gets its own running budget when it is parsed; the budget
+    of the first equation of a group bounds the solve, and a group whose solve
+    goes over it reports BudgetExceeded on every equation.
+
+    The input is read in windows of window_size equations, so memory stays
+    bounded on long feeds; duplicates are found within a window. Results come
+    in input order with the same text and errors as balancing each equation
+    with CREB.execute.
+
+    Attributes:
+        workers : int
+            Number of worker processes; 1 solves in the calling process.
+        chunk_size : int
+            Number of equations sent to a worker at once.
+        window_size : int
+            Number of equations grouped together.
+        balance_cache : BalanceCache
+            The cache looked up before solving, None for no cache.
+        result_store : ResultStore
+            The persistent store looked up after the cache, None for no store.
+        budget : BalanceBudget
+            The limits of every equation, None for no limits.
+        equations_count : int
+            Number of equations read.
+        parse_errors : int
+            Number of equations that failed to parse.
+        unique_count : int
+            Number of distinct composition matrices.
+        cache_hits : int
+            Number of distinct matrices answered by the cache or the store.
+        solves_count : int
+            Number of equations actually solved.
+
+    Methods:
+        iterate(chemical_equations: Iterable[str]) -> Iterator[BatchItemResult]:
+            Balances the equations and yields the results in input order.
+        execute(chemical_equations: Iterable[str]) -> list[BatchItemResult]:
+            Balances the equations and returns the results in input order.
+        balanceWindow(indexed_equations: list[tuple[int, str]]) -> list[BatchItemResult]:
+            Balances one window of equations.
+        lookUp(generator: Generator) -> tuple[list[int], str, int, dict]:
+            Returns the cached or stored solution of an equation, or None.
+        remember(solved_list: list[tuple[Generator, tuple]]) -> None:
+            Puts new unique balances and errors in the cache and the store.
+        solveMany(generators: list[Generator], running_budgets: list[BalanceBudget]) -> list[tuple[list[int], str, int, dict]]:
+            Solves the given equations.
+        stats() -> dict:
+            Returns the counters and the dedup ratio.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        chunk_size: int = 64,
+        window_size: int = 65536,
+        balance_cache: BalanceCache = None,
+        result_store: "ResultStore" = None,
+        budget: BalanceBudget = None,
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the DeduplicatingBalancer object.
+
+        Parameters:
+            workers : int
+                Number of worker processes, None for the number of CPUs.
+            chunk_size : int
+                Number of equations sent to a worker at once.
+            window_size : int
+                Number of equations grouped together.
+            balance_cache : BalanceCache
+                The cache looked up before solving, None for no cache.
+            result_store : ResultStore
+                The persistent store looked up after the cache, None for no store.
+            budget : BalanceBudget
+                The limits of every equation, None for no limits.
+        """
+        if chunk_size < 1 or window_size < 1:
+            raise ValueError("chunk_size and window_size must be at least 1")
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunk_size: int = chunk_size
+        self.window_size: int = window_size
+        self.balance_cache: BalanceCache = balance_cache
+        self.result_store: "ResultStore" = result_store
+        self.budget: BalanceBudget = budget
+        self.equations_count: int = 0
+        self.parse_errors: int = 0
+        self.unique_count: int = 0
+        self.cache_hits: int = 0
+        self.solves_count: int = 0
+
+    def solveMany(
+        self, generators: list[Generator], running_budgets: list[BalanceBudget]
+    ) -> list[tuple[list[int], str, int, dict]]:
+        """
+        Solves the given equations, in the calling process or over the pool.
+
+        Parameters:
+            generators : list[Generator]
+                The parsed equations.
+            running_budgets : list[BalanceBudget]
+                Their running budgets (None for no limits).
+
+        Returns:
+            list[tuple[list[int], str, int, dict]]: The results of solveGenerator, in order.
+        """
+        self.solves_count += len(generators)
+        if self.workers == 1 or len(generators) <= self.chunk_size:
+            return [
+                solveGenerator(generator=generator, running_budget=running_budget)
+                for generator, running_budget in zip(generators, running_budgets)
+            ]
+
+        # imported here since multiprocessing is slow to import
+        from concurrent.futures import ProcessPoolExecutor
+
+        # a running budget keeps its deadline: time.monotonic() is system-wide
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(
+                executor.map(
+                    solveEquation,
+                    [generator.chemical_equation for generator in generators],
+                    running_budgets,
+                    chunksize=self.chunk_size,
+                )
+            )
+
+    def lookUp(self, generator: Generator) -> tuple[list[int], str, int, dict]:
+        """
+        Returns the solution of an equation from the cache or else the store
+        (a stored one is put in the cache, as CREB.execute does).
+
+        Parameters:
+            generator : Generator
+                The generator holding the parsed reactants and products.
+
+        Returns:
+            tuple[list[int], str, int, dict]: The solution in the layout of
+            solveGenerator, or None when neither has it.
+        """
+        equation_solution: EquationSolution = (
+            self.balance_cache.getByGenerator(generator=generator)
+            if self.balance_cache is not None
+            else None
+        )
+        if equation_solution is None and self.result_store is not None:
+            equation_solution = self.result_store.getByGenerator(generator=generator)
+            if equation_solution is not None and self.balance_cache is not None:
+                self.balance_cache.put(
+                    chemical_equation=generator.chemical_equation,
+                    generator=generator,
+                    equation_solution=equation_solution,
+                )
+        if equation_solution is None:
+            return None
+        # only a unique balance (nullity 1) or an error (nullity 0) is kept
+        return (
+            equation_solution.integer_coefficients,
+            equation_solution.error_msg,
+            1 if equation_solution.integer_coefficients else 0,
+            None,
+        )
+
+    def remember(self, solved_list: list[tuple[Generator, tuple]]) -> None:
+        """
+        Puts the new unique balances and errors in the cache and the store,
+        the store in one transaction; ambiguous balances depend on the species
+        order and results over budget on the limits, so they are left out.
+
+        Parameters:
+            solved_list : list[tuple[Generator, tuple]]
+                Each solved equation and its solution, in the layout of
+                solveGenerator and in its own species order.
+        """
+        store_entries: list[tuple[str, str, str]] = []
+        for generator, (integer_coefficients, error_msg, nullity, budget_exceeded) in (
+            solved_list
+        ):
+            if budget_exceeded is not None or nullity not in (0, 1):
+                continue
+            equation_solution: EquationSolution = EquationSolution(
+                species_list=generator.reactants_list + generator.products_list,
+                equation_solution=Solver.scaleToLastCoefficient(
+                    integer_coefficients=integer_coefficients
+                )
+                if integer_coefficients
+                else (),
+                integer_coefficients=integer_coefficients,
+                error_msg=error_msg,
+                reactants_count=len(generator.reactants_list),
+            )
+            if self.balance_cache is not None:
+                self.balance_cache.put(
+                    chemical_equation=generator.chemical_equation,
+                    generator=generator,
+                    equation_solution=equation_solution,
+                )
+            if self.result_store is not None:
+                store_entries.append(
+                    self.result_store.canonicalEntry(
+                        generator=generator, equation_solution=equation_solution
+                    )
+                )
+        if store_entries:
+            self.result_store.putMany(entries=store_entries)
+
+    def balanceWindow(
+        self, indexed_equations: list[tuple[int, str]]
+    ) -> list[BatchItemResult]:
+        """
+        Balances one window of equations, solving each distinct matrix once.
+
+        Parameters:
+            indexed_equations : list[tuple[int, str]]
+                Positions in the batch and equations of the window.
+
+        Returns:
+            list[BatchItemResult]: The outcomes of the window, in order.
+        """
+        results_list: list[BatchItemResult] = [None] * len(indexed_equations)
+        # key -> [(position in window, parser, generator, species order, running budget)]
+        groups_dict: dict[tuple, list[tuple]] = {}
+        for position, (index, chemical_equation) in enumerate(indexed_equations):
+            self.equations_count += 1
+            running_budget: BalanceBudget = (
+                self.budget.start() if self.budget is not None else None
+            )
+            try:
+                equation_parser: EquationParser = EquationParser(
+                    chemical_equation=chemical_equation, budget=running_budget
+                )
+                equation_parser.parse()
+                generator: Generator = Generator(
+                    chemical_equation=chemical_equation, equation_parser=equation_parser
+                )
+                key, species_order = matrixKey(generator=generator)
+            except Exception as error:
+                self.parse_errors += 1
+                results_list[position] = BatchItemResult(
+                    index=index,
+                    chemical_equation=chemical_equation,
+                    error_msg=f"{type(error).__name__}: {error}",
+                    budget_exceeded=error.toDict()
+                    if isinstance(error, BudgetExceeded)
+                    else None,
+                )
+                continue
+            groups_dict.setdefault(key, []).append(
+                (position, equation_parser, generator, species_order, running_budget)
+            )
+        self.unique_count += len(groups_dict)
+
+        groups_list: list[list[tuple]] = list(groups_dict.values())
+        solutions_list: list[tuple] = [
+            self.lookUp(generator=group[0][2]) for group in groups_list
+        ]
+        self.cache_hits += sum(solution is not None for solution in solutions_list)
+        unsolved_groups: list[int] = [
+            group_index
+            for group_index, solution in enumerate(solutions_list)
+            if solution is None
+        ]
+        solved_groups: set[int] = set(unsolved_groups)
+        for group_index, solution in zip(
+            unsolved_groups,
+            self.solveMany(
+                generators=[
+                    groups_list[group_index][0][2] for group_index in unsolved_groups
+                ],
+                running_budgets=[
+                    groups_list[group_index][0][4] for group_index in unsolved_groups
+                ],
+            ),
+        ):
+            solutions_list[group_index] = solution
+
+        # (member, its solution in its own species order)
+        solved_members: list[tuple[tuple, tuple]] = []
+        new_members: list[tuple[Generator, tuple]] = []
+        for group_index, (group, solution) in enumerate(zip(groups_list, solutions_list)):
+            integer_coefficients, error_msg, nullity, budget_exceeded = solution
+            representative_order: list[int] = group[0][3]
+            canonical_coefficients: list[int] = (
+                [integer_coefficients[i] for i in representative_order]
+                if integer_coefficients
+                else []
+            )
+            for member in group:
+                member_coefficients: list[int] = [0] * len(canonical_coefficients)
+                for canonical_index, species_index in enumerate(member[3]):
+                    if canonical_coefficients:
+                        member_coefficients[species_index] = canonical_coefficients[
+                            canonical_index
+                        ]
+                member_solution: tuple = (
+                    # the sign convention depends on the species order
+                    IntegerNullspace.normalizeVector(vector=member_coefficients)
+                    if member_coefficients
+                    else [],
+                    error_msg,
+                    nullity,
+                    budget_exceeded,
+                )
+                solved_members.append((member, member_solution))
+                if group_index in solved_groups:
+                    new_members.append((member[2], member_solution))
+        self.remember(solved_list=new_members)
+
+        for (position, equation_parser, _, _, _), (
+            integer_coefficients,
+            error_msg,
+            nullity,
+            budget_exceeded,
+        ) in solved_members:
+            index, chemical_equation = indexed_equations[position]
+            if budget_exceeded is not None:
+                results_list[position] = BatchItemResult(
+                    index=index,
+                    chemical_equation=chemical_equation,
+                    error_msg=f"{BudgetExceeded.__name__}: {error_msg}",
+                    budget_exceeded=budget_exceeded,
+                )
+                continue
+            try:
+                BalanceResult.checkBalanced(
+                    integer_coefficients=integer_coefficients,
+                    error_msg=error_msg,
+                    nullity=nullity,
+                )
+                balanced_equation: str = Rewriter().executeRewriter(
+                    chemical_equation=chemical_equation,
+                    equation_solution=Solver.scaleToLastCoefficient(
+                        integer_coefficients=integer_coefficients
+                    ),
+                    equation_parser=equation_parser,
+                )
+            except Exception as error:
+                results_list[position] = BatchItemResult(
+                    index=index,
+                    chemical_equation=chemical_equation,
+                    error_msg=f"{type(error).__name__}: {error}",
+                )
+                continue
+            results_list[position] = BatchItemResult(
+                index=index,
+                chemical_equation=chemical_equation,
+                balanced_equation=balanced_equation,
+            )
+        return results_list
+
+    def iterate(self, chemical_equations: Iterable[str]) -> Iterator[BatchItemResult]:
+        """
+        Balances the equations window by window and yields the results in
+        input order.
+
+        Parameters:
+            chemical_equations : Iterable[str]
+                The chemical equations to be balanced.
+
+        Yields:
+            BatchItemResult: One result per equation, in input order.
+        """
+        indexed_equations: Iterator[tuple[int, str]] = enumerate(chemical_equations)
+        for window in iter(lambda: list(islice(indexed_equations, self.window_size)), []):
+            yield from self.balanceWindow(indexed_equations=window)
+
+    def execute(self, chemical_equations: Iterable[str]) -> list[BatchItemResult]:
+        """
+        Balances the equations and returns the results in input order.
+
+        Parameters:
+            chemical_equations : Iterable[str]
+                The chemical equations to be balanced.
+
+        Returns:
+            list[BatchItemResult]: One result per equation, in input order.
+        """
+        return list(self.iterate(chemical_equations=chemical_equations))
+
+    def stats(self) -> dict:
+        """
+        Returns the counters and the dedup ratio, the number of parsed
+        equations per solve (1.0 without duplicates).
+
+        Returns:
+            dict: The batch statistics.
+        """
+        parsed_count: int = self.equations_count - self.parse_errors
+        return {
+            "equations": self.equations_count,
+            "parse_errors": self.parse_errors,
+            "unique_matrices": self.unique_count,
+            "cache_hits": self.cache_hits,
+            "solves": self.solves_count,
+            "dedup_ratio": round(parsed_count / self.solves_count, 3)
+            if self.solves_count
+            else 1.0,
+        }
+
+
+# end region
@@ -0,0 +1,338 @@
+from collections import Counter
+from fractions import Fraction
+from math import lcm
+from src.Lexer import EquationLexer
+from src.Nullspace import IntegerNullspace
+from src.Parser import ElementCounter
+from src.Result import BalanceResult
+from src.Solver import EquationSolution, Solver
+from utils.ChemicalEquationRewriter import Rewriter
+
+# region Incremental Balancer
+
+
+class IncrementalBalancer:
+    """
+    A class to rebalance an equation after each edit without redoing the
+    whole elimination.
+
+    The balancer keeps a reduced form R = T A of the composition matrix A
+    (elements x species, reactant counts positive and product counts
+    negative), where T is the invertible matrix of the row operations done so
+    far. Every pivot row of R has a 1 at its pivot species and the pivot
+    species are zero in every other row; the other rows of R are zero. The
+    nullspace, and so the coefficients, can be read off R at any time.
+
+    - Adding a species appends the column T c to R and pivots on it when one
+      of the zero rows became non-zero.
+    - Removing a free species drops its column; removing a pivot species
+      first moves the pivot of its row to another species of that row.
+    - Changing a formula is a removal followed by an addition at the same
+      position.
+
+    Each edit costs one column of row operations, so the latency stays flat
+    as the equation grows. Species are identified by the id returned when
+    they are added; ids are never reused.
+
+    Attributes:
+        reactant_ids : list[int]
+            The reactants, in equation order.
+        product_ids : list[int]
+            The products, in equation order.
+        formulas_dict : dict[int, str]
+            The formula of each species.
+        element_rows : dict[str, int]
+            The row of each element seen so far.
+        reduced_rows : list[dict[int, Fraction]]
+            The rows of R, {species id: value}.
+        transform_rows : list[dict[int, Fraction]]
+            The rows of T, {element row: value}.
+        pivot_rows : dict[int, int]
+            The row of each pivot species.
+
+    Methods:
+        fromEquation(chemical_equation: str) -> IncrementalBalancer:
+            Builds a balancer from a whole chemical equation.
+        addSpecies(chemical_formula: str, side: str = "reactant", position: int = None) -> int:
+            Adds a species and returns its id.
+        removeSpecies(species_id: int) -> None:
+            Removes a species.
+        replaceSpecies(species_id: int, chemical_formula: str) -> int:
+            Changes the formula of a species and returns its new id.
+        chemicalEquation() -> str:
+            Returns the current equation as text.
+        solution() -> EquationSolution:
+            Returns the coefficients of the current equation.
+        execute() -> str:
+            Returns the current equation rewritten with its coefficients.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructs all the necessary attributes for the IncrementalBalancer object.
+        """
+        self.reactant_ids: list[int] = []
+        self.product_ids: list[int] = []
+        self.formulas_dict: dict[int, str] = {}
+        self.element_rows: dict[str, int] = {}
+        self.reduced_rows: list[dict[int, Fraction]] = []
+        self.transform_rows: list[dict[int, Fraction]] = []
+        self.pivot_rows: dict[int, int] = {}
+        self.next_id: int = 0
+
+    @classmethod
+    def fromEquation(cls, chemical_equation: str) -> "IncrementalBalancer":
+        """
+        Builds a balancer from a whole chemical equation such as "H2 + O2 = H2O".
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation.
+
+        Returns:
+            IncrementalBalancer: The balancer holding every species of the equation.
+        """
+        incremental_balancer: IncrementalBalancer = cls()
+        for side, lexed_species in zip(
+            ("reactant", "product"), EquationLexer(chemical_equation=chemical_equation).lex()
+        ):
+            for species_text, _ in lexed_species:
+                incremental_balancer.addSpecies(chemical_formula=species_text, side=side)
+        return incremental_balancer
+
+    @staticmethod
+    def subtractRow(
+        row: dict[int, Fraction], source_row: dict[int, Fraction], factor: Fraction
+    ) -> None:
+        """
+        Subtracts factor times source_row from row in place, dropping zeros.
+        """
+        for key, value in source_row.items():
+            new_value: Fraction = row.get(key, 0) - factor * value
+            if new_value:
+                row[key] = new_value
+            else:
+                row.pop(key, None)
+
+    def pivot(self, row: int, species_id: int) -> None:
+        """
+        Makes species_id the pivot of a row: scales the row so the entry is 1
+        and clears the column of species_id in every other row.
+
+        Parameters:
+            row : int
+                The row of R to pivot on.
+            species_id : int
+                A species with a non-zero entry in that row.
+        """
+        reduced_row: dict[int, Fraction] = self.reduced_rows[row]
+        transform_row: dict[int, Fraction] = self.transform_rows[row]
+        pivot_value: Fraction = reduced_row[species_id]
+        if pivot_value != 1:
+            for key in reduced_row:
+                reduced_row[key] /= pivot_value
+            for key in transform_row:
+                transform_row[key] /= pivot_value
+
+        for other_row, other_reduced_row in enumerate(self.reduced_rows):
+            factor: Fraction = other_reduced_row.get(species_id, 0)
+            if other_row == row or not factor:
+                continue
+            self.subtractRow(other_reduced_row, reduced_row, factor)
+            self.subtractRow(self.transform_rows[other_row], transform_row, factor)
+        self.pivot_rows[species_id] = row
+
+    def addSpecies(
+        self, chemical_formula: str, side: str = "reactant", position: int = None
+    ) -> int:
+        """
+        Adds a species to one side of the equation.
+
+        Parameters:
+            chemical_formula : str
+                The formula of the species, e.g. "H2O" or "Ca(OH)2".
+            side : str
+                "reactant" or "product".
+            position : int
+                Position within its side, at the end by default.
+
+        Returns:
+            int: The id of the new species.
+        """
+        if side not in ("reactant", "product"):
+            raise ValueError(f"Unknown side: {side!r}")
+        # parsed before any state changes, so a bad formula leaves the balancer intact
+        element_counts: Counter = ElementCounter(
+            chemical_formula=chemical_formula
+        ).parseFormula()
+        sign: int = 1 if side == "reactant" else -1
+
+        for element in element_counts:
+            if element not in self.element_rows:
+                new_row: int = len(self.reduced_rows)
+                self.element_rows[element] = new_row
+                self.reduced_rows.append({})
+                self.transform_rows.append({new_row: Fraction(1)})
+        column: dict[int, int] = {
+            self.element_rows[element]: sign * count
+            for element, count in element_counts.items()
+            if count
+        }
+
+        species_id: int = self.next_id
+        self.next_id += 1
+        self.formulas_dict[species_id] = chemical_formula
+        side_ids: list[int] = self.reactant_ids if side == "reactant" else self.product_ids
+        side_ids.insert(len(side_ids) if position is None else position, species_id)
+
+        # the new column of R is T c
+        for reduced_row, transform_row in zip(self.reduced_rows, self.transform_rows):
+            value: Fraction = sum(
+                transform_row.get(row, 0) * count for row, count in column.items()
+            )
+            if value:
+                reduced_row[species_id] = value
+
+        used_rows: set[int] = set(self.pivot_rows.values())
+        new_pivot_row: int = next(
+            (
+                row
+                for row, reduced_row in enumerate(self.reduced_rows)
+                if row not in used_rows and species_id in reduced_row
+            ),
+            -1,
+        )
+        if new_pivot_row != -1:
+            self.pivot(row=new_pivot_row, species_id=species_id)
+        return species_id
+
+    def removeSpecies(self, species_id: int) -> None:
+        """
+        Removes a species from the equation.
+
+        Parameters:
+            species_id : int
+                The id returned by addSpecies.
+        """
+        if species_id not in self.formulas_dict:
+            raise KeyError(species_id)
+        row: int = self.pivot_rows.pop(species_id, -1)
+        if row != -1:
+            # every other species of a pivot row is free, so any of them can
+            # take the pivot over; without one the rank drops by one
+            replacement_id: int = next(
+                (other for other in self.reduced_rows[row] if other != species_id), -1
+            )
+            if replacement_id != -1:
+                self.pivot(row=row, species_id=replacement_id)
+        for reduced_row in self.reduced_rows:
+            reduced_row.pop(species_id, None)
+
+        del self.formulas_dict[species_id]
+        if species_id in self.reactant_ids:
+            self.reactant_ids.remove(species_id)
+        else:
+            self.product_ids.remove(species_id)
+
+    def replaceSpecies(self, species_id: int, chemical_formula: str) -> int:
+        """
+        Changes the formula of a species, keeping its side and position.
+
+        Parameters:
+            species_id : int
+                The id returned by addSpecies.
+            chemical_formula : str
+                The new formula.
+
+        Returns:
+            int: The id of the species with the new formula.
+        """
+        # parse first so a bad formula does not remove the old species
+        ElementCounter(chemical_formula=chemical_formula).parseFormula()
+        if species_id in self.reactant_ids:
+            side, position = "reactant", self.reactant_ids.index(species_id)
+        else:
+            side, position = "product", self.product_ids.index(species_id)
+        self.removeSpecies(species_id=species_id)
+        return self.addSpecies(
+            chemical_formula=chemical_formula, side=side, position=position
+        )
+
+    def chemicalEquation(self) -> str:
+        """
+        Returns the current equation as text.
+
+        Returns:
+            str: The reactants and products joined with "+" and "=".
+        """
+        return (
+            " + ".join(self.formulas_dict[species_id] for species_id in self.reactant_ids)
+            + " = "
+            + " + ".join(self.formulas_dict[species_id] for species_id in self.product_ids)
+        )
+
+    def solution(self) -> EquationSolution:
+        """
+        Returns the coefficients of the current equation, read off the reduced
+        form. When the nullspace has more than one dimension, the vector of the
+        last free species is used, like Solver does; the free species may
+        differ from the ones of a full elimination, so the choice can too.
+
+        Returns:
+            EquationSolution: The coefficients, or the error message.
+        """
+        species_ids: list[int] = self.reactant_ids + self.product_ids
+        species_list: list[str] = [
+            "(" + self.formulas_dict[species_id] + ")" for species_id in species_ids
+        ]
+        free_ids: list[int] = [
+            species_id for species_id in species_ids if species_id not in self.pivot_rows
+        ]
+        if not free_ids:
+            return EquationSolution(
+                species_list=species_list,
+                error_msg="The chemical equation can not be balanced.",
+                reactants_count=len(self.reactant_ids),
+            )
+
+        free_id: int = free_ids[-1]
+        values_dict: dict[int, Fraction] = {free_id: Fraction(1)}
+        for pivot_id, row in self.pivot_rows.items():
+            values_dict[pivot_id] = -self.reduced_rows[row].get(free_id, Fraction(0))
+        denominator: int = lcm(*(value.denominator for value in values_dict.values()))
+        integer_coefficients: list[int] = IntegerNullspace.normalizeVector(
+            vector=[
+                int(values_dict.get(species_id, 0) * denominator)
+                for species_id in species_ids
+            ]
+        )
+        return EquationSolution(
+            species_list=species_list,
+            equation_solution=Solver.scaleToLastCoefficient(
+                integer_coefficients=integer_coefficients
+            ),
+            integer_coefficients=integer_coefficients,
+            reactants_count=len(self.reactant_ids),
+        )
+
+    def execute(self) -> str:
+        """
+        Returns the current equation rewritten with its coefficients, in the
+        format of CREB.execute.
+
+        Returns:
+            str: The balanced chemical equation.
+        """
+        equation_solution: EquationSolution = self.solution()
+        BalanceResult.checkBalanced(
+            integer_coefficients=equation_solution.integer_coefficients,
+            error_msg=equation_solution.error_msg,
+            nullity=len(equation_solution.species_list) - len(self.pivot_rows),
+        )
+        return Rewriter().executeRewriter(
+            chemical_equation=self.chemicalEquation(),
+            equation_solution=equation_solution.equation_solution,
+        )
+
+
+# end region
@@ -0,0 +1,340 @@
+import re
+from collections import Counter
+from src.Budget import BalanceBudget
+from utils import Assets
+
+lexer_token_pattern: re.Pattern[str] = re.compile(
+    r"(([A-Z][a-z]*)(\d*)"  # element and its count
+    r"|([(\[])"  # opening bracket
+    r"|([)\]])(\d*)"  # closing bracket and its multiplier
+    r"|\^(\d*[+-])"  # charge
+    r"|([·*.])\s*(\d*)"  # hydrate dot and the count of the part after it
+    r"|\s*([+=])\s*"  # species or side separator, with the spaces around it
+    r"|(\s+)"  # whitespace
+    r"|(\d+(?:/\d+)?)"  # written coefficient
+    r"|(e)(?![a-z])"  # electron
+    r"|(.))",  # anything else, always an error
+    re.DOTALL,
+)
+"""re.Pattern[str]: Matches every token of a chemical equation; findall returns the whole token first, then one group per token kind."""
+
+element_symbols: frozenset[str] = frozenset(Assets.elements_list)
+"""frozenset[str]: The valid element symbols."""
+
+charge_key: str = "charge"
+"""str: The key under which the net charge of a species is counted, so charge is balanced like an element."""
+
+closing_brackets_dict: dict[str, str] = {"(": ")", "[": "]"}
+"""dict[str, str]: The closing bracket of each opening bracket."""
+
+# region Equation Lexer
+
+
+class EquationLexer:
+    """
+    A class to tokenize and validate a whole chemical equation in one pass.
+
+    The equation is split into tokens by one findall of the precompiled
+    lexer_token_pattern and read left to right; every token is checked as it is read, so malformed
+    input is rejected with its position before any matrix or solver work:
+        - element symbols must be in Assets.elements_list ("Xx2" fails);
+        - "(" and "[" must be closed by the matching bracket;
+        - a charge ("^2-", "^+") may only end a species;
+        - a written coefficient ("2 H2O") may only start a species; it is
+          not part of the species text and is kept in written_coefficients,
+          since the balancer computes its own;
+        - a hydrate dot ("CuSO4·5H2O", also written with "*" or ".") needs a
+          formula on both sides; the part after it, up to the next dot or
+          the end of its group, is counted times the number after the dot;
+        - the electron "e" (or "e^-") may only stand alone;
+        - there must be exactly one "=" and no empty species.
+    Element counts are gathered while reading, with one Counter per open
+    group or hydrate part, so no second parse of the species is needed. The
+    net charge of a species is counted under charge_key. With a budget,
+    every species is checked against its limits as soon as it is read.
+
+    Attributes:
+        chemical_equation : str
+            The chemical equation (or a single species) to be tokenized.
+        budget : BalanceBudget
+            The running budget of the balance, None for no limits.
+        written_coefficients : list[list[str]]
+            The written coefficient of each species of each side ("" when
+            there is none), filled by lex().
+
+    Methods:
+        lex() -> list[list[tuple[str, Counter]]]:
+            Returns the (text, element counts) of each reactant and product.
+        lexSpecies() -> Counter:
+            Returns the element counts of a single species.
+    """
+
+    def __init__(self, chemical_equation: str, budget: BalanceBudget = None) -> None:
+        """
+        Constructs all the necessary attributes for the EquationLexer object.
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation (or a single species) to be tokenized.
+            budget : BalanceBudget
+                The running budget of the balance, None for no limits.
+        """
+        self.chemical_equation: str = chemical_equation
+        self.budget: BalanceBudget = budget
+        self.written_coefficients: list[list[str]] = []
+
+    def error(self, message: str, position: int) -> ValueError:
+        """
+        Returns the ValueError reporting malformed input at a position.
+        """
+        return ValueError(f"{message} at position {position}: {self.chemical_equation}")
+
+    def scan(self, species_only: bool) -> list[list[tuple[str, Counter]]]:
+        """
+        Tokenizes the text in one pass, validating every token.
+
+        Parameters:
+            species_only : bool
+                Whether the text is a single species, in which case "+" and
+                "=" are not allowed outside a charge.
+
+        Returns:
+            list[list[tuple[str, Counter]]]: The species of each side as
+            (text, element counts).
+        """
+        text: str = self.chemical_equation
+        text_length: int = len(text)
+        sides_list: list[list[tuple[str, Counter]]] = [[]]
+        self.written_coefficients = [[]]
+        budget: BalanceBudget = self.budget
+        species_count: int = 0
+        if budget is not None and budget.max_formula_length is not None:
+            # a cheap bound before tokenizing: a part between separators,
+            # without its surrounding spaces and written coefficient, is never
+            # longer than its species (a "+" charge only shortens the parts)
+            budget.checkSpecies(
+                formula_length=max(
+                    len(part.strip().lstrip("0123456789/").lstrip())
+                    for part in text.replace("=", "+").split("+")
+                ),
+                atom_count=0,
+                species_count=0,
+            )
+
+        position: int = 0
+        species_start: int = -1
+        species_end: int = 0
+        counts_stack: list[Counter] = [Counter()]
+        brackets_stack: list[tuple[str, int]] = []
+        # the count of the open hydrate part of each group level, 0 for none
+        hydrate_counts: list[int] = [0]
+        has_formula: bool = False
+        is_electron: bool = False
+        charge: int = 0
+        charged: bool = False
+        written_coefficient: str = ""
+        # whether a hydrate dot may come next, and the position of the last
+        # dot while it waits for its formula (-1 for none)
+        can_dot: bool = False
+        dot_position: int = -1
+
+        def foldHydrate() -> None:
+            # adds the open hydrate part of the current level, times its count
+            hydrate_part: Counter = counts_stack.pop()
+            element_counts: Counter = counts_stack[-1]
+            for element, count in hydrate_part.items():
+                element_counts[element] = (
+                    element_counts.get(element, 0) + count * hydrate_counts[-1]
+                )
+            hydrate_counts[-1] = 0
+
+        def finishSpecies(end_position: int) -> None:
+            nonlocal species_count
+            if not has_formula:
+                raise self.error("Empty species", end_position)
+            if dot_position != -1:
+                raise self.error("A hydrate dot needs a formula on both sides", dot_position)
+            if brackets_stack:
+                raise self.error(
+                    "Unbalanced parentheses in chemical formula", brackets_stack[-1][1]
+                )
+            if hydrate_counts[0]:
+                foldHydrate()
+            species_counts: Counter = counts_stack[0]
+            species_charge: int = charge
+            if is_electron:
+                if charged and charge != -1:
+                    raise self.error("The electron can only have charge -1", species_end)
+                species_charge = -1
+            if species_charge:
+                species_counts[charge_key] += species_charge
+            if budget is not None:
+                species_count += 1
+                budget.checkSpecies(
+                    formula_length=species_end - species_start,
+                    atom_count=sum(
+                        count
+                        for element, count in species_counts.items()
+                        if element != charge_key
+                    ),
+                    species_count=species_count,
+                )
+            sides_list[-1].append((text[species_start:species_end], species_counts))
+            self.written_coefficients[-1].append(written_coefficient)
+
+        # findall yields plain tuples, much cheaper than match objects; the
+        # position is kept by adding up the token lengths
+        for (
+            token,
+            element,
+            count,
+            opening,
+            closing,
+            group_count,
+            charge_text,
+            hydrate_dot,
+            hydrate_count,
+            separator,
+            space,
+            coefficient,
+            electron,
+            invalid,
+        ) in lexer_token_pattern.findall(text):
+            token_start: int = position
+            position += len(token)
+
+            # elements come first: they are most of the tokens
+            if element and not (charged or is_electron):
+                if element not in element_symbols:
+                    raise self.error(f"Unknown element {element!r}", token_start)
+                element_counts: Counter = counts_stack[-1]
+                element_counts[element] = element_counts.get(element, 0) + (
+                    int(count) if count else 1
+                )
+                has_formula = can_dot = True
+                dot_position = -1
+                if species_start == -1:
+                    species_start = token_start
+                species_end = position
+                continue
+
+            if separator:
+                # report the separator itself, not the spaces before it
+                token_start += token.index(separator)
+                if species_only:
+                    raise self.error(f"Unexpected {separator!r}", token_start)
+                finishSpecies(end_position=token_start)
+                if separator == "=":
+                    if len(sides_list) == 2:
+                        raise self.error("More than one '='", token_start)
+                    sides_list.append([])
+                    self.written_coefficients.append([])
+                species_start = -1
+                counts_stack = [Counter()]
+                hydrate_counts = [0]
+                has_formula = is_electron = charged = can_dot = False
+                dot_position = -1
+                charge = 0
+                written_coefficient = ""
+                continue
+
+            if space:
+                continue
+
+            if invalid:
+                raise self.error(f"Unexpected character {invalid!r}", token_start)
+            if coefficient:
+                # kept out of the species text: the species starts after it
+                if species_start != -1 or written_coefficient:
+                    raise self.error(f"Unexpected number {coefficient!r}", token_start)
+                written_coefficient = coefficient
+                continue
+            if species_start == -1:
+                species_start = token_start
+            species_end = position
+            if charged and not (closing and not group_count):
+                raise self.error("A charge can only end a species", token_start)
+            if is_electron and not (charge_text or (closing and not group_count)):
+                raise self.error("The electron must stand alone", token_start)
+
+            if opening:
+                brackets_stack.append((opening, token_start))
+                counts_stack.append(Counter())
+                hydrate_counts.append(0)
+                can_dot = False
+                dot_position = -1
+            elif closing:
+                if (
+                    not brackets_stack
+                    or closing_brackets_dict[brackets_stack[-1][0]] != closing
+                ):
+                    raise self.error(
+                        "Unbalanced parentheses in chemical formula", token_start
+                    )
+                if dot_position != -1:
+                    raise self.error(
+                        "A hydrate dot needs a formula on both sides", dot_position
+                    )
+                brackets_stack.pop()
+                if hydrate_counts[-1]:
+                    foldHydrate()
+                hydrate_counts.pop()
+                can_dot = True
+                group_counts: Counter = counts_stack.pop()
+                multiplier: int = int(group_count) if group_count else 1
+                element_counts = counts_stack[-1]
+                for element, count in group_counts.items():
+                    element_counts[element] = (
+                        element_counts.get(element, 0) + count * multiplier
+                    )
+            elif hydrate_dot:
+                if not can_dot:
+                    raise self.error(
+                        "A hydrate dot needs a formula on both sides", token_start
+                    )
+                if hydrate_count and not int(hydrate_count):
+                    raise self.error("A hydrate count must be positive", token_start)
+                if hydrate_counts[-1]:
+                    foldHydrate()
+                counts_stack.append(Counter())
+                hydrate_counts[-1] = int(hydrate_count) if hydrate_count else 1
+                can_dot = False
+                dot_position = token_start
+            elif charge_text:
+                if not has_formula or dot_position != -1:
+                    raise self.error("A charge needs a species", token_start)
+                charge = (int(charge_text[:-1]) if len(charge_text) > 1 else 1) * (
+                    1 if charge_text[-1] == "+" else -1
+                )
+                charged = True
+            elif electron:
+                if has_formula:
+                    raise self.error("The electron must stand alone", token_start)
+                is_electron = has_formula = True
+
+        finishSpecies(end_position=text_length)
+        if not species_only and len(sides_list) != 2:
+            raise self.error("Expected exactly one '='", text_length)
+        return sides_list
+
+    def lex(self) -> list[list[tuple[str, Counter]]]:
+        """
+        Tokenizes the whole equation in one pass.
+
+        Returns:
+            list[list[tuple[str, Counter]]]: The reactants and the products, each
+            as (species text, element counts).
+        """
+        return self.scan(species_only=False)
+
+    def lexSpecies(self) -> Counter:
+        """
+        Tokenizes a single species, such as "Ca(OH)2" or "SO4^2-".
+
+        Returns:
+            Counter: The element counts (and the charge) of the species.
+        """
+        return self.scan(species_only=True)[0][0][1]
+
+
+# end region
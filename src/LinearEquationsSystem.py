@@ -12,6 +12,8 @@ class Generator:
     Attributes:
         chemical_equation : str
             The chemical equation to be parsed.
+        equation_parser : EquationParser
+            The parsed equation shared with the other stages.
         parameter_symbols : str
             Symbols used for parameters in the equations.
         reactants_list : list[str]
@@ -44,33 +46,37 @@ class Generator:
             Generates a system of linear equations for the reaction.
     """
 
-    def __init__(self, chemical_equation: str) -> None:
+    def __init__(
+        self, chemical_equation: str, equation_parser: EquationParser = None
+    ) -> None:
         """
         Constructs all the necessary attributes for the Generator object.
 
         Parameters:
             chemical_equation : str
                 The chemical equation to be parsed.
+            equation_parser : EquationParser
+                An already parsed equation; when given, the equation is not
+                parsed again.
         """
         self.chemical_equation: str = chemical_equation
 
         self.parameter_symbols: str = Assets.parameter_symbols
-        # Junior code, fix it
-        equation_parser_object: object = EquationParser(
-            chemical_equation=chemical_equation
-        )
-        equation_parser_object.parse()
-        #
-        self.reactants_list: list[str] = equation_parser_object.reactants_list
-        self.products_list: list[str] = equation_parser_object.products_list
+        if equation_parser is None:
+            equation_parser = EquationParser(chemical_equation=chemical_equation)
+            equation_parser.parse()
+        self.equation_parser: EquationParser = equation_parser
+
+        self.reactants_list: list[str] = self.equation_parser.reactants_list
+        self.products_list: list[str] = self.equation_parser.products_list
 
         self.present_elements_in_reaction: list[str] = []
 
         self.parsed_reactants: dict[str, dict[str, str]] = (
-            equation_parser_object.parsed_reactants
+            self.equation_parser.parsed_reactants
         )
         self.parsed_products: dict[str, dict[str, str]] = (
-            equation_parser_object.parsed_products
+            self.equation_parser.parsed_products
         )
         self.reactants_assigned_parameter_dict: dict[str, str] = {}
         self.products_assigned_parameter_dict: dict[str, str] = {}
@@ -97,80 +103,75 @@ class Generator:
         Returns:
             list: A list of elements present in the reaction.
         """
-        element_list: list[str] = []
-        temp_list: list = []
-        reactants_list: list[str] = self.reactants_list
-        products_list: list[str] = self.products_list
-
-        for reactant in reactants_list:
-            temp_list.append(
-                self.presentElementsInChemicalFormula(chemical_formula=reactant)
-            )
-
-        for product in products_list:
-            temp_list.append(
-                self.presentElementsInChemicalFormula(chemical_formula=product)
-            )
-
-        for sublist in temp_list:
-            element_list.extend(sublist)
-
-        element_list = list(set(element_list))
-        self.present_elements_in_reaction = element_list
+        # the element set is collected by the EquationParser while counting
+        self.present_elements_in_reaction = list(self.equation_parser.present_elements)
         self.demand_for_variables_to_solve_count = len(self.reactants_list) + len(
             self.products_list
         )  # Junior code, fix the formula for "self.demand_for_variables_to_solve_count"
 
+    def parameterSymbol(self, index: int) -> str:
+        """
+        Returns the name of the unknown of the species at the given position.
+        Letters from Assets.parameter_symbols are used while they suffice;
+        larger reactions use indexed names (x0, x1, ...) for every unknown, so
+        the number of species is not limited by the alphabet.
+
+        Parameters:
+            index : int
+                Position of the species (reactants first, then products).
+
+        Returns:
+            str: The name of the unknown.
+        """
+        if self.demand_for_variables_to_solve_count <= len(Assets.parameter_symbols):
+            return Assets.parameter_symbols[index]
+        return f"x{index}"
+
     def assignParameter(self) -> None:
         """
         Assigns parameters to reactants and products.
         """
         self.presentElementsInReaction()
-        removing_index: int = 0
+        reactants_count: int = len(self.reactants_list)
 
         for i, reactant in enumerate(self.reactants_list):
-            self.reactants_assigned_parameter_dict[reactant] = self.parameter_symbols[i]
-            removing_index = i
-
-        self.parameter_symbols = self.parameter_symbols[removing_index + 1 :]
+            self.reactants_assigned_parameter_dict[reactant] = self.parameterSymbol(
+                index=i
+            )
 
         for i, product in enumerate(self.products_list):
-            self.products_assigned_parameter_dict[product] = self.parameter_symbols[i]
-            removing_index = i
-
-        self.parameter_symbols = self.parameter_symbols[removing_index + 1 :]
+            self.products_assigned_parameter_dict[product] = self.parameterSymbol(
+                index=reactants_count + i
+            )
 
     def generateLinearEquationsSystem(self) -> list:
         """
         Generates a system of linear equations for the reaction.
 
+        Each species only adds terms for the elements it contains, so the work
+        is proportional to the number of non-zero element counts.
+
         Returns:
             list: A list of linear equations.
         """
         self.assignParameter()
-        equations_list: list[str] = []
-        equation: str = ""
-        left_hand: str = ""
-        right_hand: str = ""
-
-        for element in self.present_elements_in_reaction:
-            for reactant in self.reactants_list:
-                if element in self.parsed_reactants[reactant]:
-                    left_hand += f"{self.parsed_reactants[reactant][element]}*{self.reactants_assigned_parameter_dict[reactant]}+"
-
-            for product in self.products_list:
-                if element in self.parsed_products[product]:
-                    right_hand += f"{self.parsed_products[product][element]}*{self.products_assigned_parameter_dict[product]}-"
+        terms_dict: dict[str, list[str]] = {
+            element: [] for element in self.present_elements_in_reaction
+        }
 
-            left_hand = left_hand[:-1]
-            right_hand = right_hand[:-1]
+        for reactant in self.reactants_list:
+            for element, count in self.parsed_reactants[reactant].items():
+                terms_dict[element].append(
+                    f"+{count}*{self.reactants_assigned_parameter_dict[reactant]}"
+                )
 
-            equation = f"{left_hand}-{right_hand}"
-            equations_list.append(equation)
-            left_hand = ""
-            right_hand = ""
+        for product in self.products_list:
+            for element, count in self.parsed_products[product].items():
+                terms_dict[element].append(
+                    f"-{count}*{self.products_assigned_parameter_dict[product]}"
+                )
 
-        return equations_list
+        return ["".join(terms).lstrip("+") for terms in terms_dict.values()]
 
     # end region
 
@@ -185,12 +186,18 @@ class Generator:
                 The chemical equation to be parsed.
             current_directory : str
                 The current directory of the file.
+            json_file_path : str
+                The JSON file the solver file writes its solution to, unique to
+                this object unless one is given.
+            solver_file_path : str
+                The path of the solver file, unique to this object so that
+                concurrent FileMaker objects never overwrite each other.
             system_of_linear_equations : list
                 The system of linear equations generated.
             num_of_variables : int
                 Number of variables to solve for.
-            symbols_list : str
-                List of parameter symbols.
+            symbols_list : list[str]
+                Names of the unknowns, one per species.
             variables_str : str
                 String representation of variables.
 
@@ -198,20 +205,31 @@ class Generator:
             generateEquationAndSaveSolverFile() -> None:
                 Generates the equation and saves the solver file.
             executeSolverFile() -> None:
-                Executes the solver file.
+                Executes the solver file and removes it.
         """
 
-        def __init__(self, chemical_equation: str) -> None:
+        def __init__(self, chemical_equation: str, json_file_path: str = None) -> None:
             """
             Constructs all the necessary attributes for the FileMaker object.
 
             Parameters:
                 chemical_equation : str
                     The chemical equation to be parsed.
+                json_file_path : str
+                    The JSON file the solver file writes its solution to; None
+                    for a file named after the solver file.
             """
             self.chemical_equation = chemical_equation
 
             self.current_directory = os.path.dirname(__file__)
+            file_token: str = os.urandom(16).hex()
+            self.json_file_path: str = json_file_path or os.path.join(
+                self.current_directory, f"data.{file_token}.json"
+            )
+            self.solver_file_path: str = os.path.join(
+                self.current_directory,
+                f"linear_equations_system_solver.{file_token}.automatic.py",
+            )
 
             equation_generator_object = Generator(
                 chemical_equation=self.chemical_equation
@@ -223,21 +241,15 @@ class Generator:
             self.num_of_variables = (
                 equation_generator_object.demand_for_variables_to_solve_count
             )
-            self.symbols_list = Assets.parameter_symbols
-            self.variables_str = ""
-
-            for i, symbol in enumerate(self.symbols_list):
-                self.variables_str += symbol
-                if self.num_of_variables == i:
-                    break
-                else:
-                    self.variables_str += ","
+            self.symbols_list: list[str] = list(
+                equation_generator_object.reactants_assigned_parameter_dict.values()
+            ) + list(equation_generator_object.products_assigned_parameter_dict.values())
+            self.variables_str: str = ",".join(self.symbols_list)
 
         def generateEquationAndSaveSolverFile(self) -> None:
             """
             Generates the equation and saves the solver file.
             """
-            self.variables_str: str = self.variables_str[0:-2]
             file_content: str = rf"""# [DO NOT MODIFY] Automatically generated.
 from sympy import symbols
 from sympy.solvers.solveset import linsolve
@@ -250,29 +262,26 @@ current_directory = os.path.dirname(__file__)
 equation_solution = linsolve({self.system_of_linear_equations},({self.variables_str}))
 
 
-x = symbols(str({self.variables_str[::-1][0]}))
+x = symbols("{self.symbols_list[-1]}")
 equation_solution = [expr.subs(x, 1) for expr in equation_solution][0]
 
 
-handler_object = Handler()
-handler_object.write()
-
-handler_object.update(key="equation_solution",value=str(equation_solution))
+handler_object = Handler(file_path=r"{self.json_file_path}", create_if_missing=False)
+handler_object.write(content={{"equation_solution": str(equation_solution), "error_msg": ""}})
     """
-            #
-            # Note : I know this is not a best practice to repeat and place the file name twice instead of 
-            # defining a single variable and do the job but, ... ... o well ¯\_(ツ)_/¯ it works, then I never touch it ¬_¬
-            with open(
-                rf"{self.current_directory}\linear_equations_system_solver.automatic.py",
-                "w",
-            ) as solver_file:
+            with open(self.solver_file_path, "w") as solver_file:
                 solver_file.write(file_content)
 
         def executeSolverFile(self):
-            with open(
-                rf"{self.current_directory}\linear_equations_system_solver.automatic.py"
-            ) as file:
-                exec(file.read())
+            """
+            Executes the solver file in its own namespace and removes it.
+            """
+            try:
+                with open(self.solver_file_path) as file:
+                    exec(file.read(), {"__file__": self.solver_file_path})
+            finally:
+                if os.path.isfile(self.solver_file_path):
+                    os.remove(self.solver_file_path)
 
 
 # end region
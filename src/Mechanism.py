@@ -0,0 +1,365 @@
+from collections import Counter
+from fractions import Fraction
+from src.Lexer import EquationLexer
+from src.Nullspace import IntegerNullspace
+from src.Parser import ElementCounter
+from src.Species import SpeciesTable
+from src.SparseMatrix import CompositionMatrix
+
+# region Reaction Report
+
+
+class ReactionReport:
+    """
+    A class to hold the outcome of balancing one reaction of a mechanism.
+
+    Attributes:
+        index : int
+            Position of the reaction in the mechanism.
+        chemical_equation : str
+            The reaction as written.
+        status : str
+            "balanced" (unique positive balance), "ambiguous" (more than one
+            independent balance), "unbalanceable" (no positive balance) or
+            "invalid" (the reaction could not be parsed).
+        species_list : list[str]
+            Reactants followed by products.
+        coefficients : list[int]
+            Smallest integer coefficients, empty unless status is "balanced".
+        balanced_as_written : bool
+            Whether the written coefficients (1 when omitted) already balance.
+        error_msg : str
+            The error message of an invalid reaction.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        chemical_equation: str,
+        status: str,
+        species_list: list[str] = None,
+        coefficients: list[int] = None,
+        balanced_as_written: bool = False,
+        error_msg: str = "",
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the ReactionReport object.
+
+        Parameters:
+            index : int
+                Position of the reaction in the mechanism.
+            chemical_equation : str
+                The reaction as written.
+            status : str
+                "balanced", "ambiguous", "unbalanceable" or "invalid".
+            species_list : list[str]
+                Reactants followed by products.
+            coefficients : list[int]
+                Smallest integer coefficients of a balanced reaction.
+            balanced_as_written : bool
+                Whether the written coefficients already balance.
+            error_msg : str
+                The error message of an invalid reaction.
+        """
+        self.index: int = index
+        self.chemical_equation: str = chemical_equation
+        self.status: str = status
+        self.species_list: list[str] = species_list or []
+        self.coefficients: list[int] = coefficients or []
+        self.balanced_as_written: bool = balanced_as_written
+        self.error_msg: str = error_msg
+
+    def __repr__(self) -> str:
+        return f"ReactionReport({self.index}, {self.status!r}, {self.coefficients})"
+
+
+# end region
+
+# region Mechanism
+
+
+class Mechanism:
+    """
+    A class to validate and balance a whole reaction mechanism at once.
+
+    Every distinct species is parsed once into a columnar SpeciesTable; the
+    mechanism is then described by a composition matrix (elements x distinct
+    species) and a stoichiometric
+    matrix (distinct species x reactions, reactants negative). Written
+    coefficients are verified for all reactions with one sparse product of
+    the two, and every reaction is balanced from the shared compositions.
+
+    Attributes:
+        chemical_equations : list[str]
+            The reactions of the mechanism.
+        species_index_dict : dict[str, int]
+            Column of each distinct species.
+        species_table : SpeciesTable
+            Element counts of each distinct species, in compact arrays.
+        reactions_list : list[tuple[list[int], list[int]]]
+            Reactant and product species columns of each parsed reaction.
+        stoichiometric_matrix : list[dict[int, Fraction]]
+            One sparse column per reaction with the written coefficients.
+        composition_matrix : CompositionMatrix
+            Elements x distinct species.
+        parse_errors_dict : dict[int, str]
+            Error message of each reaction that could not be parsed.
+
+    Methods:
+        registerSpecies(chemical_formula: str, element_counts: Counter = None) -> int:
+            Returns the column of a species, storing it the first time.
+        parseSide(lexed_species: list[tuple[str, Counter]], written_coefficients: list[str]) -> list[tuple[int, Fraction]]:
+            Turns the species of one side into species columns and coefficients.
+        parse() -> None:
+            Parses the reactions, registering each distinct species once.
+        verify() -> list[bool]:
+            Checks whether each reaction is balanced as written.
+        balanceReaction(index: int) -> tuple[str, list[int]]:
+            Balances one reaction from the shared species compositions.
+        execute() -> list[ReactionReport]:
+            Verifies and balances every reaction of the mechanism.
+    """
+
+    def __init__(self, chemical_equations: list[str]) -> None:
+        """
+        Constructs all the necessary attributes for the Mechanism object.
+
+        Parameters:
+            chemical_equations : list[str]
+                The reactions of the mechanism.
+        """
+        self.chemical_equations: list[str] = list(chemical_equations)
+        self.species_table: SpeciesTable = SpeciesTable()
+        # the table already indexes the formulas; share it instead of a copy
+        self.species_index_dict: dict[str, int] = self.species_table.index_dict
+        self.reactions_list: list[tuple[list[int], list[int]]] = []
+        self.stoichiometric_matrix: list[dict[int, Fraction]] = []
+        self.composition_matrix: CompositionMatrix = None
+        self.parse_errors_dict: dict[int, str] = {}
+
+    def registerSpecies(
+        self, chemical_formula: str, element_counts: Counter = None
+    ) -> int:
+        """
+        Returns the column of a species, storing it the first time it is seen.
+
+        Parameters:
+            chemical_formula : str
+                The species as written in the reaction (without coefficient).
+            element_counts : Counter
+                Its element counts when already known (e.g. from the lexer);
+                otherwise the formula is parsed.
+
+        Returns:
+            int: The column of the species.
+        """
+        species: str = (
+            chemical_formula
+            if chemical_formula.startswith("(")
+            else "(" + chemical_formula + ")"
+        )
+        species_index: int = self.species_index_dict.get(species, -1)
+        if species_index == -1:
+            species_index = self.species_table.add(
+                formula=species,
+                element_counts=(
+                    element_counts
+                    if element_counts is not None
+                    else ElementCounter(chemical_formula=species).parseFormula()
+                ),
+            )
+        return species_index
+
+    def parseSide(
+        self, lexed_species: list[tuple[str, Counter]], written_coefficients: list[str]
+    ) -> list[tuple[int, Fraction]]:
+        """
+        Turns the species of one side into (species column, coefficient) pairs.
+        A written coefficient with a zero denominator ("2/0") is a ValueError.
+
+        Parameters:
+            lexed_species : list[tuple[str, Counter]]
+                The species of the side as returned by the EquationLexer, e.g.
+                [("H2", ...), ("O2", ...)].
+            written_coefficients : list[str]
+                Their written coefficients from the same lexer, e.g. ["2", ""].
+
+        Returns:
+            list[tuple[int, Fraction]]: The species of the side.
+        """
+        terms_list: list[tuple[int, Fraction]] = []
+        for (chemical_formula, element_counts), coefficient in zip(
+            lexed_species, written_coefficients
+        ):
+            try:
+                written_coefficient: Fraction = (
+                    Fraction(coefficient) if coefficient else Fraction(1)
+                )
+            except ZeroDivisionError:
+                # reported on the reaction like any other malformed coefficient
+                raise ValueError(
+                    f"Zero denominator in coefficient {coefficient!r}: {chemical_formula}"
+                ) from None
+            terms_list.append(
+                (
+                    self.registerSpecies(
+                        chemical_formula=chemical_formula, element_counts=element_counts
+                    ),
+                    written_coefficient,
+                )
+            )
+        return terms_list
+
+    def parse(self) -> None:
+        """
+        Parses the reactions, registering each distinct species once, and
+        builds the stoichiometric and composition matrices. Parsing again
+        rebuilds them from scratch.
+        """
+        self.reactions_list = []
+        self.stoichiometric_matrix = []
+        self.parse_errors_dict = {}
+        for index, chemical_equation in enumerate(self.chemical_equations):
+            try:
+                # validated in one pass; a malformed reaction fails here
+                equation_lexer: EquationLexer = EquationLexer(
+                    chemical_equation=chemical_equation
+                )
+                reactants, products = equation_lexer.lex()
+                reactant_coefficients, product_coefficients = (
+                    equation_lexer.written_coefficients
+                )
+                reactant_terms: list[tuple[int, Fraction]] = self.parseSide(
+                    reactants, reactant_coefficients
+                )
+                product_terms: list[tuple[int, Fraction]] = self.parseSide(
+                    products, product_coefficients
+                )
+            except ValueError as error:
+                self.parse_errors_dict[index] = str(error)
+                self.reactions_list.append(([], []))
+                self.stoichiometric_matrix.append({})
+                continue
+
+            stoichiometric_column: dict[int, Fraction] = {}
+            for species_index, coefficient in reactant_terms:
+                stoichiometric_column[species_index] = (
+                    stoichiometric_column.get(species_index, 0) - coefficient
+                )
+            for species_index, coefficient in product_terms:
+                stoichiometric_column[species_index] = (
+                    stoichiometric_column.get(species_index, 0) + coefficient
+                )
+            self.reactions_list.append(
+                (
+                    [species_index for species_index, _ in reactant_terms],
+                    [species_index for species_index, _ in product_terms],
+                )
+            )
+            self.stoichiometric_matrix.append(stoichiometric_column)
+
+        self.composition_matrix = self.species_table.compositionMatrix(
+            reactant_indices=range(len(self.species_table)), product_indices=[]
+        )
+
+    def verify(self) -> list[bool]:
+        """
+        Checks whether each reaction is balanced as written, computing the
+        element residuals of all reactions as one sparse product of the
+        composition and stoichiometric matrices (elements x reactions).
+
+        Returns:
+            list[bool]: One flag per reaction (False for invalid reactions).
+        """
+        # the stoichiometric matrix is kept by columns; the product reads it by rows
+        species_rows: dict[int, dict[int, Fraction]] = {}
+        for reaction_index, stoichiometric_column in enumerate(self.stoichiometric_matrix):
+            for species_index, coefficient in stoichiometric_column.items():
+                species_rows.setdefault(species_index, {})[reaction_index] = coefficient
+        unbalanced_set: set[int] = {
+            reaction_index
+            for residual_row in self.composition_matrix.multiplySparse(
+                matrix_rows=species_rows
+            )
+            for reaction_index, residual in residual_row.items()
+            if residual
+        }
+        return [
+            index not in self.parse_errors_dict and index not in unbalanced_set
+            for index in range(len(self.chemical_equations))
+        ]
+
+    def balanceReaction(self, index: int) -> tuple[str, list[int]]:
+        """
+        Balances one reaction, gathering its composition matrix from the
+        species table.
+
+        Parameters:
+            index : int
+                Position of the reaction in the mechanism.
+
+        Returns:
+            tuple[str, list[int]]: The status and the integer coefficients.
+        """
+        reactant_columns, product_columns = self.reactions_list[index]
+        integer_nullspace: IntegerNullspace = IntegerNullspace(
+            matrix=self.species_table.compositionMatrix(
+                reactant_indices=reactant_columns, product_indices=product_columns
+            )
+        )
+        integer_nullspace.reduce()
+        free_columns: list[int] = integer_nullspace.freeColumns()
+        if len(free_columns) > 1:
+            return "ambiguous", []
+        if not free_columns:
+            return "unbalanceable", []
+
+        coefficients: list[int] = integer_nullspace.basisVector(
+            free_column=free_columns[0]
+        )
+        if any(coefficient <= 0 for coefficient in coefficients):
+            return "unbalanceable", []
+        return "balanced", coefficients
+
+    def execute(self) -> list[ReactionReport]:
+        """
+        Verifies and balances every reaction of the mechanism.
+
+        Returns:
+            list[ReactionReport]: One report per reaction, in input order.
+        """
+        self.parse()
+        balanced_list: list[bool] = self.verify()
+        species_names: list[str] = list(self.species_index_dict)
+
+        reports_list: list[ReactionReport] = []
+        for index, chemical_equation in enumerate(self.chemical_equations):
+            if index in self.parse_errors_dict:
+                reports_list.append(
+                    ReactionReport(
+                        index=index,
+                        chemical_equation=chemical_equation,
+                        status="invalid",
+                        error_msg=self.parse_errors_dict[index],
+                    )
+                )
+                continue
+            reactant_columns, product_columns = self.reactions_list[index]
+            status, coefficients = self.balanceReaction(index=index)
+            reports_list.append(
+                ReactionReport(
+                    index=index,
+                    chemical_equation=chemical_equation,
+                    status=status,
+                    species_list=[
+                        species_names[column]
+                        for column in reactant_columns + product_columns
+                    ],
+                    coefficients=coefficients,
+                    balanced_as_written=balanced_list[index],
+                )
+            )
+        return reports_list
+
+
+# end region
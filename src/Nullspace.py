@@ -0,0 +1,691 @@
+import threading
+from math import gcd, isqrt
+from src.Budget import BalanceBudget
+from src.SparseMatrix import CompositionMatrix
+
+word_primes_list: list[int] = []
+"""list[int]: The primes below 2**31 found so far, largest first; extended on demand by wordPrimes."""
+
+word_primes_lock: threading.Lock = threading.Lock()
+"""threading.Lock: Guards the extension of word_primes_list, reached from server and executor threads."""
+
+
+def isPrime(number: int) -> bool:
+    """
+    Deterministic Miller-Rabin test, exact for every number below 3.4e14.
+    """
+    if number < 2:
+        return False
+    for base in (2, 3, 5, 7, 11, 13, 17):
+        if number % base == 0:
+            return number == base
+    exponent: int = number - 1
+    shift: int = 0
+    while exponent % 2 == 0:
+        exponent //= 2
+        shift += 1
+    for base in (2, 3, 5, 7, 11, 13, 17):
+        value: int = pow(base, exponent, number)
+        if value in (1, number - 1):
+            continue
+        for _ in range(shift - 1):
+            value = value * value % number
+            if value == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def wordPrimes(count: int) -> list[int]:
+    """
+    Returns the count largest primes below 2**31, so products of two residues
+    stay within a 64-bit word. The list is only extended under
+    word_primes_lock, so concurrent calls never add a prime twice.
+
+    Parameters:
+        count : int
+            Number of primes.
+
+    Returns:
+        list[int]: The primes, largest first.
+    """
+    if len(word_primes_list) < count:
+        with word_primes_lock:
+            candidate: int = word_primes_list[-1] - 2 if word_primes_list else 2**31 - 1
+            while len(word_primes_list) < count:
+                if isPrime(candidate):
+                    word_primes_list.append(candidate)
+                candidate -= 2
+    return word_primes_list[:count]
+
+
+# region Integer Nullspace
+
+
+class IntegerNullspace:
+    """
+    A class to compute the nullspace of an integer matrix with fraction-free
+    (Bareiss) Gauss-Jordan elimination, using plain Python ints only.
+
+    Rows are kept sparse ({column: value} dictionaries), so the work follows
+    the non-zero entries of the matrix. After the reduction every pivot entry
+    equals the same integer (the last Bareiss pivot) and the pivot columns are
+    zero elsewhere, so the nullspace basis can be read off the reduced matrix
+    without any rational arithmetic.
+
+    Attributes:
+        matrix : list[list[int]] | CompositionMatrix
+            The matrix whose nullspace is computed, dense rows or sparse.
+        columns_count : int
+            Number of columns of the matrix.
+        reduced_matrix : list[dict[int, int]]
+            The fraction-free reduced row echelon form (non-zero rows only).
+        pivot_columns : list[int]
+            Column index of the pivot of each row of reduced_matrix.
+        budget : BalanceBudget
+            The running budget of the balance, None for no limits.
+
+    Methods:
+        reduce() -> None:
+            Reduces the matrix with fraction-free Gauss-Jordan elimination.
+        freeColumns() -> list[int]:
+            Returns the columns without a pivot, one per nullspace dimension.
+        basisVector(free_column: int) -> list[int]:
+            Returns the primitive nullspace vector of a free column.
+        basis() -> list[list[int]]:
+            Returns one primitive integer vector per free column.
+        normalizeVector(vector: list[int]) -> list[int]:
+            Divides a vector by the gcd of its entries and fixes its sign.
+    """
+
+    def __init__(
+        self,
+        matrix: "list[list[int]] | CompositionMatrix",
+        columns_count: int = None,
+        budget: BalanceBudget = None,
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the IntegerNullspace object.
+
+        Parameters:
+            matrix : list[list[int]] | CompositionMatrix
+                The matrix whose nullspace is computed, dense rows or sparse.
+            columns_count : int
+                Number of columns, only needed for dense matrices without rows.
+            budget : BalanceBudget
+                The running budget of the balance, checked after every pivot
+                column; None for no limits.
+        """
+        self.matrix = matrix
+        self.budget: BalanceBudget = budget
+        if isinstance(matrix, CompositionMatrix):
+            self.columns_count: int = matrix.columns_count
+        else:
+            self.columns_count: int = (
+                len(matrix[0]) if matrix else (columns_count or 0)
+            )
+        self.reduced_matrix: list[dict[int, int]] = []
+        self.pivot_columns: list[int] = []
+
+    def reduce(self) -> None:
+        """
+        Reduces the matrix with fraction-free Gauss-Jordan elimination.
+        Every division below is exact (Bareiss), so entries stay integers and
+        only grow as large as the minors of the matrix.
+        """
+        if isinstance(self.matrix, CompositionMatrix):
+            rows: list[dict[int, int]] = self.matrix.sparseRows()
+        else:
+            rows: list[dict[int, int]] = [
+                {column: value for column, value in enumerate(row) if value}
+                for row in self.matrix
+            ]
+        rows_count: int = len(rows)
+        previous_pivot: int = 1
+        rank: int = 0
+        pivot_columns: list[int] = []
+
+        for column in range(self.columns_count):
+            if rank == rows_count:
+                break
+            pivot_row: int = next(
+                (i for i in range(rank, rows_count) if column in rows[i]), -1
+            )
+            if pivot_row == -1:
+                continue
+            rows[rank], rows[pivot_row] = rows[pivot_row], rows[rank]
+            pivot_values: dict[int, int] = rows[rank]
+            pivot: int = pivot_values[column]
+
+            for i in range(rows_count):
+                if i == rank:
+                    continue
+                row: dict[int, int] = rows[i]
+                factor: int = row.get(column, 0)
+                if factor == 0:
+                    # a zero entry still has to be scaled to keep Bareiss exact
+                    if pivot != previous_pivot:
+                        rows[i] = {
+                            key: pivot * value // previous_pivot
+                            for key, value in row.items()
+                        }
+                    continue
+                reduced_row: dict[int, int] = {}
+                for key in row.keys() | pivot_values.keys():
+                    value: int = (
+                        pivot * row.get(key, 0) - factor * pivot_values.get(key, 0)
+                    ) // previous_pivot
+                    if value:
+                        reduced_row[key] = value
+                rows[i] = reduced_row
+
+            previous_pivot = pivot
+            pivot_columns.append(column)
+            rank += 1
+            if self.budget is not None:
+                self.budget.checkTime(stage="solve")
+
+        self.reduced_matrix = rows[:rank]
+        self.pivot_columns = pivot_columns
+
+    def freeColumns(self) -> list[int]:
+        """
+        Returns the columns without a pivot, one per nullspace dimension.
+        reduce() must have been called.
+
+        Returns:
+            list[int]: The free columns, in increasing order.
+        """
+        pivot_set: set[int] = set(self.pivot_columns)
+        return [column for column in range(self.columns_count) if column not in pivot_set]
+
+    def basisVector(self, free_column: int) -> list[int]:
+        """
+        Returns the primitive nullspace vector of a free column: a positive
+        entry at the free column, zeros at the other free columns and the
+        matching values at the pivot columns. reduce() must have been called.
+
+        Parameters:
+            free_column : int
+                A column returned by freeColumns().
+
+        Returns:
+            list[int]: The nullspace vector.
+        """
+        common_pivot: int = (
+            self.reduced_matrix[-1][self.pivot_columns[-1]] if self.reduced_matrix else 1
+        )
+        vector: list[int] = [0] * self.columns_count
+        vector[free_column] = common_pivot
+        for row, pivot_column in zip(self.reduced_matrix, self.pivot_columns):
+            vector[pivot_column] = -row.get(free_column, 0)
+        return self.normalizeVector(vector=vector)
+
+    def basis(self) -> list[list[int]]:
+        """
+        Returns one primitive integer vector per free column.
+
+        Returns:
+            list[list[int]]: The nullspace basis, possibly empty.
+        """
+        self.reduce()
+        return [
+            self.basisVector(free_column=free_column)
+            for free_column in self.freeColumns()
+        ]
+
+    @staticmethod
+    def normalizeVector(vector: list[int]) -> list[int]:
+        """
+        Divides a vector by the gcd of its entries and makes its first non-zero
+        entry positive.
+
+        Parameters:
+            vector : list[int]
+                The vector to be normalized.
+
+        Returns:
+            list[int]: The primitive vector.
+        """
+        divisor: int = 0
+        for value in vector:
+            divisor = gcd(divisor, value)
+        if divisor == 0:
+            return list(vector)
+        sign: int = next((1 if value > 0 else -1 for value in vector if value), 1)
+        return [sign * value // divisor for value in vector]
+
+
+# end region
+
+# region Extreme Reactions
+
+
+class ExtremeReactions:
+    """
+    A class to enumerate the minimal non-negative integer solutions of A x = 0,
+    i.e. the extreme rays of the cone {x >= 0, A x = 0}, with the double
+    description method.
+
+    For a composition matrix (reactant counts positive, product counts
+    negative) these are the independent balanced reactions: every reaction
+    that balances with non-negative coefficients is a non-negative
+    combination of them, and none of them can be split into smaller ones.
+
+    The enumeration starts from the integer nullspace basis, whose rays
+    already satisfy x >= 0 on the free columns, and adds the constraint
+    x >= 0 of one pivot column at a time. Since the number of rays can grow
+    quickly, it stops as soon as more than max_rays rays are alive.
+
+    Attributes:
+        matrix : list[list[int]] | CompositionMatrix
+            The matrix A, dense rows or sparse.
+        max_rays : int
+            Cap on the number of rays alive at any step.
+        truncated : bool
+            Whether the enumeration hit max_rays and was abandoned.
+
+    Methods:
+        enumerate() -> list[list[int]]:
+            Returns the extreme rays as primitive non-negative integer vectors.
+    """
+
+    def __init__(
+        self, matrix: "list[list[int]] | CompositionMatrix", max_rays: int = 256
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the ExtremeReactions object.
+
+        Parameters:
+            matrix : list[list[int]] | CompositionMatrix
+                The matrix A, dense rows or sparse.
+            max_rays : int
+                Cap on the number of rays alive at any step.
+        """
+        self.matrix = matrix
+        self.max_rays: int = max_rays
+        self.truncated: bool = False
+
+    @staticmethod
+    def zeroMask(vector: list[int]) -> int:
+        """
+        Returns a bitmask with bit i set when vector[i] is zero.
+        """
+        mask: int = 0
+        for index, value in enumerate(vector):
+            if value == 0:
+                mask |= 1 << index
+        return mask
+
+    def enumerate(self) -> list[list[int]]:
+        """
+        Returns the extreme rays as primitive non-negative integer vectors. The
+        list is empty when no non-negative solution exists or when the
+        enumeration was truncated (see the truncated attribute).
+
+        Returns:
+            list[list[int]]: The extreme rays, sorted.
+        """
+        self.truncated = False
+        integer_nullspace: IntegerNullspace = IntegerNullspace(matrix=self.matrix)
+        integer_nullspace.reduce()
+        free_columns: list[int] = integer_nullspace.freeColumns()
+        if not free_columns:
+            return []
+
+        rays: list[list[int]] = []
+        for free_column in free_columns:
+            vector: list[int] = integer_nullspace.basisVector(free_column=free_column)
+            rays.append(vector if vector[free_column] > 0 else [-value for value in vector])
+        if len(rays) > self.max_rays:
+            self.truncated = True
+            return []
+
+        # only the coordinates constrained so far take part in adjacency tests
+        processed_mask: int = 0
+        for free_column in free_columns:
+            processed_mask |= 1 << free_column
+        # two rays are adjacent only if they share at least dimension - 2 zeros
+        dimension: int = len(free_columns)
+
+        for column in integer_nullspace.pivot_columns:
+            zero_masks: list[int] = [self.zeroMask(ray) & processed_mask for ray in rays]
+            positive_rays: list[int] = [i for i, ray in enumerate(rays) if ray[column] > 0]
+            negative_rays: list[int] = [i for i, ray in enumerate(rays) if ray[column] < 0]
+            next_rays: list[list[int]] = [ray for ray in rays if ray[column] >= 0]
+
+            for p in positive_rays:
+                for n in negative_rays:
+                    common_mask: int = zero_masks[p] & zero_masks[n]
+                    if bin(common_mask).count("1") < dimension - 2:
+                        continue
+                    # combinatorial adjacency test: no third ray vanishes on the
+                    # common zero set of p and n
+                    if any(
+                        other != p
+                        and other != n
+                        and zero_masks[other] & common_mask == common_mask
+                        for other in range(len(rays))
+                    ):
+                        continue
+                    next_rays.append(
+                        self.normalizeRay(
+                            [
+                                -rays[n][column] * p_value + rays[p][column] * n_value
+                                for p_value, n_value in zip(rays[p], rays[n])
+                            ]
+                        )
+                    )
+                    if len(next_rays) > self.max_rays:
+                        self.truncated = True
+                        return []
+
+            rays = next_rays
+            processed_mask |= 1 << column
+            if not rays:
+                return []
+
+        return sorted(self.normalizeRay(ray) for ray in rays)
+
+    @staticmethod
+    def normalizeRay(ray: list[int]) -> list[int]:
+        """
+        Divides a ray by the gcd of its entries, keeping its direction.
+        """
+        divisor: int = 0
+        for value in ray:
+            divisor = gcd(divisor, value)
+        return [value // divisor for value in ray] if divisor else list(ray)
+
+
+# end region
+
+# region Modular Nullspace
+
+
+class ModularNullspace:
+    """
+    A class to compute the nullspace of an integer matrix modulo word-sized
+    primes, for matrices whose exact elimination makes the entries swell.
+
+    The matrix is reduced to row echelon form modulo several primes below
+    2**31, where every entry stays one word. The rational nullspace vectors
+    are rebuilt from their residues with the Chinese remainder theorem and
+    rational reconstruction, then verified against the original matrix;
+    while the reconstruction or the verification fails, more primes are
+    added. The work thus grows with the size of the coefficients in the
+    result, not with the intermediate entries of an exact elimination.
+
+    A prime dividing a minor of the matrix can lose rank or move a pivot; the
+    pivot columns over the rationals are those of the primes with the
+    highest rank and the earliest pivots, so the other primes are ignored.
+
+    It has the interface of IntegerNullspace and returns the same vectors.
+
+    Attributes:
+        matrix : list[list[int]] | CompositionMatrix
+            The matrix whose nullspace is computed, dense rows or sparse.
+        columns_count : int
+            Number of columns of the matrix.
+        pivot_columns : list[int]
+            Column index of the pivot of each row of the echelon form.
+        reductions_dict : dict[int, list[list[int]]]
+            Reduced rows modulo each prime agreeing with pivot_columns.
+        primes_count : int
+            Number of primes used so far.
+        budget : BalanceBudget
+            The running budget of the balance, None for no limits.
+
+    Methods:
+        reduceModulo(prime: int) -> tuple[list[int], list[list[int]]]:
+            Reduces the matrix modulo one prime.
+        reduce() -> None:
+            Reduces the matrix modulo the current primes.
+        freeColumns() -> list[int]:
+            Returns the columns without a pivot, one per nullspace dimension.
+        basisVector(free_column: int) -> list[int]:
+            Returns the primitive nullspace vector of a free column.
+        basis() -> list[list[int]]:
+            Returns one primitive integer vector per free column.
+        rationalReconstruction(residue: int, modulus: int) -> tuple[int, int]:
+            Returns the fraction of small height congruent to a residue.
+    """
+
+    def __init__(
+        self,
+        matrix: "list[list[int]] | CompositionMatrix",
+        columns_count: int = None,
+        primes_count: int = 2,
+        budget: BalanceBudget = None,
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the ModularNullspace object.
+
+        Parameters:
+            matrix : list[list[int]] | CompositionMatrix
+                The matrix whose nullspace is computed, dense rows or sparse.
+            columns_count : int
+                Number of columns, only needed for dense matrices without rows.
+            primes_count : int
+                Number of primes tried first.
+            budget : BalanceBudget
+                The running budget of the balance, checked after every prime;
+                None for no limits.
+        """
+        self.matrix = matrix
+        self.budget: BalanceBudget = budget
+        if isinstance(matrix, CompositionMatrix):
+            self.columns_count: int = matrix.columns_count
+            self.rows: list[dict[int, int]] = matrix.sparseRows()
+        else:
+            self.columns_count: int = (
+                len(matrix[0]) if matrix else (columns_count or 0)
+            )
+            self.rows: list[dict[int, int]] = [
+                {column: value for column, value in enumerate(row) if value}
+                for row in matrix
+            ]
+        self.primes_count: int = primes_count
+        self.pivot_columns: list[int] = []
+        self.reductions_dict: dict[int, list[list[int]]] = {}
+        self.patterns_dict: dict[int, list[int]] = {}
+
+    def reduceModulo(self, prime: int) -> tuple[list[int], list[list[int]]]:
+        """
+        Reduces the matrix to reduced row echelon form modulo a prime, with
+        every pivot scaled to 1. Rows are dense lists of residues: composition
+        matrices are small, and whole-row comprehensions beat dict updates.
+
+        Parameters:
+            prime : int
+                The prime modulus.
+
+        Returns:
+            tuple[list[int], list[list[int]]]: The pivot columns and the
+            non-zero reduced rows.
+        """
+        columns_count: int = self.columns_count
+        rows: list[list[int]] = []
+        for row in self.rows:
+            dense_row: list[int] = [0] * columns_count
+            for column, value in row.items():
+                dense_row[column] = value % prime
+            rows.append(dense_row)
+        rows_count: int = len(rows)
+        rank: int = 0
+        pivot_columns: list[int] = []
+
+        for column in range(columns_count):
+            if rank == rows_count:
+                break
+            pivot_row: int = next(
+                (i for i in range(rank, rows_count) if rows[i][column]), -1
+            )
+            if pivot_row == -1:
+                continue
+            rows[rank], rows[pivot_row] = rows[pivot_row], rows[rank]
+            inverse: int = pow(rows[rank][column], -1, prime)
+            pivot_values: list[int] = [value * inverse % prime for value in rows[rank]]
+            rows[rank] = pivot_values
+
+            for i in range(rows_count):
+                factor: int = rows[i][column]
+                if i == rank or factor == 0:
+                    continue
+                rows[i] = [
+                    (value - factor * pivot_value) % prime
+                    for value, pivot_value in zip(rows[i], pivot_values)
+                ]
+
+            pivot_columns.append(column)
+            rank += 1
+
+        return pivot_columns, rows[:rank]
+
+    def reduce(self) -> None:
+        """
+        Reduces the matrix modulo the current number of primes and keeps the
+        reductions agreeing with the rational pivot columns (highest rank,
+        then earliest pivots).
+        """
+        for prime in wordPrimes(self.primes_count):
+            if prime not in self.patterns_dict:
+                pivot_columns, reduced_rows = self.reduceModulo(prime=prime)
+                self.patterns_dict[prime] = pivot_columns
+                self.reductions_dict[prime] = reduced_rows
+                if self.budget is not None:
+                    self.budget.checkTime(stage="solve")
+
+        # a bad prime only loses rank or moves pivots to later columns
+        self.pivot_columns = min(
+            self.patterns_dict.values(), key=lambda pattern: (-len(pattern), pattern)
+        )
+        for prime, pivot_columns in self.patterns_dict.items():
+            if pivot_columns != self.pivot_columns:
+                self.reductions_dict.pop(prime, None)
+
+    def freeColumns(self) -> list[int]:
+        """
+        Returns the columns without a pivot, one per nullspace dimension.
+        reduce() must have been called.
+
+        Returns:
+            list[int]: The free columns, in increasing order.
+        """
+        pivot_set: set[int] = set(self.pivot_columns)
+        return [column for column in range(self.columns_count) if column not in pivot_set]
+
+    @staticmethod
+    def rationalReconstruction(residue: int, modulus: int) -> tuple[int, int]:
+        """
+        Returns the fraction a/b with |a|, b <= sqrt(modulus / 2) and
+        a = b * residue (mod modulus), or None when there is none.
+
+        Parameters:
+            residue : int
+                The residue, between 0 and modulus - 1.
+            modulus : int
+                The product of the primes.
+
+        Returns:
+            tuple[int, int]: The numerator and the positive denominator.
+        """
+        bound: int = isqrt(modulus // 2)
+        previous_remainder, remainder = modulus, residue
+        previous_coefficient, coefficient = 0, 1
+        while remainder > bound:
+            quotient: int = previous_remainder // remainder
+            previous_remainder, remainder = remainder, previous_remainder - quotient * remainder
+            previous_coefficient, coefficient = (
+                coefficient,
+                previous_coefficient - quotient * coefficient,
+            )
+        if coefficient == 0 or abs(coefficient) > bound:
+            return None
+        if coefficient < 0:
+            return -remainder, -coefficient
+        return remainder, coefficient
+
+    def isNullVector(self, vector: list[int]) -> bool:
+        """
+        Checks a vector against the original matrix.
+        """
+        return all(
+            sum(value * vector[column] for column, value in row.items()) == 0
+            for row in self.rows
+        )
+
+    def basisVector(self, free_column: int) -> list[int]:
+        """
+        Returns the primitive nullspace vector of a free column: a positive
+        entry at the free column, zeros at the other free columns and the
+        matching values at the pivot columns. Primes are added until the
+        reconstructed vector verifies against the matrix.
+
+        Parameters:
+            free_column : int
+                A column returned by freeColumns().
+
+        Returns:
+            list[int]: The nullspace vector.
+        """
+        while True:
+            if free_column in self.pivot_columns:
+                raise ValueError(f"Column {free_column} is not free")
+            primes_list: list[int] = list(self.reductions_dict)
+            modulus: int = 1
+            for prime in primes_list:
+                modulus *= prime
+            # the entries share most of their denominator: each residue is
+            # multiplied by the denominator found so far, so usually only the
+            # first reconstruction needs the full modulus
+            denominator: int = 1
+            numerators_list: list[tuple[int, int]] = []
+            for row_index in range(len(self.pivot_columns)):
+                # Chinese remainder theorem, one prime at a time
+                residue: int = 0
+                residue_modulus: int = 1
+                for prime in primes_list:
+                    value: int = -self.reductions_dict[prime][row_index][free_column] % prime
+                    step: int = (value - residue) * pow(residue_modulus, -1, prime) % prime
+                    residue += residue_modulus * step
+                    residue_modulus *= prime
+                fraction: tuple[int, int] = self.rationalReconstruction(
+                    residue=residue * denominator % modulus, modulus=modulus
+                )
+                if fraction is None:
+                    break
+                numerator, fraction_denominator = fraction
+                denominator *= fraction_denominator
+                numerators_list.append((numerator, denominator))
+            else:
+                vector: list[int] = [0] * self.columns_count
+                vector[free_column] = denominator
+                for pivot_column, (numerator, partial_denominator) in zip(
+                    self.pivot_columns, numerators_list
+                ):
+                    vector[pivot_column] = numerator * (denominator // partial_denominator)
+                if self.isNullVector(vector=vector):
+                    return IntegerNullspace.normalizeVector(vector=vector)
+
+            # not enough primes yet, or all of them were bad: add a quarter
+            # more, so the primes used stay close to the size of the result
+            self.primes_count += max(1, self.primes_count // 4)
+            self.reduce()
+
+    def basis(self) -> list[list[int]]:
+        """
+        Returns one primitive integer vector per free column.
+
+        Returns:
+            list[list[int]]: The nullspace basis, possibly empty.
+        """
+        self.reduce()
+        return [
+            self.basisVector(free_column=free_column)
+            for free_column in self.freeColumns()
+        ]
+
+
+# end region
@@ -1,5 +1,10 @@
 import re
 from collections import Counter
+from src.Budget import BalanceBudget
+from src.Lexer import EquationLexer
+
+element_symbol_pattern: re.Pattern[str] = re.compile(r"([A-Z][a-z]*)")
+"""re.Pattern[str]: Matches an element symbol, compiled once for every ElementMapper."""
 
 # region Element Mapper
 
@@ -35,11 +40,8 @@ class ElementMapper:
         Returns:
             dict: A dictionary with elements as keys and their positions as values.
         """
-        pattern: re.Pattern[str] = re.compile(
-            r"([A-Z][a-z]*)"
-        )  # Note : I don't know that using re.Pattern[str] is best practice or not!
         found_elements: dict = {}
-        for match in pattern.finditer(self.chemical_formula):
+        for match in element_symbol_pattern.finditer(self.chemical_formula):
             element: str = match.group(1)
             index: int = match.start()
 
@@ -81,38 +83,14 @@ class ElementCounter:
         """
         Parses the chemical formula and counts the elements.
 
+        The formula is read once by the EquationLexer, which multiplies the
+        counts of each group as it closes and rejects unknown element symbols,
+        unbalanced parentheses and misplaced charges with a ValueError.
+
         Returns:
             Counter: A Counter object with element counts.
         """
-
-        def expand(match):
-            content, count = match.groups()
-            if count == "":
-                count = 1
-            else:
-                count = int(count)
-            return content * count
-
-        # Expand parentheses
-        # [Temporary] Note : the commented codes are left intentionally because
-        # they are never used
-        while "(" in self.chemical_formula:  # or '[' in formula or '{' in formula:
-            self.chemical_formula = re.sub(
-                r"\(([^()]+)\)(\d*)", expand, self.chemical_formula
-            )
-            # formula = re.sub(r'\[([^()]+)\](\d*)', expand, formula)
-            # formula = re.sub(r'\{([^()]+)\}(\d*)', expand, formula)
-
-        # Count elements
-        element_counts: Counter = Counter()
-        for element, count in re.findall(r"([A-Z][a-z]*)(\d*)", self.chemical_formula):
-            if count == "":
-                count = 1
-            else:
-                count = int(count)
-            element_counts[element] += count
-
-        return element_counts
+        return EquationLexer(chemical_equation=self.chemical_formula).lexSpecies()
 
 
 # end region
@@ -139,6 +117,10 @@ class EquationParser:
             Parsed reactants with element counts.
         parsed_products : dict[str, Counter]
             Parsed products with element counts.
+        present_elements : list[str]
+            Elements present in the reaction, in order of first appearance.
+        budget : BalanceBudget
+            The running budget of the balance, None for no limits.
 
     Methods:
         splitIntoChemicalSpecies() -> None:
@@ -149,15 +131,18 @@ class EquationParser:
             Parses the chemical equation and returns parsed reactants and products.
     """
 
-    def __init__(self, chemical_equation: str) -> None:
+    def __init__(self, chemical_equation: str, budget: BalanceBudget = None) -> None:
         """
         Constructs all the necessary attributes for the EquationParser object.
 
         Parameters:
             chemical_equation : str
                 The chemical equation to be parsed.
+            budget : BalanceBudget
+                The running budget of the balance, None for no limits.
         """
         self.chemical_equation: str = chemical_equation
+        self.budget: BalanceBudget = budget
         self.equation_splitter: str = "="
         self.chemical_species_splitter: str = "+"
 
@@ -166,45 +151,57 @@ class EquationParser:
 
         self.parsed_reactants: dict[str, Counter] = {}
         self.parsed_products: dict[str, Counter] = {}
+        self.present_elements: list[str] = []
 
     def splitIntoChemicalSpecies(self) -> None:
         """
-        Splits the chemical equation into reactants and products.
-        """
-        splitted_equation: list[str] = self.chemical_equation.split(
-            self.equation_splitter
-        )
-        self.reactants_list = [
-            (
-                "(" + species.strip() + ")"
-                if not species.strip().startswith("(")
-                else species.strip()
-            )
-            for species in splitted_equation[0].split(self.chemical_species_splitter)
-        ]
-        self.products_list = [
-            (
-                "(" + species.strip() + ")"
-                if not species.strip().startswith("(")
-                else species.strip()
-            )
-            for species in splitted_equation[1].split(self.chemical_species_splitter)
-        ]
+        Splits the chemical equation into reactants and products. The whole
+        equation is tokenized and validated in one pass by the EquationLexer,
+        which also counts the elements of every species.
+        """
+        reactants, products = EquationLexer(
+            chemical_equation=self.chemical_equation, budget=self.budget
+        ).lex()
+        self.reactants_list = []
+        self.products_list = []
+        for species_list, parsed_species, lexed_species in (
+            (self.reactants_list, self.parsed_reactants, reactants),
+            (self.products_list, self.parsed_products, products),
+        ):
+            for species_text, element_counts in lexed_species:
+                species: str = (
+                    species_text
+                    if species_text.startswith("(")
+                    else "(" + species_text + ")"
+                )
+                species_list.append(species)
+                parsed_species[species] = element_counts
 
     def countElementsInChemicalSpecie(self) -> None:
         """
-        Counts elements in each chemical species.
+        Counts elements in each chemical species and collects the elements
+        present in the reaction. Species already counted by the lexer are not
+        parsed again.
         """
 
         for reactant in self.reactants_list:
-            self.parsed_reactants[reactant] = ElementCounter(
-                chemical_formula=reactant
-            ).parseFormula()
+            if reactant not in self.parsed_reactants:
+                self.parsed_reactants[reactant] = ElementCounter(
+                    chemical_formula=reactant
+                ).parseFormula()
 
         for product in self.products_list:
-            self.parsed_products[product] = ElementCounter(
-                chemical_formula=product
-            ).parseFormula()
+            if product not in self.parsed_products:
+                self.parsed_products[product] = ElementCounter(
+                    chemical_formula=product
+                ).parseFormula()
+
+        present_elements: dict[str, None] = {}
+        for element_counts in list(self.parsed_reactants.values()) + list(
+            self.parsed_products.values()
+        ):
+            present_elements.update(dict.fromkeys(element_counts))
+        self.present_elements = list(present_elements)
 
     def parse(self) -> list[dict, dict]:
         """
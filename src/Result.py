@@ -0,0 +1,354 @@
+import json
+from fractions import Fraction
+from src.Solver import EquationSolution
+from utils.ChemicalEquationRewriter import Rewriter
+
+# region Balance Result
+
+
+class BalanceResult:
+    """
+    A compact, structured result of balancing one chemical equation.
+
+    It holds the species, their side and their integer and rational
+    coefficients, so callers read the balance directly instead of parsing the
+    balanced string back. The string of CREB.execute is only rendered when
+    asked for, with the formatting of the Rewriter, and toDict, toJson and
+    toTuple serialize the fields as they are.
+
+    Attributes:
+        chemical_equation : str
+            The chemical equation as given.
+        species_list : list[str]
+            Reactants followed by products, as written in the balanced equation.
+        reactants_count : int
+            Number of reactants at the start of species_list.
+        integer_coefficients : tuple[int, ...]
+            The smallest integer coefficients, empty when there is no balance.
+        coefficients : tuple[Fraction, ...]
+            The coefficients scaled so the last one is 1, as in the string.
+        status : str
+            "balanced" (every coefficient positive), "ambiguous" (several
+            independent balances, one of them given), "unbalanceable" (no
+            balance using every species), "invalid" (the equation could not be
+            parsed) or "budget_exceeded".
+        error_msg : str
+            The error message, empty when the equation was balanced.
+
+    Methods:
+        fromSolution(chemical_equation: str, equation_solution: EquationSolution, nullity: int = -1) -> BalanceResult:
+            Builds a result from the output of the solver.
+        fromError(chemical_equation: str, status: str, error_msg: str) -> BalanceResult:
+            Builds the result of an equation that was not solved.
+        classify(integer_coefficients: list[int], error_msg: str, nullity: int = -1) -> str:
+            Returns the status of a solved equation.
+        raiseForStatus(status: str, error_msg: str) -> None:
+            Raises a ValueError unless the status is "balanced".
+        checkBalanced(integer_coefficients: list[int], error_msg: str, nullity: int = -1) -> None:
+            Raises a ValueError unless a solved equation is "balanced".
+        side(index: int) -> str:
+            Returns "reactant" or "product" for a species.
+        render() -> str:
+            Returns the balanced equation in the format of CREB.execute.
+        toDict() -> dict:
+            Returns the result as a JSON-serializable dictionary.
+        toJson() -> str:
+            Returns the result as compact JSON.
+        toTuple() -> tuple:
+            Returns the result as nested plain tuples.
+    """
+
+    __slots__ = (
+        "chemical_equation",
+        "species_list",
+        "reactants_count",
+        "integer_coefficients",
+        "coefficients",
+        "status",
+        "error_msg",
+        "balanced_equation",
+    )
+
+    def __init__(
+        self,
+        chemical_equation: str,
+        species_list: list[str],
+        reactants_count: int,
+        integer_coefficients: tuple = (),
+        coefficients: tuple = (),
+        status: str = "balanced",
+        error_msg: str = "",
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the BalanceResult object.
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation as given.
+            species_list : list[str]
+                Reactants followed by products.
+            reactants_count : int
+                Number of reactants at the start of species_list.
+            integer_coefficients : tuple
+                The smallest integer coefficients.
+            coefficients : tuple
+                The coefficients scaled so the last one is 1.
+            status : str
+                "balanced", "ambiguous", "unbalanceable", "invalid" or
+                "budget_exceeded".
+            error_msg : str
+                The error message, empty when the equation was balanced.
+        """
+        self.chemical_equation: str = chemical_equation
+        self.species_list: list[str] = species_list
+        self.reactants_count: int = reactants_count
+        self.integer_coefficients: tuple = tuple(integer_coefficients)
+        self.coefficients: tuple = tuple(coefficients)
+        self.status: str = status
+        self.error_msg: str = error_msg
+        self.balanced_equation: str = None
+
+    @classmethod
+    def fromSolution(
+        cls,
+        chemical_equation: str,
+        equation_solution: EquationSolution,
+        nullity: int = -1,
+    ) -> "BalanceResult":
+        """
+        Builds a result from the output of the solver.
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation as given.
+            equation_solution : EquationSolution
+                The result of the solver (or of a cache).
+            nullity : int
+                Dimension of the nullspace, -1 when unknown. Only a cached
+                result has no nullity; it is never ambiguous because
+                CREB.solveChemicalEquation puts a result in the cache and the
+                store only when its nullity is 0 or 1.
+
+        Returns:
+            BalanceResult: The structured result.
+        """
+        return cls(
+            chemical_equation=chemical_equation,
+            species_list=equation_solution.species_list,
+            reactants_count=equation_solution.reactants_count,
+            integer_coefficients=equation_solution.integer_coefficients,
+            coefficients=equation_solution.equation_solution,
+            status=cls.classify(
+                integer_coefficients=equation_solution.integer_coefficients,
+                error_msg=equation_solution.error_msg,
+                nullity=nullity,
+            ),
+            error_msg=equation_solution.error_msg,
+        )
+
+    @classmethod
+    def fromError(cls, chemical_equation: str, status: str, error_msg: str) -> "BalanceResult":
+        """
+        Builds the result of an equation that was not solved, without species.
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation as given.
+            status : str
+                "invalid" or "budget_exceeded".
+            error_msg : str
+                The error message.
+
+        Returns:
+            BalanceResult: The structured result.
+        """
+        return cls(
+            chemical_equation=chemical_equation,
+            species_list=[],
+            reactants_count=0,
+            status=status,
+            error_msg=error_msg,
+        )
+
+    @staticmethod
+    def classify(integer_coefficients: list[int], error_msg: str, nullity: int = -1) -> str:
+        """
+        Returns the status of a solved equation: "ambiguous" when the
+        nullspace has several dimensions, "balanced" when every coefficient is
+        positive and "unbalanceable" otherwise.
+
+        Parameters:
+            integer_coefficients : list[int]
+                The integer coefficients given by the solver, empty on error.
+            error_msg : str
+                The error message of the solver.
+            nullity : int
+                Dimension of the nullspace, -1 when unknown (a cached result).
+
+        Returns:
+            str: "balanced", "ambiguous" or "unbalanceable".
+        """
+        if error_msg or not integer_coefficients:
+            return "unbalanceable"
+        if nullity > 1:
+            return "ambiguous"
+        if all(coefficient > 0 for coefficient in integer_coefficients):
+            return "balanced"
+        # a zero or negative coefficient drops the species or moves it across
+        return "unbalanceable"
+
+    @staticmethod
+    def raiseForStatus(status: str, error_msg: str) -> None:
+        """
+        Raises a ValueError unless the status is "balanced", so a string is
+        never rendered from a balance with zero or negative coefficients.
+
+        Parameters:
+            status : str
+                The status of the result.
+            error_msg : str
+                The error message, raised as is when there is one.
+        """
+        if error_msg:
+            raise ValueError(error_msg)
+        if status == "ambiguous":
+            raise ValueError(
+                "The chemical equation has several independent balances; "
+                "CREB.balance or CREB.enumerateReactions report them."
+            )
+        if status != "balanced":
+            raise ValueError(
+                "The chemical equation can not be balanced with every coefficient positive."
+            )
+
+    @classmethod
+    def checkBalanced(
+        cls, integer_coefficients: list[int], error_msg: str, nullity: int = -1
+    ) -> None:
+        """
+        Raises a ValueError unless the solved equation is "balanced" (see
+        classify and raiseForStatus).
+
+        Parameters:
+            integer_coefficients : list[int]
+                The integer coefficients given by the solver, empty on error.
+            error_msg : str
+                The error message of the solver.
+            nullity : int
+                Dimension of the nullspace, -1 when unknown (a cached result).
+        """
+        cls.raiseForStatus(
+            status=cls.classify(
+                integer_coefficients=integer_coefficients,
+                error_msg=error_msg,
+                nullity=nullity,
+            ),
+            error_msg=error_msg,
+        )
+
+    def side(self, index: int) -> str:
+        """
+        Returns "reactant" or "product" for the species at an index.
+        """
+        return "reactant" if index < self.reactants_count else "product"
+
+    def render(self) -> str:
+        """
+        Returns the balanced equation in the format of CREB.execute, such as
+        "(H2) + 1/2 (O2)  = (H2O) ". It is built on the first call only and,
+        like CREB.execute, raises a ValueError unless the status is "balanced".
+
+        Returns:
+            str: The balanced chemical equation.
+        """
+        self.raiseForStatus(status=self.status, error_msg=self.error_msg)
+        if self.balanced_equation is None:
+            terms_list: list[str] = [
+                Rewriter.assignCoefficient(chemical_formula=species, coefficient=coefficient)
+                for species, coefficient in zip(self.species_list, self.coefficients)
+            ]
+            self.balanced_equation = Rewriter.joinSides(
+                assigned_reactants_list=terms_list[: self.reactants_count],
+                assigned_products_list=terms_list[self.reactants_count :],
+            )
+        return self.balanced_equation
+
+    def toDict(self) -> dict:
+        """
+        Returns the result as a JSON-serializable dictionary; every rational
+        coefficient is a [numerator, denominator] pair.
+
+        Returns:
+            dict: The equation, the status, the error and one entry per species.
+        """
+        coefficients: tuple = self.coefficients or (None,) * len(self.species_list)
+        integer_coefficients: tuple = self.integer_coefficients or (None,) * len(
+            self.species_list
+        )
+        return {
+            "chemical_equation": self.chemical_equation,
+            "status": self.status,
+            "error_msg": self.error_msg,
+            "species": [
+                {
+                    "formula": species,
+                    "side": self.side(index),
+                    "coefficient": integer_coefficient,
+                    "rational": None
+                    if coefficient is None
+                    else [Fraction(coefficient).numerator, Fraction(coefficient).denominator],
+                }
+                for index, (species, integer_coefficient, coefficient) in enumerate(
+                    zip(self.species_list, integer_coefficients, coefficients)
+                )
+            ],
+        }
+
+    def toJson(self) -> str:
+        """
+        Returns the result as compact JSON (see toDict).
+
+        Returns:
+            str: The JSON text.
+        """
+        return json.dumps(self.toDict(), separators=(",", ":"))
+
+    def toTuple(self) -> tuple:
+        """
+        Returns the result as nested plain tuples, cheap to pickle or compare:
+        (status, error_msg, ((formula, side, integer coefficient, numerator,
+        denominator), ...)). Coefficients are None when there is no balance.
+
+        Returns:
+            tuple: The result.
+        """
+        rows_list: list[tuple] = []
+        for index, species in enumerate(self.species_list):
+            if self.coefficients:
+                coefficient: Fraction = Fraction(self.coefficients[index])
+                rows_list.append(
+                    (
+                        species,
+                        self.side(index),
+                        self.integer_coefficients[index],
+                        coefficient.numerator,
+                        coefficient.denominator,
+                    )
+                )
+            else:
+                rows_list.append((species, self.side(index), None, None, None))
+        return (self.status, self.error_msg, tuple(rows_list))
+
+    def __str__(self) -> str:
+        try:
+            return self.render()
+        except ValueError as error:
+            return str(error)
+
+    def __repr__(self) -> str:
+        if self.error_msg:
+            return f"BalanceResult({self.status!r}, error={self.error_msg!r})"
+        return f"BalanceResult({self.status!r}, {self.integer_coefficients})"
+
+
+# end region
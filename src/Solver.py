@@ -0,0 +1,434 @@
+from fractions import Fraction
+from src.Budget import BalanceBudget, BudgetExceeded
+from src.LinearEquationsSystem import Generator
+from src.Nullspace import ExtremeReactions, IntegerNullspace, ModularNullspace
+from src.SparseMatrix import CompositionMatrix
+from utils.JsonHandler import Handler
+
+# region Equation Solution
+
+
+class EquationSolution:
+    """
+    A class to carry the result of solving a chemical equation in memory.
+
+    It replaces the data.json handoff between the solver and the Rewriter; the
+    JSON file is only written when exportJson is called explicitly.
+
+    Attributes:
+        species_list : list[str]
+            Reactants followed by products, in the order of the coefficients.
+        equation_solution : tuple
+            The solution of the equation, one coefficient per species.
+        integer_coefficients : list[int]
+            The smallest positive integer coefficients, if known.
+        error_msg : str
+            The error message, empty when the equation was solved.
+        reactants_count : int
+            Number of reactants at the start of species_list, -1 if unknown.
+
+    Methods:
+        toDict() -> dict:
+            Returns the solution in the data.json layout.
+        exportJson(file_path: str) -> None:
+            Writes the solution to a JSON file.
+    """
+
+    def __init__(
+        self,
+        species_list: list[str],
+        equation_solution: tuple = (),
+        integer_coefficients: list[int] = None,
+        error_msg: str = "",
+        reactants_count: int = -1,
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the EquationSolution object.
+
+        Parameters:
+            species_list : list[str]
+                Reactants followed by products, in the order of the coefficients.
+            equation_solution : tuple
+                The solution of the equation, one coefficient per species.
+            integer_coefficients : list[int]
+                The smallest positive integer coefficients, if known.
+            error_msg : str
+                The error message, empty when the equation was solved.
+            reactants_count : int
+                Number of reactants at the start of species_list, -1 if unknown.
+        """
+        self.species_list: list[str] = species_list
+        self.equation_solution: tuple = equation_solution
+        self.integer_coefficients: list[int] = integer_coefficients or []
+        self.error_msg: str = error_msg
+        self.reactants_count: int = reactants_count
+
+    def toDict(self) -> dict:
+        """
+        Returns the solution in the data.json layout.
+
+        Returns:
+            dict: The "equation_solution" and "error_msg" entries.
+        """
+        equation_solution: str = ""
+        if self.equation_solution:
+            # same text sympy prints for a tuple, so sympify can read it back
+            equation_solution = (
+                "(" + ", ".join(str(value) for value in self.equation_solution) + ")"
+                if len(self.equation_solution) > 1
+                else f"({self.equation_solution[0]},)"
+            )
+        return {"equation_solution": equation_solution, "error_msg": self.error_msg}
+
+    def exportJson(self, file_path: str) -> None:
+        """
+        Writes the solution to a JSON file in a single write.
+
+        Parameters:
+            file_path : str
+                The path to the JSON file.
+        """
+        Handler(file_path=file_path, create_if_missing=False).write(
+            content=self.toDict()
+        )
+
+
+# end region
+
+# region Reaction Basis
+
+
+class ReactionBasis:
+    """
+    A class to hold the independent balanced reactions of a chemical equation.
+
+    Attributes:
+        species_list : list[str]
+            Reactants followed by products, in the order of the coefficients.
+        reactions : list[list[int]]
+            The minimal non-negative integer balances (extreme reactions).
+        status : str
+            "balanced" (a single reaction using every species), "ambiguous"
+            (several independent reactions, or too many to enumerate) or
+            "unbalanceable" (no reaction uses every species).
+        truncated : bool
+            Whether the enumeration hit its cap; reactions is then empty.
+    """
+
+    def __init__(
+        self,
+        species_list: list[str],
+        reactions: list[list[int]],
+        status: str,
+        truncated: bool = False,
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the ReactionBasis object.
+
+        Parameters:
+            species_list : list[str]
+                Reactants followed by products.
+            reactions : list[list[int]]
+                The minimal non-negative integer balances.
+            status : str
+                "balanced", "ambiguous" or "unbalanceable".
+            truncated : bool
+                Whether the enumeration hit its cap.
+        """
+        self.species_list: list[str] = species_list
+        self.reactions: list[list[int]] = reactions
+        self.status: str = status
+        self.truncated: bool = truncated
+
+    def __repr__(self) -> str:
+        return f"ReactionBasis({self.status!r}, {self.reactions})"
+
+
+# end region
+
+# region Solver
+
+
+class Solver:
+    """
+    A class to solve the system of linear equations of a chemical equation in memory.
+
+    Unlike Generator.FileMaker, nothing is written to disk and no code is generated;
+    the system is built directly from the composition data of the Generator.
+
+    Attributes:
+        generator : Generator
+            The generator holding the parsed reactants and products.
+        backend : str
+            "native" (exact integer nullspace, default), "modular" (nullspace
+            modulo word-sized primes, for large coefficients) or "sympy" (linsolve).
+        species_list : list[str]
+            Reactants followed by products, in the order of the unknowns.
+        equation_solution : tuple
+            The solution of the equation, one coefficient per species.
+        integer_coefficients : list[int]
+            The smallest positive integer coefficients (native and modular
+            backends only).
+        nullity : int
+            Dimension of the nullspace, 1 when the balance is unique (native
+            and modular backends only, -1 before solving).
+        composition_matrix : CompositionMatrix
+            The sparse composition matrix, None until it is first built.
+        budget : BalanceBudget
+            The running budget of the balance, None for no limits.
+
+    Methods:
+        buildCompositionMatrix() -> list[list[int]]:
+            Builds the element-species matrix (products with negative counts).
+        buildSparseCompositionMatrix() -> CompositionMatrix:
+            Builds the same matrix in sparse (CSR) layout, once.
+        solveInteger() -> list[int]:
+            Returns the smallest integer coefficients from the integer nullspace.
+        solve() -> tuple:
+            Solves the system and returns one coefficient per species.
+        execute() -> EquationSolution:
+            Solves the system and returns the result, errors included.
+        enumerateReactions(max_reactions: int = 256) -> ReactionBasis:
+            Returns every independent non-negative balance of the equation.
+        solveNative() -> tuple:
+            Solves the system with the integer nullspace, last coefficient set to 1.
+        solveSymbolic() -> tuple:
+            Solves the system with sympy's linsolve, last unknown set to 1.
+        scaleToLastCoefficient(integer_coefficients: list[int]) -> tuple:
+            Scales integer coefficients so the last one is 1.
+    """
+
+    def __init__(
+        self, generator: Generator, backend: str = "native", budget: BalanceBudget = None
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the Solver object.
+
+        Parameters:
+            generator : Generator
+                The generator holding the parsed reactants and products.
+            backend : str
+                "native" (exact integer nullspace, default), "modular" (nullspace
+                modulo word-sized primes, for large coefficients) or "sympy" (linsolve).
+            budget : BalanceBudget
+                The running budget of the balance, None for no limits. The
+                symbolic backend can only check it before calling linsolve.
+        """
+        if backend not in ("native", "modular", "sympy"):
+            raise ValueError(f"Unknown solver backend: {backend!r}")
+        self.generator: Generator = generator
+        self.backend: str = backend
+        self.species_list: list[str] = generator.reactants_list + generator.products_list
+        self.equation_solution: tuple = ()
+        self.integer_coefficients: list[int] = []
+        self.nullity: int = -1
+        self.composition_matrix: CompositionMatrix = None
+        self.budget: BalanceBudget = budget
+
+    def buildCompositionMatrix(self) -> list[list[int]]:
+        """
+        Builds the element-species matrix of the reaction, one row per element.
+        Reactant counts are positive and product counts are negative, so a
+        balanced reaction is a vector in the nullspace of this matrix.
+
+        Returns:
+            list[list[int]]: The composition matrix.
+        """
+        if not self.generator.present_elements_in_reaction:
+            self.generator.presentElementsInReaction()
+
+        composition_matrix: list[list[int]] = []
+        for element in self.generator.present_elements_in_reaction:
+            row: list[int] = [
+                self.generator.parsed_reactants[reactant].get(element, 0)
+                for reactant in self.generator.reactants_list
+            ] + [
+                -self.generator.parsed_products[product].get(element, 0)
+                for product in self.generator.products_list
+            ]
+            composition_matrix.append(row)
+        return composition_matrix
+
+    def buildSparseCompositionMatrix(self) -> CompositionMatrix:
+        """
+        Builds the sparse element-species matrix of the reaction, storing only
+        the element counts each species actually has. It is built on the first
+        call only, so the native and modular backends and enumerateReactions
+        share it.
+
+        Returns:
+            CompositionMatrix: The composition matrix in CSR layout.
+        """
+        if self.composition_matrix is None:
+            self.composition_matrix = CompositionMatrix.fromCompositions(
+                reactant_compositions=[
+                    self.generator.parsed_reactants[reactant]
+                    for reactant in self.generator.reactants_list
+                ],
+                product_compositions=[
+                    self.generator.parsed_products[product]
+                    for product in self.generator.products_list
+                ],
+            )
+        return self.composition_matrix
+
+    def solveInteger(self) -> list[int]:
+        """
+        Computes the nullspace of the composition matrix in plain Python ints and
+        returns the smallest positive integer coefficients. When the nullspace
+        has more than one dimension, the vector of the last free unknown is used,
+        the same choice the symbolic backend makes by setting it to 1. The
+        modular backend returns the same vector, computed modulo primes.
+
+        Returns:
+            list[int]: One integer coefficient per species.
+        """
+        nullspace_class: type = (
+            ModularNullspace if self.backend == "modular" else IntegerNullspace
+        )
+        integer_nullspace: "IntegerNullspace | ModularNullspace" = nullspace_class(
+            matrix=self.buildSparseCompositionMatrix(), budget=self.budget
+        )
+        integer_nullspace.reduce()
+        free_columns: list[int] = integer_nullspace.freeColumns()
+        self.nullity = len(free_columns)
+        if not free_columns:
+            raise ValueError("The chemical equation can not be balanced.")
+
+        self.integer_coefficients = integer_nullspace.basisVector(
+            free_column=free_columns[-1]
+        )
+        return self.integer_coefficients
+
+    def solve(self) -> tuple:
+        """
+        Solves the system of linear equations with the selected backend.
+
+        Returns:
+            tuple: The solution of the equation, one coefficient per species.
+        """
+        if self.backend == "sympy":
+            return self.solveSymbolic()
+        return self.solveNative()
+
+    def execute(self) -> EquationSolution:
+        """
+        Solves the system and returns the result as an EquationSolution. An
+        equation that can not be balanced is reported through error_msg; a
+        BudgetExceeded error is raised as is.
+
+        Returns:
+            EquationSolution: The in-memory result of the solver.
+        """
+        try:
+            self.solve()
+        except BudgetExceeded:
+            # not a property of the equation: the caller decides what to report
+            raise
+        except ValueError as error:
+            return EquationSolution(
+                species_list=self.species_list,
+                error_msg=str(error),
+                reactants_count=len(self.generator.reactants_list),
+            )
+        return EquationSolution(
+            species_list=self.species_list,
+            equation_solution=tuple(self.equation_solution),
+            integer_coefficients=self.integer_coefficients,
+            reactants_count=len(self.generator.reactants_list),
+        )
+
+    def enumerateReactions(self, max_reactions: int = 256) -> ReactionBasis:
+        """
+        Returns the minimal non-negative integer balances of the equation,
+        computed from the composition matrix. Unlike solve(), which picks one
+        vector when the nullspace has several dimensions, this reports every
+        independent reaction and flags the result as ambiguous.
+
+        Parameters:
+            max_reactions : int
+                Cap on the reactions alive during the enumeration; past it the
+                result is "ambiguous" with no reactions rather than partial.
+
+        Returns:
+            ReactionBasis: The independent balanced reactions.
+        """
+        extreme_reactions: ExtremeReactions = ExtremeReactions(
+            matrix=self.buildSparseCompositionMatrix(), max_rays=max_reactions
+        )
+        reactions_list: list[list[int]] = extreme_reactions.enumerate()
+
+        if extreme_reactions.truncated or len(reactions_list) > 1:
+            status: str = "ambiguous"
+        elif reactions_list and all(reactions_list[0]):
+            status = "balanced"
+        else:
+            status = "unbalanceable"
+        return ReactionBasis(
+            species_list=self.species_list,
+            reactions=reactions_list,
+            status=status,
+            truncated=extreme_reactions.truncated,
+        )
+
+    def solveNative(self) -> tuple:
+        """
+        Solves the system with the integer nullspace and scales the solution so
+        the last coefficient is 1, as the symbolic backend does.
+
+        Returns:
+            tuple: The solution of the equation as Fractions.
+        """
+        self.equation_solution = self.scaleToLastCoefficient(
+            integer_coefficients=self.solveInteger()
+        )
+        return self.equation_solution
+
+    @staticmethod
+    def scaleToLastCoefficient(integer_coefficients: list[int]) -> tuple:
+        """
+        Scales integer coefficients so the last one is 1.
+
+        Parameters:
+            integer_coefficients : list[int]
+                One integer coefficient per species.
+
+        Returns:
+            tuple: The scaled coefficients as Fractions.
+        """
+        last_coefficient: int = integer_coefficients[-1] or 1
+        return tuple(
+            Fraction(coefficient, last_coefficient)
+            for coefficient in integer_coefficients
+        )
+
+    def solveSymbolic(self) -> tuple:
+        """
+        Solves the system of linear equations with sympy's linsolve and sets the
+        last unknown to 1, exactly like the generated solver file used to do.
+
+        Returns:
+            tuple: The solution of the equation, one coefficient per species.
+        """
+        from sympy import Matrix, symbols, zeros
+        from sympy.solvers.solveset import linsolve
+
+        composition_matrix: list[list[int]] = self.buildCompositionMatrix()
+        variables: tuple = symbols(f"x0:{len(self.species_list)}")
+        if self.budget is not None:
+            self.budget.checkTime(stage="solve")
+
+        equation_solution = linsolve(
+            (
+                Matrix(composition_matrix),
+                zeros(len(composition_matrix), 1),
+            ),
+            variables,
+        )
+
+        x = variables[-1]
+        self.equation_solution = [expr.subs(x, 1) for expr in equation_solution][0]
+        return self.equation_solution
+
+
+# end region
@@ -0,0 +1,264 @@
+from array import array
+from collections.abc import Iterable, Mapping
+from utils import Assets
+
+# region Composition Matrix
+
+
+class CompositionMatrix:
+    """
+    A sparse element x species matrix in CSR (compressed sparse row) layout.
+
+    Rows are elements, ordered by their id in Assets.elements_list (symbols
+    that are not in the list get ids after it, in order of appearance);
+    columns are species, reactants first and then products. Reactant counts
+    are stored positive and product counts negative, so a balanced reaction
+    is a vector in the nullspace of the matrix. Only non-zero counts are
+    stored, so memory is proportional to the number of non-zeros.
+
+    Attributes:
+        element_ids : list[int]
+            Element id of each row.
+        elements_list : list[str]
+            Element symbol of each row.
+        columns_count : int
+            Number of species.
+        row_pointers : array
+            Start of each row in column_indices and values (CSR).
+        column_indices : array
+            Column (species) index of each stored count.
+        values : list[int]
+            The stored counts; a list so that counts of any size stay exact.
+
+    Methods:
+        fromCompositions(reactant_compositions, product_compositions) -> CompositionMatrix:
+            Builds the matrix from one element-count mapping per species.
+        fromEntries(entries_dict, columns_count, extra_elements_list) -> CompositionMatrix:
+            Builds the matrix from the non-zero entries of each element row.
+        sparseRows() -> list[dict[int, int]]:
+            Returns every row as a {column: value} dictionary.
+        toDense() -> list[list[int]]:
+            Returns the matrix as a list of dense rows.
+        multiply(vector: list[int]) -> list[int]:
+            Returns the product of the matrix and a vector.
+        multiplySparse(matrix_rows: Mapping[int, Mapping[int, int]]) -> list[dict[int, int]]:
+            Returns the product of the matrix and a sparse matrix.
+        nonzerosCount() -> int:
+            Returns the number of stored counts.
+    """
+
+    def __init__(
+        self,
+        element_ids: list[int],
+        elements_list: list[str],
+        columns_count: int,
+        row_pointers: array,
+        column_indices: array,
+        values: list[int],
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the CompositionMatrix object.
+
+        Parameters:
+            element_ids : list[int]
+                Element id of each row.
+            elements_list : list[str]
+                Element symbol of each row.
+            columns_count : int
+                Number of species.
+            row_pointers : array
+                Start of each row in column_indices and values.
+            column_indices : array
+                Column index of each stored count.
+            values : list[int]
+                The stored counts.
+        """
+        self.element_ids: list[int] = element_ids
+        self.elements_list: list[str] = elements_list
+        self.columns_count: int = columns_count
+        self.row_pointers: array = row_pointers
+        self.column_indices: array = column_indices
+        self.values: list[int] = values
+
+    @classmethod
+    def fromCompositions(
+        cls,
+        reactant_compositions: Iterable[Mapping[str, int]],
+        product_compositions: Iterable[Mapping[str, int]],
+    ) -> "CompositionMatrix":
+        """
+        Builds the matrix from one element-count mapping per species.
+
+        Parameters:
+            reactant_compositions : Iterable[Mapping[str, int]]
+                Element counts of each reactant, in order.
+            product_compositions : Iterable[Mapping[str, int]]
+                Element counts of each product, in order.
+
+        Returns:
+            CompositionMatrix: The sparse composition matrix.
+        """
+        extra_element_ids: dict[str, int] = {}
+        entries_dict: dict[int, list[tuple[int, int]]] = {}
+        column: int = 0
+
+        for sign, compositions in ((1, reactant_compositions), (-1, product_compositions)):
+            for composition in compositions:
+                for element, count in composition.items():
+                    if not count:
+                        continue
+                    element_id: int = Assets.element_ids.get(element, -1)
+                    if element_id == -1:
+                        element_id = extra_element_ids.setdefault(
+                            element, len(Assets.elements_list) + len(extra_element_ids)
+                        )
+                    entries_dict.setdefault(element_id, []).append(
+                        (column, sign * count)
+                    )
+                column += 1
+
+        return cls.fromEntries(
+            entries_dict=entries_dict,
+            columns_count=column,
+            extra_elements_list=list(extra_element_ids),
+        )
+
+    @classmethod
+    def fromEntries(
+        cls,
+        entries_dict: dict[int, list[tuple[int, int]]],
+        columns_count: int,
+        extra_elements_list: list[str],
+    ) -> "CompositionMatrix":
+        """
+        Builds the matrix from the (column, value) entries of each element id.
+
+        Parameters:
+            entries_dict : dict[int, list[tuple[int, int]]]
+                The non-zero entries of each element row.
+            columns_count : int
+                Number of species.
+            extra_elements_list : list[str]
+                Symbols of the element ids after Assets.elements_list, in id order.
+
+        Returns:
+            CompositionMatrix: The sparse composition matrix.
+        """
+        element_ids: list[int] = sorted(entries_dict)
+        row_pointers: array = array("q", [0])
+        column_indices: array = array("q")
+        values: list[int] = []
+        for element_id in element_ids:
+            for entry_column, value in entries_dict[element_id]:
+                column_indices.append(entry_column)
+                values.append(value)
+            row_pointers.append(len(values))
+
+        return cls(
+            element_ids=element_ids,
+            elements_list=[
+                (
+                    Assets.elements_list[element_id]
+                    if element_id < len(Assets.elements_list)
+                    else extra_elements_list[element_id - len(Assets.elements_list)]
+                )
+                for element_id in element_ids
+            ],
+            columns_count=columns_count,
+            row_pointers=row_pointers,
+            column_indices=column_indices,
+            values=values,
+        )
+
+    def sparseRows(self) -> list[dict[int, int]]:
+        """
+        Returns every row as a {column: value} dictionary.
+
+        Returns:
+            list[dict[int, int]]: The sparse rows.
+        """
+        return [
+            dict(
+                zip(
+                    self.column_indices[start:end],
+                    self.values[start:end],
+                )
+            )
+            for start, end in zip(self.row_pointers, self.row_pointers[1:])
+        ]
+
+    def toDense(self) -> list[list[int]]:
+        """
+        Returns the matrix as a list of dense rows.
+
+        Returns:
+            list[list[int]]: The dense rows.
+        """
+        dense_rows: list[list[int]] = []
+        for sparse_row in self.sparseRows():
+            dense_row: list[int] = [0] * self.columns_count
+            for column, value in sparse_row.items():
+                dense_row[column] = value
+            dense_rows.append(dense_row)
+        return dense_rows
+
+    def multiply(self, vector: list[int]) -> list[int]:
+        """
+        Returns the product of the matrix and a vector, one entry per element.
+
+        Parameters:
+            vector : list[int]
+                One value per species.
+
+        Returns:
+            list[int]: The product, all zeros for a balanced reaction.
+        """
+        return [
+            sum(
+                self.values[index] * vector[self.column_indices[index]]
+                for index in range(start, end)
+            )
+            for start, end in zip(self.row_pointers, self.row_pointers[1:])
+        ]
+
+    def multiplySparse(
+        self, matrix_rows: Mapping[int, Mapping[int, int]]
+    ) -> list[dict[int, int]]:
+        """
+        Returns the product of the matrix and a sparse matrix given by rows,
+        one row per species, in a single pass over the stored counts. Only
+        the columns reached by a stored count appear in the product; values
+        may be Fractions as well as ints.
+
+        Parameters:
+            matrix_rows : Mapping[int, Mapping[int, int]]
+                The {column: value} row of each species; species without a
+                row are all zeros.
+
+        Returns:
+            list[dict[int, int]]: The {column: value} product row of each element.
+        """
+        empty_row: dict[int, int] = {}
+        product_rows: list[dict[int, int]] = []
+        for start, end in zip(self.row_pointers, self.row_pointers[1:]):
+            product_row: dict[int, int] = {}
+            for index in range(start, end):
+                count: int = self.values[index]
+                for column, value in matrix_rows.get(
+                    self.column_indices[index], empty_row
+                ).items():
+                    product_row[column] = product_row.get(column, 0) + count * value
+            product_rows.append(product_row)
+        return product_rows
+
+    def nonzerosCount(self) -> int:
+        """
+        Returns the number of stored counts.
+
+        Returns:
+            int: The number of non-zero entries.
+        """
+        return len(self.values)
+
+
+# end region
@@ -0,0 +1,173 @@
+import threading
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from src.SparseMatrix import CompositionMatrix
+from utils import Assets
+
+extra_element_ids: dict[str, int] = {}
+"""dict[str, int]: Ids given to symbols outside Assets.elements_list (such as the charge key), after the listed elements."""
+
+extra_elements_list: list[str] = []
+"""list[str]: The symbols of extra_element_ids, in id order."""
+
+extra_elements_lock: threading.Lock = threading.Lock()
+"""threading.Lock: Guards the registration of extra element symbols."""
+
+
+def elementId(element: str) -> int:
+    """
+    Returns the integer id of an element symbol: its position in
+    Assets.elements_list, or an id after the list for any other symbol.
+
+    Parameters:
+        element : str
+            The element symbol.
+
+    Returns:
+        int: The element id.
+    """
+    element_id: int = Assets.element_ids.get(element, -1)
+    if element_id != -1:
+        return element_id
+    element_id = extra_element_ids.get(element, -1)
+    if element_id == -1:
+        with extra_elements_lock:
+            element_id = extra_element_ids.get(element, -1)
+            if element_id == -1:
+                element_id = len(Assets.elements_list) + len(extra_elements_list)
+                extra_elements_list.append(element)
+                extra_element_ids[element] = element_id
+    return element_id
+
+
+# region Species Table
+
+
+class SpeciesTable:
+    """
+    A columnar store of many species, for mechanisms and libraries held in
+    memory.
+
+    All species share three flat arrays in CSR layout: row_pointers gives
+    the slice of element_ids and counts of each species. A species costs one
+    pointer plus ten bytes per element it contains, instead of a Counter,
+    its dict and its per-object overhead; composition matrices are assembled
+    by gathering the columns of the wanted species.
+
+    Attributes:
+        formulas_list : list[str]
+            The formula of each species, by index.
+        index_dict : dict[str, int]
+            The index of each formula.
+        row_pointers : array
+            Start of each species in element_ids and counts.
+        element_ids : array
+            Element ids of all species, sorted within each species.
+        counts : array | list[int]
+            Counts matching element_ids.
+
+    Methods:
+        add(formula: str, element_counts: Mapping[str, int]) -> int:
+            Stores a species once and returns its index.
+        pairs(index: int) -> Iterator[tuple[int, int]]:
+            Yields the (element id, count) pairs of a species.
+        compositionMatrix(reactant_indices: Iterable[int], product_indices: Iterable[int]) -> CompositionMatrix:
+            Gathers the composition matrix of a reaction.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructs all the necessary attributes for the SpeciesTable object.
+        """
+        self.formulas_list: list[str] = []
+        self.index_dict: dict[str, int] = {}
+        self.row_pointers: array = array("q", [0])
+        self.element_ids: array = array("H")
+        self.counts: "array | list[int]" = array("q")
+
+    def __len__(self) -> int:
+        return len(self.formulas_list)
+
+    def add(self, formula: str, element_counts: Mapping[str, int]) -> int:
+        """
+        Stores a species once and returns its index; a formula already in the
+        table keeps its first index.
+
+        Parameters:
+            formula : str
+                The species as written.
+            element_counts : Mapping[str, int]
+                The element counts keyed by symbol.
+
+        Returns:
+            int: The index of the species.
+        """
+        index: int = self.index_dict.get(formula, -1)
+        if index != -1:
+            return index
+        pairs_list: list[tuple[int, int]] = sorted(
+            (elementId(element), count) for element, count in element_counts.items() if count
+        )
+        for element_id, count in pairs_list:
+            self.element_ids.append(element_id)
+            try:
+                self.counts.append(count)
+            except OverflowError:
+                # a count beyond 64 bits: keep exact ints from now on
+                self.counts = list(self.counts)
+                self.counts.append(count)
+        self.row_pointers.append(len(self.element_ids))
+
+        index = len(self.formulas_list)
+        self.formulas_list.append(formula)
+        self.index_dict[formula] = index
+        return index
+
+    def pairs(self, index: int) -> Iterator[tuple[int, int]]:
+        """
+        Yields the (element id, count) pairs of a species.
+
+        Parameters:
+            index : int
+                The index of the species.
+        """
+        start: int = self.row_pointers[index]
+        end: int = self.row_pointers[index + 1]
+        return zip(self.element_ids[start:end], self.counts[start:end])
+
+    def compositionMatrix(
+        self, reactant_indices: Iterable[int], product_indices: Iterable[int]
+    ) -> CompositionMatrix:
+        """
+        Gathers the composition matrix of a reaction from the stored species,
+        without going through symbol strings.
+
+        Parameters:
+            reactant_indices : Iterable[int]
+                The reactant species, in order.
+            product_indices : Iterable[int]
+                The product species, in order.
+
+        Returns:
+            CompositionMatrix: Reactant counts positive, product counts negative.
+        """
+        row_pointers: array = self.row_pointers
+        element_ids: array = self.element_ids
+        counts: "array | list[int]" = self.counts
+        entries_dict: dict[int, list[tuple[int, int]]] = {}
+        column: int = 0
+        for sign, indices in ((1, reactant_indices), (-1, product_indices)):
+            for index in indices:
+                for position in range(row_pointers[index], row_pointers[index + 1]):
+                    entries_dict.setdefault(element_ids[position], []).append(
+                        (column, sign * counts[position])
+                    )
+                column += 1
+        return CompositionMatrix.fromEntries(
+            entries_dict=entries_dict,
+            columns_count=column,
+            extra_elements_list=extra_elements_list,
+        )
+
+
+# end region
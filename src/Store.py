@@ -0,0 +1,252 @@
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable
+from src.Cache import BalanceCache
+from src.LinearEquationsSystem import Generator
+from src.Solver import EquationSolution
+
+# region Result Store
+
+
+class ResultStore:
+    """
+    A persistent store of balanced results in a local SQLite file, shared by
+    every process that opens it.
+
+    Results are keyed by the canonical form of the equation (the sorted
+    species compositions of each side, see BalanceCache.canonicalKey), so a
+    reaction written with another species order or spelling still hits. The
+    database runs in WAL mode: any number of processes can read while one
+    writes, and readers never block each other. Each thread gets its own
+    connection; every connection opened is tracked, so close() closes them
+    all, and a thread using the store after close() opens a new one.
+
+    Attributes:
+        database_path : str
+            The SQLite file, created when missing.
+        timeout : float
+            Seconds to wait for a lock held by another writer.
+        hits : int
+            Number of lookups answered from the store.
+        misses : int
+            Number of lookups that missed.
+        connections_list : list[sqlite3.Connection]
+            Every connection opened since the last close().
+        generation : int
+            Number of close() calls; a thread connection of an older
+            generation has been closed.
+
+    Methods:
+        connection() -> sqlite3.Connection:
+            Returns the connection of the calling thread.
+        keyText(key: tuple) -> str:
+            Serializes a canonical key.
+        getByGenerator(generator: Generator) -> EquationSolution:
+            Looks an equation up by its canonical form.
+        canonicalEntry(generator: Generator, equation_solution: EquationSolution) -> tuple[str, str, str]:
+            Returns the row storing a solved equation.
+        put(generator: Generator, equation_solution: EquationSolution) -> None:
+            Stores one solved equation.
+        putMany(entries: Iterable[tuple[str, str, str]]) -> int:
+            Stores many rows in one transaction.
+        stats() -> dict:
+            Returns the entry count and the hit/miss counters.
+        close() -> None:
+            Closes the connections of every thread.
+    """
+
+    def __init__(self, database_path: str, timeout: float = 5.0) -> None:
+        """
+        Constructs all the necessary attributes for the ResultStore object.
+
+        Parameters:
+            database_path : str
+                The SQLite file, created when missing.
+            timeout : float
+                Seconds to wait for a lock held by another writer.
+        """
+        self.database_path: str = database_path
+        self.timeout: float = timeout
+        self.hits: int = 0
+        self.misses: int = 0
+        self.lock: threading.Lock = threading.Lock()
+        self.local_connections: threading.local = threading.local()
+        self.connections_list: list[sqlite3.Connection] = []
+        self.generation: int = 0
+        self.connection()
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the calling thread, opening it (and creating
+        the table) on first use or after close().
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        connection: sqlite3.Connection = getattr(self.local_connections, "connection", None)
+        if connection is None or self.local_connections.generation != self.generation:
+            # autocommit, putMany opens its own transaction; only close() uses
+            # a connection outside its thread
+            connection = sqlite3.connect(
+                self.database_path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS balanced_reactions ("
+                "canonical_key TEXT PRIMARY KEY, "
+                "coefficients TEXT NOT NULL, "
+                "error_msg TEXT NOT NULL) WITHOUT ROWID"
+            )
+            with self.lock:
+                self.connections_list.append(connection)
+                self.local_connections.generation = self.generation
+            self.local_connections.connection = connection
+        return connection
+
+    @staticmethod
+    def keyText(key: tuple) -> str:
+        """
+        Serializes a canonical key (without its "canonical" tag) as compact JSON.
+        """
+        return json.dumps(key[1:], separators=(",", ":"))
+
+    def getByGenerator(self, generator: Generator) -> EquationSolution:
+        """
+        Looks an equation up by its canonical form.
+
+        Parameters:
+            generator : Generator
+                The generator holding the parsed reactants and products.
+
+        Returns:
+            EquationSolution: The stored solution in the species order of the
+            generator, or None.
+        """
+        key, species_order = BalanceCache.canonicalKey(generator=generator)
+        row: tuple = (
+            self.connection()
+            .execute(
+                "SELECT coefficients, error_msg FROM balanced_reactions "
+                "WHERE canonical_key = ?",
+                (self.keyText(key),),
+            )
+            .fetchone()
+        )
+        with self.lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        coefficients_text, error_msg = row
+        return BalanceCache.canonicalSolution(
+            generator,
+            species_order,
+            tuple(json.loads(coefficients_text)),
+            error_msg,
+        )
+
+    @classmethod
+    def canonicalEntry(
+        cls, generator: Generator, equation_solution: EquationSolution
+    ) -> tuple[str, str, str]:
+        """
+        Returns the row storing a solved equation: its canonical key, its
+        integer coefficients in canonical order (JSON) and its error message.
+        Only a unique balance or an error should be stored. It needs no
+        connection, so worker processes can build rows for one writer.
+
+        Parameters:
+            generator : Generator
+                The generator holding the parsed reactants and products.
+            equation_solution : EquationSolution
+                The result of the solver.
+
+        Returns:
+            tuple[str, str, str]: The row.
+        """
+        key, species_order = BalanceCache.canonicalKey(generator=generator)
+        integer_coefficients: list[int] = equation_solution.integer_coefficients
+        return (
+            cls.keyText(key),
+            json.dumps(
+                [integer_coefficients[i] for i in species_order]
+                if integer_coefficients
+                else []
+            ),
+            equation_solution.error_msg,
+        )
+
+    def put(self, generator: Generator, equation_solution: EquationSolution) -> None:
+        """
+        Stores one solved equation; an existing row is kept.
+
+        Parameters:
+            generator : Generator
+                The generator holding the parsed reactants and products.
+            equation_solution : EquationSolution
+                The result of the solver.
+        """
+        self.putMany(
+            entries=[
+                self.canonicalEntry(generator=generator, equation_solution=equation_solution)
+            ]
+        )
+
+    def putMany(self, entries: Iterable[tuple[str, str, str]]) -> int:
+        """
+        Stores many rows in one transaction; existing rows are kept.
+
+        Parameters:
+            entries : Iterable[tuple[str, str, str]]
+                Rows as returned by canonicalEntry.
+
+        Returns:
+            int: The number of new rows.
+        """
+        connection: sqlite3.Connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            cursor: sqlite3.Cursor = connection.executemany(
+                "INSERT OR IGNORE INTO balanced_reactions VALUES (?, ?, ?)", entries
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        """
+        Returns the entry count and the hit/miss counters.
+
+        Returns:
+            dict: The store statistics.
+        """
+        return {
+            "entries": self.connection()
+            .execute("SELECT COUNT(*) FROM balanced_reactions")
+            .fetchone()[0],
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """
+        Closes the connections of every thread. It should be called once no
+        other thread is using the store; later calls open new connections.
+        """
+        with self.lock:
+            connections_list: list[sqlite3.Connection] = self.connections_list
+            self.connections_list = []
+            self.generation += 1
+        for connection in connections_list:
+            connection.close()
+        self.local_connections.connection = None
+
+
+# end region
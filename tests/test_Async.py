@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+import CREB
+from src.Budget import BalanceBudget, BudgetExceeded
+
+
+async def executeAll(chemical_equations: list[str], **options) -> list:
+    return await asyncio.gather(
+        *(
+            CREB.executeAsync(chemical_equation, **options)
+            for chemical_equation in chemical_equations
+        ),
+        return_exceptions=True,
+    )
+
+
+# region Execute Async
+
+
+def testConcurrentCallsMatchExecute() -> None:
+    chemical_equations: list[str] = [
+        "H2 + O2 = H2O",
+        "CH4 + O2 = CO2 + H2O",
+        "Xx = H2O",
+        "KMnO4 + HCl = KCl + MnCl2 + H2O + Cl2",
+    ] * 8
+    results_list: list = asyncio.run(executeAll(chemical_equations))
+    for chemical_equation, result in zip(chemical_equations, results_list):
+        if isinstance(result, Exception):
+            with pytest.raises(type(result), match=str(result)):
+                CREB.execute(chemical_equation)
+        else:
+            assert result == CREB.execute(chemical_equation)
+
+
+def testBudgetIsPassedToExecute() -> None:
+    results_list: list = asyncio.run(
+        executeAll(
+            ["CH4 + O2 = CO2 + H2O", "H2 + O2 = H2O"],
+            use_cache=False,
+            budget=BalanceBudget(max_species_count=3),
+        )
+    )
+    assert isinstance(results_list[0], BudgetExceeded)
+    assert results_list[0].limit == "species_count"
+    assert results_list[1] == "(H2) + 1/2 (O2)  = (H2O) "
+
+
+# end region
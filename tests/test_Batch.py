@@ -0,0 +1,69 @@
+import pytest
+import CREB
+from src.Batch import BatchBalancer, BatchItemResult
+
+chemical_equations: list[str] = [
+    "H2 + O2 = H2O",
+    "Xx + O2 = H2O",
+    "CH4 + O2 = CO2 + H2O",
+    "Fe + Cl2 = FeCl3",
+    "H2 = O2",
+]
+
+
+# region Batch Balancer
+
+
+def testExecuteManyMatchesExecuteInInputOrder() -> None:
+    results_list: list[BatchItemResult] = CREB.executeMany(
+        chemical_equations, workers=1, chunk_size=2
+    )
+    assert [batch_item_result.index for batch_item_result in results_list] == list(
+        range(len(chemical_equations))
+    )
+    for batch_item_result, chemical_equation in zip(results_list, chemical_equations):
+        assert batch_item_result.chemical_equation == chemical_equation
+        try:
+            balanced_equation: str = CREB.execute(chemical_equation)
+        except Exception as error:
+            assert batch_item_result.error_msg == f"{type(error).__name__}: {error}"
+            assert batch_item_result.balanced_equation == ""
+        else:
+            assert batch_item_result.balanced_equation == balanced_equation
+            assert batch_item_result.error_msg == ""
+
+
+def testOneBadEquationDoesNotAbortTheBatch() -> None:
+    results_list: list[BatchItemResult] = CREB.executeMany(chemical_equations, workers=1)
+    assert results_list[1].error_msg.startswith("ValueError: ")
+    assert results_list[2].balanced_equation == CREB.execute("CH4 + O2 = CO2 + H2O")
+
+
+def testProcessPoolMatchesSerial() -> None:
+    serial_results: list[BatchItemResult] = CREB.executeMany(chemical_equations * 3, workers=1)
+    pooled_results: list[BatchItemResult] = CREB.executeMany(
+        chemical_equations * 3, workers=2, chunk_size=2
+    )
+    assert [result.toDict() for result in pooled_results] == [
+        result.toDict() for result in serial_results
+    ]
+
+
+def testIterateConsumesAGenerator() -> None:
+    batch_balancer: BatchBalancer = BatchBalancer(
+        balance_function=CREB.execute, workers=1, chunk_size=2
+    )
+    results_list: list[BatchItemResult] = list(
+        batch_balancer.iterate(
+            chemical_equations=(chemical_equation for chemical_equation in chemical_equations)
+        )
+    )
+    assert len(results_list) == len(chemical_equations)
+
+
+def testChunkSizeMustBePositive() -> None:
+    with pytest.raises(ValueError):
+        BatchBalancer(balance_function=CREB.execute, chunk_size=0)
+
+
+# end region
@@ -0,0 +1,53 @@
+from benchmarks.Benchmark import Benchmark, compareReports, stage_names
+from src.LinearEquationsSystem import Generator
+from src.Solver import Solver
+
+# region Benchmark
+
+
+def testStagesAreThoseOfThePipeline(monkeypatch) -> None:
+    def failingGenerate(generator: Generator) -> list:
+        raise AssertionError("the string system is not part of the pipeline")
+
+    monkeypatch.setattr(Generator, "generateLinearEquationsSystem", failingGenerate)
+    stage_timings: dict[str, float] = Benchmark(repeat=1).runEquation(
+        chemical_equation="CH4 + O2 = CO2 + H2O"
+    )
+    assert list(stage_timings) == stage_names == ["parse", "matrix", "solve", "rewrite"]
+    assert all(seconds >= 0 for seconds in stage_timings.values())
+
+
+def testSolveReusesTheBuiltMatrix() -> None:
+    solver_object: Solver = Solver(generator=Generator(chemical_equation="H2 + O2 = H2O"))
+    composition_matrix = solver_object.buildSparseCompositionMatrix()
+    assert solver_object.buildSparseCompositionMatrix() is composition_matrix
+    assert solver_object.solveInteger() == [2, 1, 2]
+    assert solver_object.composition_matrix is composition_matrix
+
+
+def testReportAndComparison() -> None:
+    benchmark: Benchmark = Benchmark(grades_list=["trivial"], repeat=1)
+    benchmark.run()
+    benchmark_report: dict = benchmark.report()
+    assert set(benchmark_report["grades"]["trivial"]["stages"]) == set(stage_names) | {"total"}
+    assert compareReports(report=benchmark_report, baseline=benchmark_report, tolerance=0.0) == []
+
+    # a baseline saved before the "generate" stage became "matrix"
+    old_baseline: dict = {
+        "grades": {
+            "trivial": {
+                "stages": {
+                    stage: {"p50": 1e-3}
+                    for stage in ["parse", "generate", "solve", "rewrite", "total"]
+                }
+            }
+        }
+    }
+    regressions_list: list[str] = compareReports(
+        report=benchmark_report, baseline=old_baseline, tolerance=0.2
+    )
+    assert regressions_list
+    assert not any(regression.startswith("trivial/matrix") for regression in regressions_list)
+
+
+# end region
@@ -0,0 +1,98 @@
+import pickle
+import pytest
+import CREB
+from src.Batch import BatchItemResult
+from src.Budget import BalanceBudget, BudgetExceeded
+from src.LinearEquationsSystem import Generator
+from src.Solver import Solver
+
+
+def budgetError(chemical_equation: str, **limits) -> BudgetExceeded:
+    with pytest.raises(BudgetExceeded) as error_info:
+        CREB.execute(chemical_equation, use_cache=False, budget=BalanceBudget(**limits))
+    return error_info.value
+
+
+# region Balance Budget
+
+
+@pytest.mark.parametrize("chemical_equation", ["H2 + O2 = H2O", "H2+O2=H2O", "2 H2 + O2 = 2 H2O"])
+def testSpacesAndCoefficientsDoNotCountTowardsFormulaLength(chemical_equation: str) -> None:
+    assert CREB.execute(
+        chemical_equation, use_cache=False, budget=BalanceBudget(max_formula_length=3)
+    ) == "(H2) + 1/2 (O2)  = (H2O) "
+
+
+def testFormulaLength() -> None:
+    budget_exceeded: BudgetExceeded = budgetError("2 H2O2 = 2 H2O + O2", max_formula_length=3)
+    assert budget_exceeded.toDict() == {
+        "limit": "formula_length",
+        "value": 4,
+        "maximum": 3,
+        "stage": "parse",
+    }
+
+
+def testAtomCountAfterGroupMultipliers() -> None:
+    budget_exceeded: BudgetExceeded = budgetError(
+        "((C2H4)500)20 + O2 = CO2 + H2O", max_atom_count=10**4
+    )
+    assert (budget_exceeded.limit, budget_exceeded.value) == ("atom_count", 60000)
+    CREB.execute("Fe^3+ + e = Fe^2+", use_cache=False, budget=BalanceBudget(max_atom_count=1))
+
+
+def testSpeciesCount() -> None:
+    budget_exceeded: BudgetExceeded = budgetError(
+        "CH4 + O2 = CO2 + H2O", max_species_count=3
+    )
+    assert (budget_exceeded.limit, budget_exceeded.value) == ("species_count", 4)
+
+
+def testSecondsDuringParseAndSolve() -> None:
+    assert budgetError("H2 + O2 = H2O", max_seconds=-1).toDict()["stage"] == "parse"
+    solver_object: Solver = Solver(
+        generator=Generator(chemical_equation="H2 + O2 = H2O"),
+        budget=BalanceBudget(max_seconds=-1).start(),
+    )
+    with pytest.raises(BudgetExceeded) as error_info:
+        solver_object.execute()
+    assert error_info.value.stage == "solve"
+
+
+def testBudgetExceededIsAValueErrorThatPickles() -> None:
+    budget_exceeded: BudgetExceeded = budgetError("CH4 + O2 = CO2 + H2O", max_species_count=1)
+    assert isinstance(budget_exceeded, ValueError)
+    unpickled_error: BudgetExceeded = pickle.loads(pickle.dumps(budget_exceeded))
+    assert unpickled_error.toDict() == budget_exceeded.toDict()
+    assert str(unpickled_error) == str(budget_exceeded)
+
+
+def testConfiguredBudgetIsReportedPerBatchItem() -> None:
+    CREB.configureCache(max_size=0)
+    CREB.configureBudget(max_species_count=3)
+    try:
+        results_list: list[BatchItemResult] = CREB.executeMany(
+            ["H2 + O2 = H2O", "CH4 + O2 = CO2 + H2O"], workers=1
+        )
+    finally:
+        CREB.configureBudget()
+        CREB.configureCache(max_size=1024)
+    assert results_list[0].toDict().get("budget_exceeded") is None
+    assert results_list[1].toDict()["budget_exceeded"] == {
+        "limit": "species_count",
+        "value": 4,
+        "maximum": 3,
+        "stage": "parse",
+    }
+    assert CREB.balance_budget is None
+
+
+def testStartKeepsTheLimits() -> None:
+    balance_budget: BalanceBudget = BalanceBudget(max_atom_count=5, max_seconds=1.0)
+    running_budget: BalanceBudget = balance_budget.start()
+    assert balance_budget.deadline is None
+    assert running_budget.deadline == running_budget.start_time + 1.0
+    assert repr(running_budget) == repr(balance_budget)
+
+
+# end region
@@ -0,0 +1,101 @@
+import pytest
+import CREB
+from src.Cache import BalanceCache
+from src.LinearEquationsSystem import Generator
+from src.Solver import EquationSolution, Solver
+
+
+@pytest.fixture(autouse=True)
+def emptyCache():
+    CREB.configureCache(max_size=1024)
+    yield
+    CREB.configureCache(max_size=1024)
+
+
+def solveAndStore(balance_cache: BalanceCache, chemical_equation: str) -> EquationSolution:
+    generator_object: Generator = Generator(chemical_equation=chemical_equation)
+    equation_solution: EquationSolution = Solver(generator=generator_object).execute()
+    balance_cache.put(
+        chemical_equation=chemical_equation,
+        generator=generator_object,
+        equation_solution=equation_solution,
+    )
+    return equation_solution
+
+
+# region Balance Cache
+
+
+def testTextHitIgnoresWhitespace() -> None:
+    balance_cache: BalanceCache = BalanceCache(max_size=8)
+    equation_solution: EquationSolution = solveAndStore(balance_cache, "H2 + O2 = H2O")
+    cached_solution: EquationSolution = balance_cache.getByText("H2+O2  =H2O")
+    assert cached_solution.integer_coefficients == equation_solution.integer_coefficients
+    assert cached_solution.equation_solution == equation_solution.equation_solution
+    assert cached_solution.reactants_count == 2
+
+
+@pytest.mark.parametrize(
+    "chemical_equation, permuted_equation",
+    [
+        ("H2 + O2 = H2O", "O2 + H2 = H2O"),
+        ("CH4 + O2 = CO2 + H2O", "O2 + CH4 = H2O + CO2"),
+        (
+            "KMnO4 + HCl = KCl + MnCl2 + H2O + Cl2",
+            "HCl + KMnO4 = Cl2 + H2O + MnCl2 + KCl",
+        ),
+    ],
+)
+def testCanonicalHitMatchesSolvingThePermutedEquation(
+    chemical_equation: str, permuted_equation: str
+) -> None:
+    balance_cache: BalanceCache = BalanceCache(max_size=8)
+    solveAndStore(balance_cache, chemical_equation)
+    generator_object: Generator = Generator(chemical_equation=permuted_equation)
+    cached_solution: EquationSolution = balance_cache.getByGenerator(generator_object)
+    solved_solution: EquationSolution = Solver(generator=generator_object).execute()
+    assert balance_cache.stats()["hits"] == 1
+    assert cached_solution.species_list == solved_solution.species_list
+    assert cached_solution.integer_coefficients == solved_solution.integer_coefficients
+    assert cached_solution.equation_solution == solved_solution.equation_solution
+
+
+def testCachedExecuteMatchesUncached() -> None:
+    for chemical_equation in ("CH4 + O2 = CO2 + H2O", "O2 + CH4 = H2O + CO2"):
+        assert CREB.execute(chemical_equation) == CREB.execute(
+            chemical_equation, use_cache=False
+        )
+    assert CREB.cacheStats()["hits"] == 1
+
+
+def testErrorsAreCached() -> None:
+    with pytest.raises(ValueError):
+        CREB.execute("H2 = O2")
+    with pytest.raises(ValueError):
+        CREB.execute("H2=O2")
+    assert CREB.cacheStats()["hits"] == 1
+
+
+def testLeastRecentlyUsedEntriesAreEvicted() -> None:
+    balance_cache: BalanceCache = BalanceCache(max_size=2)
+    solveAndStore(balance_cache, "H2 + O2 = H2O")
+    solveAndStore(balance_cache, "N2 + H2 = NH3")
+    assert balance_cache.stats()["evictions"] == 2
+    assert balance_cache.getByText("H2 + O2 = H2O") is None
+    assert balance_cache.getByText("N2 + H2 = NH3") is not None
+
+
+def testZeroSizeDisablesTheCache() -> None:
+    CREB.configureCache(max_size=0)
+    CREB.execute("H2 + O2 = H2O")
+    CREB.execute("H2 + O2 = H2O")
+    assert CREB.cacheStats() == {
+        "size": 0,
+        "max_size": 0,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+    }
+
+
+# end region
@@ -0,0 +1,64 @@
+import io
+import json
+import CREB
+from utils.CommandLine import readEquations, runCommandLine
+
+
+def writeEquations(tmp_path, file_name: str, lines: list[str]) -> str:
+    file_path = tmp_path / file_name
+    file_path.write_text("\n".join(lines) + "\n")
+    return str(file_path)
+
+
+# region Command Line
+
+
+def testReadEquationsSkipsBlankLines(tmp_path) -> None:
+    first_path: str = writeEquations(tmp_path, "first.txt", ["H2 + O2 = H2O", "", "  "])
+    second_path: str = writeEquations(tmp_path, "second.txt", [" Fe + Cl2 = FeCl3 "])
+    assert list(readEquations(file_paths=[first_path, second_path])) == [
+        "H2 + O2 = H2O",
+        "Fe + Cl2 = FeCl3",
+    ]
+
+
+def testReadEquationsFromStdin(monkeypatch) -> None:
+    monkeypatch.setattr("sys.stdin", io.StringIO("H2 + O2 = H2O\n\nH2 = O2\n"))
+    assert list(readEquations(file_paths=[])) == ["H2 + O2 = H2O", "H2 = O2"]
+
+
+def testWritesOneJsonLinePerEquation(tmp_path, capsys) -> None:
+    input_path: str = writeEquations(
+        tmp_path, "input.txt", ["H2 + O2 = H2O", "Xx = H2O", "CH4 + O2 = CO2 + H2O"]
+    )
+    output_path: str = str(tmp_path / "output.jsonl")
+    exit_status: int = runCommandLine(
+        argv=[input_path, "-o", output_path, "-c", "2"], balance_function=CREB.execute
+    )
+    with open(output_path) as file:
+        results_list: list[dict] = [json.loads(line) for line in file]
+    assert exit_status == 1
+    assert [result["index"] for result in results_list] == [0, 1, 2]
+    assert results_list[0]["balanced_equation"] == CREB.execute("H2 + O2 = H2O")
+    assert results_list[1]["error_msg"].startswith("ValueError: ")
+    assert "3 equations (1 errors)" in capsys.readouterr().err
+
+
+def testDedupAndQuiet(tmp_path, capsys) -> None:
+    input_path: str = writeEquations(
+        tmp_path, "input.txt", ["H2 + O2 = H2O", "O2 + H2 = H2O", "H2 + Cl2 = HCl"]
+    )
+    exit_status: int = runCommandLine(
+        argv=[input_path, "--dedup", "--quiet"], balance_function=CREB.execute
+    )
+    captured = capsys.readouterr()
+    results_list: list[dict] = [json.loads(line) for line in captured.out.splitlines()]
+    assert exit_status == 0
+    assert [result["balanced_equation"] for result in results_list] == [
+        CREB.execute(chemical_equation)
+        for chemical_equation in ["H2 + O2 = H2O", "O2 + H2 = H2O", "H2 + Cl2 = HCl"]
+    ]
+    assert captured.err == ""
+
+
+# end region
@@ -0,0 +1,24 @@
+import pytest
+import CREB
+from benchmarks.Corpus import chainEquation, corpus_dict
+from src.Result import BalanceResult
+
+# region Benchmark Corpus
+
+
+@pytest.mark.parametrize(
+    "chemical_equation",
+    [chemical_equation for equations in corpus_dict.values() for chemical_equation in equations],
+)
+def testEveryCorpusEquationIsBalanced(chemical_equation: str) -> None:
+    balance_result: BalanceResult = CREB.balance(chemical_equation, use_cache=False)
+    assert balance_result.status == "balanced"
+
+
+def testChainEquation() -> None:
+    assert chainEquation(elements_count=3) == "HHe + He2Li2 = HHe5Li4"
+    balance_result: BalanceResult = CREB.balance(chainEquation(elements_count=5), use_cache=False)
+    assert balance_result.integer_coefficients == (1, 2, 3, 4, 1)
+
+
+# end region
@@ -0,0 +1,133 @@
+import pytest
+import CREB
+from src.Batch import BatchItemResult
+from src.Budget import BalanceBudget
+from src.Cache import BalanceCache
+from src.Dedup import DeduplicatingBalancer, matrixKey
+from src.LinearEquationsSystem import Generator
+from src.Store import ResultStore
+
+chemical_equations: list[str] = [
+    "H2 + O2 = H2O",
+    "O2 + H2 = H2O",
+    "H2 + S2 = H2S",
+    "CH4 + O2 = CO2 + H2O",
+    "O2 + CH4 = H2O + CO2",
+    "C + O2 = CO + CO2",
+    "O2 + C = CO2 + CO",
+    "H2 = O2",
+    "O2 = H2",
+    "H2 + Xx = H2O",
+    "H2 + O2 = H2O",
+]
+"""list[str]: Duplicates by order and by symbols, ambiguous, unbalanceable and invalid equations."""
+
+
+def resultTuples(results_list: list[BatchItemResult]) -> list[tuple]:
+    return [
+        (result.index, result.chemical_equation, result.balanced_equation, result.error_msg)
+        for result in results_list
+    ]
+
+
+# region Deduplicating Balancer
+
+
+def testMatrixKeyIgnoresOrderAndSymbols() -> None:
+    keys_list: list[tuple] = [
+        matrixKey(Generator(chemical_equation=chemical_equation))[0]
+        for chemical_equation in ("H2 + O2 = H2O", "O2 + H2 = H2O", "H2 + S2 = H2S")
+    ]
+    assert keys_list[0] == keys_list[1] == keys_list[2]
+    assert keys_list[0] != matrixKey(Generator(chemical_equation="H2 + O2 = H2O2"))[0]
+
+
+def testResultsMatchBalancingEachEquation() -> None:
+    CREB.configureCache(max_size=0)
+    try:
+        expected: list[BatchItemResult] = CREB.executeMany(chemical_equations, workers=1)
+    finally:
+        CREB.configureCache(max_size=1024)
+    deduplicating_balancer: DeduplicatingBalancer = DeduplicatingBalancer(window_size=4)
+    assert resultTuples(
+        deduplicating_balancer.execute(chemical_equations=chemical_equations)
+    ) == resultTuples(expected)
+
+
+def testEachMatrixIsSolvedOnce() -> None:
+    deduplicating_balancer: DeduplicatingBalancer = DeduplicatingBalancer()
+    deduplicating_balancer.execute(chemical_equations=chemical_equations)
+    # the ambiguous "C + O2 = CO + CO2" and "O2 + C = CO2 + CO" share one solve
+    assert deduplicating_balancer.stats() == {
+        "equations": 11,
+        "parse_errors": 1,
+        "unique_matrices": 4,
+        "cache_hits": 0,
+        "solves": 4,
+        "dedup_ratio": 2.5,
+    }
+
+
+def testExecuteManyDeduplicates() -> None:
+    results_list: list[BatchItemResult] = CREB.executeMany(
+        ["H2 + O2 = H2O", "O2 + H2 = H2O", "H2 + Xx = H2O"], deduplicate=True, workers=1
+    )
+    assert [result.balanced_equation for result in results_list[:2]] == [
+        "(H2) + 1/2 (O2)  = (H2O) ",
+        "1/2 (O2) + (H2)  = (H2O) ",
+    ]
+    assert results_list[2].error_msg.startswith("ValueError: Unknown element 'Xx'")
+
+
+def testExecuteManyReturnsStats() -> None:
+    CREB.configureCache(max_size=0)
+    try:
+        results_list, stats_dict = CREB.executeMany(
+            chemical_equations, deduplicate=True, workers=1, return_stats=True
+        )
+    finally:
+        CREB.configureCache(max_size=1024)
+    assert len(results_list) == len(chemical_equations)
+    assert (stats_dict["solves"], stats_dict["dedup_ratio"]) == (4, 2.5)
+    with pytest.raises(ValueError, match="deduplicate"):
+        CREB.executeMany(chemical_equations, workers=1, return_stats=True)
+
+
+def testCacheAndStoreAnswerBeforeSolving(tmp_path) -> None:
+    result_store: ResultStore = ResultStore(database_path=str(tmp_path / "results.sqlite"))
+    DeduplicatingBalancer(result_store=result_store).execute(
+        chemical_equations=chemical_equations
+    )
+    # every member of a unique or unbalanceable group is stored, the
+    # ambiguous group and the invalid equation are not
+    assert result_store.stats()["entries"] == 5
+    balance_cache: BalanceCache = BalanceCache()
+    deduplicating_balancer: DeduplicatingBalancer = DeduplicatingBalancer(
+        balance_cache=balance_cache, result_store=result_store
+    )
+    assert resultTuples(
+        deduplicating_balancer.execute(chemical_equations=chemical_equations)
+    ) == resultTuples(DeduplicatingBalancer().execute(chemical_equations=chemical_equations))
+    assert (
+        deduplicating_balancer.stats()["cache_hits"],
+        deduplicating_balancer.stats()["solves"],
+    ) == (3, 1)
+    deduplicating_balancer.execute(chemical_equations=["O2 + H2 = H2O"])
+    assert balance_cache.stats()["hits"] == 1
+    result_store.close()
+
+
+def testBudgetIsAppliedToEveryEquation() -> None:
+    results_list: list[BatchItemResult] = DeduplicatingBalancer(
+        budget=BalanceBudget(max_species_count=3)
+    ).execute(chemical_equations=["H2 + O2 = H2O", "CH4 + O2 = CO2 + H2O"])
+    assert results_list[0].balanced_equation == "(H2) + 1/2 (O2)  = (H2O) "
+    assert results_list[1].error_msg.startswith("BudgetExceeded: Budget exceeded: species_count")
+    assert results_list[1].budget_exceeded["limit"] == "species_count"
+    solve_results: list[BatchItemResult] = DeduplicatingBalancer(
+        budget=BalanceBudget(max_seconds=3600)
+    ).execute(chemical_equations=["H2 + O2 = H2O", "O2 + H2 = H2O"])
+    assert [result.error_msg for result in solve_results] == ["", ""]
+
+
+# end region
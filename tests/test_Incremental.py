@@ -0,0 +1,82 @@
+import pytest
+import CREB
+from src.Incremental import IncrementalBalancer
+from src.LinearEquationsSystem import Generator
+from src.Solver import Solver
+
+
+def assertMatchesFullBalance(incremental_balancer: IncrementalBalancer) -> None:
+    chemical_equation: str = incremental_balancer.chemicalEquation()
+    if CREB.balance(chemical_equation, use_cache=False).status == "ambiguous":
+        # the free species, and so the vector picked, may differ: check it balances
+        composition_matrix = Solver(
+            generator=Generator(chemical_equation=chemical_equation)
+        ).buildSparseCompositionMatrix()
+        assert not any(
+            composition_matrix.multiply(
+                incremental_balancer.solution().integer_coefficients
+            )
+        )
+        return
+    try:
+        expected: str = CREB.execute(chemical_equation, use_cache=False)
+    except ValueError as error:
+        with pytest.raises(ValueError, match=str(error)):
+            incremental_balancer.execute()
+        return
+    assert incremental_balancer.execute() == expected
+
+
+# region Incremental Balancer
+
+
+def testFromEquation() -> None:
+    incremental_balancer: IncrementalBalancer = IncrementalBalancer.fromEquation(
+        chemical_equation="H2 + O2 = H2O"
+    )
+    assert incremental_balancer.chemicalEquation() == "H2 + O2 = H2O"
+    assert incremental_balancer.execute() == "(H2) + 1/2 (O2)  = (H2O) "
+
+
+def testEveryEditMatchesAFullBalance() -> None:
+    incremental_balancer: IncrementalBalancer = IncrementalBalancer()
+    incremental_balancer.addSpecies(chemical_formula="CH4")
+    oxygen_id: int = incremental_balancer.addSpecies(chemical_formula="O2")
+    incremental_balancer.addSpecies(chemical_formula="CO2", side="product")
+    assertMatchesFullBalance(incremental_balancer)
+    water_id: int = incremental_balancer.addSpecies(chemical_formula="H2O", side="product")
+    assertMatchesFullBalance(incremental_balancer)
+    incremental_balancer.replaceSpecies(species_id=0, chemical_formula="C2H6")
+    assert incremental_balancer.chemicalEquation() == "C2H6 + O2 = CO2 + H2O"
+    assertMatchesFullBalance(incremental_balancer)
+    incremental_balancer.addSpecies(chemical_formula="CO", side="product", position=0)
+    assertMatchesFullBalance(incremental_balancer)
+    incremental_balancer.removeSpecies(species_id=water_id)
+    assertMatchesFullBalance(incremental_balancer)
+    incremental_balancer.removeSpecies(species_id=oxygen_id)
+    assertMatchesFullBalance(incremental_balancer)
+
+
+def testRemovingAPivotSpecies() -> None:
+    incremental_balancer: IncrementalBalancer = IncrementalBalancer.fromEquation(
+        chemical_equation="H2 + O2 = H2O + H2O2"
+    )
+    for species_id in (incremental_balancer.product_ids[1], incremental_balancer.reactant_ids[0]):
+        incremental_balancer.removeSpecies(species_id=species_id)
+        assertMatchesFullBalance(incremental_balancer)
+
+
+def testInvalidEdits() -> None:
+    incremental_balancer: IncrementalBalancer = IncrementalBalancer.fromEquation(
+        chemical_equation="H2 + O2 = H2O"
+    )
+    with pytest.raises(KeyError):
+        incremental_balancer.removeSpecies(species_id=99)
+    with pytest.raises(ValueError, match="Unknown side"):
+        incremental_balancer.addSpecies(chemical_formula="N2", side="middle")
+    with pytest.raises(ValueError, match="Unknown element"):
+        incremental_balancer.addSpecies(chemical_formula="Xx2")
+    assert incremental_balancer.chemicalEquation() == "H2 + O2 = H2O"
+
+
+# end region
@@ -0,0 +1,111 @@
+import pytest
+from collections import Counter
+import CREB
+from src.Lexer import EquationLexer
+from src.Parser import EquationParser
+
+
+def lexCounts(chemical_equation: str) -> list[list[tuple[str, dict]]]:
+    return [
+        [(species_text, dict(element_counts)) for species_text, element_counts in side]
+        for side in EquationLexer(chemical_equation=chemical_equation).lex()
+    ]
+
+
+# region Equation Lexer
+
+
+def testGroupsAreMultiplied() -> None:
+    assert lexCounts("Ca3(PO4)2 + K4[Fe(CN)6] = Fe") == [
+        [
+            ("Ca3(PO4)2", {"Ca": 3, "P": 2, "O": 8}),
+            ("K4[Fe(CN)6]", {"K": 4, "Fe": 1, "C": 6, "N": 6}),
+        ],
+        [("Fe", {"Fe": 1})],
+    ]
+
+
+@pytest.mark.parametrize(
+    "chemical_equation, message, position",
+    [
+        ("H2 + Xx2 = H2O", "Unknown element 'Xx'", 5),
+        ("Ca(OH2 = CaO", "Unbalanced parentheses in chemical formula", 2),
+        ("Ca(OH]2 = CaO", "Unbalanced parentheses in chemical formula", 5),
+        ("SO4^2-H = S", "A charge can only end a species", 6),
+        ("^2- = S", "A charge needs a species", 0),
+        ("eH = H", "The electron must stand alone", 1),
+        ("H2 +  = H2", "Empty species", 6),
+        ("H2 = H2 = H2", "More than one '='", 8),
+        ("H2 + O2", "Expected exactly one '='", 7),
+        ("H2 2 = H2", "Unexpected number '2'", 3),
+        ("2 3 H2 = H2", "Unexpected number '3'", 2),
+        ("H2 + O2 = H2O!", "Unexpected character '!'", 13),
+    ],
+)
+def testErrorsReportTheirPosition(chemical_equation: str, message: str, position: int) -> None:
+    with pytest.raises(ValueError) as error_info:
+        EquationLexer(chemical_equation=chemical_equation).lex()
+    assert str(error_info.value) == f"{message} at position {position}: {chemical_equation}"
+
+
+def testChargesAndElectrons() -> None:
+    assert lexCounts("Fe^3+ + e^- = Fe^2+") == [
+        [("Fe^3+", {"Fe": 1, "charge": 3}), ("e^-", {"charge": -1})],
+        [("Fe^2+", {"Fe": 1, "charge": 2})],
+    ]
+
+
+def testWrittenCoefficientsAreKeptOutOfTheSpecies() -> None:
+    equation_lexer: EquationLexer = EquationLexer(chemical_equation="2 H2 + 1/2 O2 = H2O")
+    assert [[species_text for species_text, _ in side] for side in equation_lexer.lex()] == [
+        ["H2", "O2"],
+        ["H2O"],
+    ]
+    assert equation_lexer.written_coefficients == [["2", "1/2"], [""]]
+    assert CREB.execute("2 H2 + O2 = H2O") == CREB.execute("H2 + O2 = H2O")
+
+
+@pytest.mark.parametrize(
+    "hydrate", ["CuSO4·5H2O", "CuSO4*5H2O", "CuSO4.5H2O", "CuSO4 · 5H2O", "(CuSO4·5H2O)"]
+)
+def testHydratesAreCounted(hydrate: str) -> None:
+    assert EquationLexer(chemical_equation=hydrate).lexSpecies() == Counter(
+        {"Cu": 1, "S": 1, "O": 9, "H": 10}
+    )
+
+
+def testHydratePartsAndGroups() -> None:
+    assert EquationLexer(chemical_equation="Na2CO3·10H2O·NaCl").lexSpecies() == Counter(
+        {"Na": 3, "C": 1, "O": 13, "H": 20, "Cl": 1}
+    )
+    assert EquationLexer(chemical_equation="(CuSO4·5H2O)2").lexSpecies() == Counter(
+        {"Cu": 2, "S": 2, "O": 18, "H": 20}
+    )
+    assert CREB.execute("CuSO4·5H2O = CuSO4 + H2O") == "1/5 (CuSO4·5H2O)  = 1/5 (CuSO4) + (H2O) "
+
+
+@pytest.mark.parametrize(
+    "chemical_equation, message, position",
+    [
+        ("·H2O = H2O", "A hydrate dot needs a formula on both sides", 0),
+        ("CuSO4· = CuSO4", "A hydrate dot needs a formula on both sides", 5),
+        ("CuSO4··H2O = CuSO4", "A hydrate dot needs a formula on both sides", 6),
+        ("(CuSO4·)2 = CuSO4", "A hydrate dot needs a formula on both sides", 6),
+        ("CuSO4·0H2O = CuSO4", "A hydrate count must be positive", 5),
+        ("SO4^2-·H2O = SO4", "A charge can only end a species", 6),
+    ],
+)
+def testMalformedHydrates(chemical_equation: str, message: str, position: int) -> None:
+    with pytest.raises(ValueError) as error_info:
+        EquationLexer(chemical_equation=chemical_equation).lex()
+    assert str(error_info.value) == f"{message} at position {position}: {chemical_equation}"
+
+
+def testParserWrapsSpecies() -> None:
+    equation_parser: EquationParser = EquationParser(chemical_equation="2 H2 + (O2) = H2O")
+    equation_parser.parse()
+    assert equation_parser.reactants_list == ["(H2)", "(O2)"]
+    assert equation_parser.parsed_products == {"(H2O)": Counter({"H": 2, "O": 1})}
+
+
+# end region
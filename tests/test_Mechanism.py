@@ -0,0 +1,101 @@
+from fractions import Fraction
+import CREB
+from src.Mechanism import Mechanism, ReactionReport
+from src.SparseMatrix import CompositionMatrix
+
+# region Mechanism
+
+
+def testReactionsAreVerifiedAndBalanced() -> None:
+    reports_list: list[ReactionReport] = CREB.executeMechanism(
+        ["2 H2 + O2 = 2 H2O", "H2 + O2 = H2O", "1/2 O2 + H2 = H2O"]
+    )
+    assert [report.status for report in reports_list] == ["balanced"] * 3
+    assert [report.balanced_as_written for report in reports_list] == [True, False, True]
+    assert reports_list[0].species_list == ["(H2)", "(O2)", "(H2O)"]
+    assert reports_list[0].coefficients == [2, 1, 2]
+    assert reports_list[2].coefficients == [1, 2, 2]
+
+
+def testStatusOfEveryReaction() -> None:
+    reports_list: list[ReactionReport] = CREB.executeMechanism(
+        ["C + O2 = CO + CO2", "H2 = O2", "Xx + O2 = XxO"]
+    )
+    assert [report.status for report in reports_list] == [
+        "ambiguous",
+        "unbalanceable",
+        "invalid",
+    ]
+    assert reports_list[2].error_msg.startswith("Unknown element 'Xx' at position 0")
+
+
+def testZeroDenominatorIsReportedOnItsReaction() -> None:
+    reports_list: list[ReactionReport] = CREB.executeMechanism(
+        ["2/0 H2 + O2 = H2O", "2 H2 + O2 = 2 H2O"]
+    )
+    assert reports_list[0].status == "invalid"
+    assert "Zero denominator in coefficient '2/0': H2" in reports_list[0].error_msg
+    assert reports_list[1].status == "balanced"
+
+
+def testSharedSpeciesAreStoredOnce() -> None:
+    mechanism_object: Mechanism = Mechanism(
+        chemical_equations=["2 H2 + O2 = 2 H2O", "H2O + C = CO + H2"]
+    )
+    mechanism_object.execute()
+    assert list(mechanism_object.species_index_dict) == [
+        "(H2)",
+        "(O2)",
+        "(H2O)",
+        "(C)",
+        "(CO)",
+    ]
+    assert mechanism_object.reactions_list[1] == ([2, 3], [4, 0])
+
+
+def testParseIsIdempotent() -> None:
+    mechanism_object: Mechanism = Mechanism(
+        chemical_equations=["2 H2 + O2 = 2 H2O", "Xx = H2", "H2O + C = CO + H2"]
+    )
+    mechanism_object.parse()
+    mechanism_object.parse()
+    assert len(mechanism_object.reactions_list) == 3
+    assert len(mechanism_object.stoichiometric_matrix) == 3
+    assert list(mechanism_object.parse_errors_dict) == [1]
+    assert mechanism_object.verify() == [True, False, True]
+    assert [report.status for report in mechanism_object.execute()] == [
+        "balanced",
+        "invalid",
+        "balanced",
+    ]
+
+
+def testVerifyIsOneSparseProduct(monkeypatch) -> None:
+    products_list: list[list[dict]] = []
+    original_multiply_sparse = CompositionMatrix.multiplySparse
+
+    def recordingMultiplySparse(composition_matrix: CompositionMatrix, matrix_rows):
+        products_list.append(original_multiply_sparse(composition_matrix, matrix_rows))
+        return products_list[-1]
+
+    monkeypatch.setattr(CompositionMatrix, "multiplySparse", recordingMultiplySparse)
+    mechanism_object: Mechanism = Mechanism(
+        chemical_equations=["2 H2 + O2 = 2 H2O", "H2 + O2 = H2O", "1/2 O2 + H2 = H2O"]
+    )
+    mechanism_object.parse()
+    assert mechanism_object.verify() == [True, False, True]
+    # rows H then O, one column per reaction; only the O row of reaction 1 is off
+    assert products_list == [[{0: 0, 1: 0, 2: 0}, {0: 0, 1: -1, 2: 0}]]
+
+
+def testMultiplySparse() -> None:
+    composition_matrix: CompositionMatrix = CompositionMatrix.fromCompositions(
+        reactant_compositions=[{"H": 2}, {"O": 2}, {"H": 2, "O": 1}], product_compositions=[]
+    )
+    assert composition_matrix.multiplySparse(
+        matrix_rows={0: {0: -2, 1: 1}, 1: {0: -1}, 2: {0: 2, 1: Fraction(-1, 2)}}
+    ) == [{0: 0, 1: 1}, {0: 0, 1: Fraction(-1, 2)}]
+    assert composition_matrix.multiplySparse(matrix_rows={}) == [{}, {}]
+
+
+# end region
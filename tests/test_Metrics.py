@@ -0,0 +1,95 @@
+import pytest
+import CREB
+from utils.Metrics import (
+    Instrumentation,
+    StageMetrics,
+    StatisticsExporter,
+    disabled_stage_metrics,
+)
+
+
+@pytest.fixture
+def recordedMetrics():
+    metrics_list: list[StageMetrics] = []
+    CREB.instrumentation.addExporter(metrics_list.append)
+    yield metrics_list
+    CREB.instrumentation.removeExporter(metrics_list.append)
+
+
+# region Instrumentation
+
+
+def testDisabledUntilAnExporterIsAdded() -> None:
+    instrumentation: Instrumentation = Instrumentation()
+    assert instrumentation.start(chemical_equation="H2 = H2") is disabled_stage_metrics
+    exporter = StatisticsExporter()
+    instrumentation.addExporter(exporter)
+    stage_metrics: StageMetrics = instrumentation.start(chemical_equation="H2 = H2")
+    assert stage_metrics is not disabled_stage_metrics
+    instrumentation.finish(stage_metrics=stage_metrics)
+    instrumentation.removeExporter(exporter)
+    assert instrumentation.start(chemical_equation="H2 = H2") is disabled_stage_metrics
+    assert exporter.snapshot()["calls"] == 1
+
+
+def testDisabledMetricsRecordNothing() -> None:
+    disabled_stage_metrics.mark(stage="parse")
+    disabled_stage_metrics.count(name="species_count", value=3)
+    disabled_stage_metrics.fail(error_msg="ValueError: ")
+    assert disabled_stage_metrics.stage_timings == {}
+    assert disabled_stage_metrics.counters == {}
+    assert disabled_stage_metrics.error_msg == ""
+
+
+def testExecuteRecordsStagesAndCounters(recordedMetrics: list[StageMetrics]) -> None:
+    CREB.execute("H2 + O2 = H2O", use_cache=False)
+    stage_metrics: StageMetrics = recordedMetrics[-1]
+    assert stage_metrics.chemical_equation == "H2 + O2 = H2O"
+    assert {"parse", "solve", "rewrite"} <= set(stage_metrics.stage_timings)
+    assert stage_metrics.counters["species_count"] == 3
+    assert stage_metrics.counters["element_count"] == 2
+    assert stage_metrics.counters["cache_hit"] == 0
+    assert stage_metrics.error_msg == ""
+
+
+def testCacheHitSkipsTheSolve(recordedMetrics: list[StageMetrics]) -> None:
+    CREB.execute("N2 + H2 = NH3")
+    CREB.execute("N2 + H2 = NH3")
+    stage_metrics: StageMetrics = recordedMetrics[-1]
+    assert stage_metrics.counters["cache_hit"] == 1
+    assert "solve" not in stage_metrics.stage_timings
+
+
+def testFailuresAreRecorded(recordedMetrics: list[StageMetrics]) -> None:
+    with pytest.raises(ValueError):
+        CREB.execute("Xx = H2O", use_cache=False)
+    assert recordedMetrics[-1].error_msg.startswith("ValueError: Unknown element 'Xx'")
+    assert CREB.balance("Xx = H2O", use_cache=False).status == "invalid"
+    assert recordedMetrics[-1].error_msg.startswith("ValueError: ")
+
+
+# end region
+
+# region Statistics Exporter
+
+
+def testStatisticsExporterAggregates() -> None:
+    statistics_exporter: StatisticsExporter = StatisticsExporter(slowest_count=2)
+    for chemical_equation, seconds, error_msg in [
+        ("A", 0.3, ""),
+        ("B", 0.1, "ValueError: "),
+        ("C", 0.2, ""),
+    ]:
+        stage_metrics: StageMetrics = StageMetrics(chemical_equation=chemical_equation)
+        stage_metrics.stage_timings = {"solve": seconds}
+        stage_metrics.count(name="species_count", value=2)
+        stage_metrics.fail(error_msg=error_msg)
+        statistics_exporter(stage_metrics)
+    snapshot: dict = statistics_exporter.snapshot()
+    assert (snapshot["calls"], snapshot["errors"]) == (3, 1)
+    assert snapshot["stage_seconds"]["solve"] == pytest.approx(0.6)
+    assert snapshot["counter_totals"] == {"species_count": 6}
+    assert snapshot["slowest_calls"] == [(0.3, "A"), (0.2, "C")]
+
+
+# end region
@@ -0,0 +1,205 @@
+import random
+import threading
+import pytest
+import CREB
+from benchmarks.Corpus import corpus_dict
+from src import Nullspace
+from src.LinearEquationsSystem import Generator
+from src.Nullspace import ExtremeReactions, IntegerNullspace, ModularNullspace, wordPrimes
+from src.Solver import Solver
+
+
+def nullspaceBasis(
+    matrix, columns_count: int = None, nullspace_class: type = IntegerNullspace
+) -> list[list[int]]:
+    integer_nullspace = nullspace_class(matrix=matrix, columns_count=columns_count)
+    integer_nullspace.reduce()
+    return integer_nullspace.basis()
+
+
+# region Integer Nullspace
+
+
+def testBasisOfUniqueBalance() -> None:
+    # H2 + O2 = H2O
+    assert nullspaceBasis([[2, 0, -2], [0, 2, -1]]) == [[2, 1, 2]]
+
+
+def testBasisOfFullRankMatrixIsEmpty() -> None:
+    assert nullspaceBasis([[1, 0], [0, 1]]) == []
+
+
+def testBasisOfEmptyMatrix() -> None:
+    assert nullspaceBasis([], columns_count=3) == [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+
+def testBasisVectorsAreNullAndPrimitive() -> None:
+    matrix: list[list[int]] = [[6, 4, -2, 0, 8], [3, 0, 5, -7, 1], [9, 4, 3, -7, 9]]
+    basis: list[list[int]] = nullspaceBasis(matrix)
+    assert len(basis) == 3
+    for vector in basis:
+        assert all(
+            sum(value * entry for value, entry in zip(row, vector)) == 0 for row in matrix
+        )
+        assert IntegerNullspace.normalizeVector(vector=vector) == vector
+
+
+@pytest.mark.parametrize(
+    "vector, expected",
+    [([-2, -4, 6], [1, 2, -3]), ([0, 3, 6], [0, 1, 2]), ([0, 0], [0, 0])],
+)
+def testNormalizeVector(vector: list[int], expected: list[int]) -> None:
+    assert IntegerNullspace.normalizeVector(vector=vector) == expected
+
+
+def testNativeSolverCoefficients() -> None:
+    solver_object: Solver = Solver(
+        generator=Generator(chemical_equation="KMnO4 + HCl = KCl + MnCl2 + H2O + Cl2")
+    )
+    solver_object.solve()
+    assert solver_object.integer_coefficients == [2, 16, 2, 2, 8, 5]
+    assert solver_object.nullity == 1
+
+
+def testNativeAndSymbolicSolversAgree() -> None:
+    pytest.importorskip("sympy")
+    for chemical_equation in ("H2 + O2 = H2O", "Cu + HNO3 = Cu(NO3)2 + NO + H2O"):
+        assert (
+            Solver(generator=Generator(chemical_equation=chemical_equation)).solve()
+            == Solver(
+                generator=Generator(chemical_equation=chemical_equation), backend="sympy"
+            ).solve()
+        )
+
+
+# end region
+
+# region Extreme Reactions
+
+
+def testExtremeRaysOfASplitReaction() -> None:
+    # x0 + x1 = x2: either reactant alone makes the product
+    assert ExtremeReactions(matrix=[[1, 1, -1]]).enumerate() == [[0, 1, 1], [1, 0, 1]]
+
+
+@pytest.mark.parametrize(
+    "chemical_equation, status, reactions",
+    [
+        ("H2 + O2 = H2O", "balanced", [[2, 1, 2]]),
+        ("C + O2 = CO + CO2", "ambiguous", [[1, 1, 0, 1], [2, 1, 2, 0]]),
+        ("H2 + O2 + N2 = H2O", "unbalanceable", [[2, 1, 0, 2]]),
+        ("H2 = O2", "unbalanceable", []),
+    ],
+)
+def testEnumerateReactions(chemical_equation: str, status: str, reactions: list) -> None:
+    reaction_basis = CREB.enumerateReactions(chemical_equation)
+    assert reaction_basis.status == status
+    assert reaction_basis.reactions == reactions
+    assert not reaction_basis.truncated
+
+
+def testEnumerationStopsAtMaxReactions() -> None:
+    reaction_basis = CREB.enumerateReactions("C + O2 = CO + CO2", max_reactions=1)
+    assert reaction_basis.truncated
+    assert reaction_basis.status == "ambiguous"
+    assert reaction_basis.reactions == []
+
+
+# end region
+
+# region Modular Nullspace
+
+
+@pytest.mark.parametrize(
+    "chemical_equation",
+    [chemical_equation for equations in corpus_dict.values() for chemical_equation in equations]
+    + ["C + O2 = CO + CO2", "H2 = O2", "H2 + O2 + N2 = H2O", "Fe^3+ + e = Fe^2+"],
+)
+def testModularAndNativeSolversAgree(chemical_equation: str) -> None:
+    equation_solutions: list = [
+        Solver(generator=Generator(chemical_equation=chemical_equation), backend=backend)
+        for backend in ("native", "modular")
+    ]
+    native_solution, modular_solution = (
+        solver_object.execute() for solver_object in equation_solutions
+    )
+    assert modular_solution.integer_coefficients == native_solution.integer_coefficients
+    assert modular_solution.equation_solution == native_solution.equation_solution
+    assert modular_solution.error_msg == native_solution.error_msg
+    assert equation_solutions[0].nullity == equation_solutions[1].nullity
+
+
+def testModularAndNativeBasesAgreeOnRandomMatrices() -> None:
+    random_generator: random.Random = random.Random(2026)
+    for _ in range(40):
+        rows_count: int = random_generator.randint(1, 6)
+        columns_count: int = random_generator.randint(1, 8)
+        matrix: list[list[int]] = [
+            [random_generator.choice((0, 0, 1, -2, 3, 10**12)) for _ in range(columns_count)]
+            for _ in range(rows_count)
+        ]
+        assert nullspaceBasis(matrix, nullspace_class=ModularNullspace) == nullspaceBasis(
+            matrix
+        )
+
+
+def testUnluckyPrimeIsIgnored() -> None:
+    # the first row vanishes modulo the first prime, which then loses rank
+    prime: int = wordPrimes(1)[0]
+    matrix: list[list[int]] = [[prime, 0, -2 * prime], [0, 3, -1]]
+    assert nullspaceBasis(matrix, nullspace_class=ModularNullspace) == nullspaceBasis(
+        matrix
+    ) == [[6, 1, 3]]
+
+
+def testCoefficientsBeyondOnePrime() -> None:
+    # needs several primes to rebuild
+    matrix: list[list[int]] = [[10**40 + 7, -(10**25 + 3)]]
+    assert nullspaceBasis(matrix, nullspace_class=ModularNullspace) == [
+        [10**25 + 3, 10**40 + 7]
+    ]
+
+
+@pytest.mark.parametrize(
+    "numerator, denominator", [(0, 1), (1, 2), (-3, 7), (12345, 677), (-1, 1000)]
+)
+def testRationalReconstruction(numerator: int, denominator: int) -> None:
+    modulus: int = wordPrimes(1)[0] * wordPrimes(2)[1]
+    residue: int = numerator * pow(denominator, -1, modulus) % modulus
+    assert ModularNullspace.rationalReconstruction(residue=residue, modulus=modulus) == (
+        numerator,
+        denominator,
+    )
+
+
+def testRationalReconstructionFailsBeyondTheBound() -> None:
+    # no a/b with |a|, b <= 71 is congruent to 73 modulo 10403
+    modulus: int = 101 * 103
+    residue: int = 73
+    assert ModularNullspace.rationalReconstruction(residue=residue, modulus=modulus) is None
+
+
+def testWordPrimesFromConcurrentThreads(monkeypatch) -> None:
+    monkeypatch.setattr(Nullspace, "word_primes_list", [])
+    results_list: list[list[int]] = []
+    barrier: threading.Barrier = threading.Barrier(8)
+
+    def extend(count: int) -> None:
+        barrier.wait()
+        results_list.append(wordPrimes(count))
+
+    threads_list: list[threading.Thread] = [
+        threading.Thread(target=extend, args=(20 + 5 * index,)) for index in range(8)
+    ]
+    for thread in threads_list:
+        thread.start()
+    for thread in threads_list:
+        thread.join()
+    primes_list: list[int] = Nullspace.word_primes_list
+    assert len(primes_list) == 55
+    assert primes_list == sorted(set(primes_list), reverse=True)
+    assert primes_list[0] == 2**31 - 1
+    assert all(primes == primes_list[: len(primes)] for primes in results_list)
+
+
+# end region
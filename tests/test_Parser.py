@@ -0,0 +1,60 @@
+from collections import Counter
+import pytest
+from src.Parser import ElementCounter, EquationParser
+
+
+# region Element Counter
+
+
+@pytest.mark.parametrize(
+    "chemical_formula, element_counts",
+    [
+        ("H2O", {"H": 2, "O": 1}),
+        ("Ca(OH)2", {"Ca": 1, "O": 2, "H": 2}),
+        ("K4[Fe(CN)6]", {"K": 4, "Fe": 1, "C": 6, "N": 6}),
+        ("(NH4)3PO4", {"N": 3, "H": 12, "P": 1, "O": 4}),
+        ("((CH3)2)3", {"C": 6, "H": 18}),
+        ("Fe^3+", {"Fe": 1, "charge": 3}),
+    ],
+)
+def testGroupsAreMultipliedWithoutExpansion(chemical_formula: str, element_counts: dict) -> None:
+    assert ElementCounter(chemical_formula=chemical_formula).parseFormula() == Counter(
+        element_counts
+    )
+
+
+def testLargeMultipliersStayCheap() -> None:
+    assert ElementCounter(chemical_formula="((C2H4)500)20").parseFormula() == Counter(
+        {"C": 20000, "H": 40000}
+    )
+    assert ElementCounter(chemical_formula="(H2O)1000000000").parseFormula() == Counter(
+        {"H": 2 * 10**9, "O": 10**9}
+    )
+
+
+@pytest.mark.parametrize("chemical_formula", ["Ca(OH2", "CaOH)2", "Qq2"])
+def testMalformedFormulas(chemical_formula: str) -> None:
+    with pytest.raises(ValueError):
+        ElementCounter(chemical_formula=chemical_formula).parseFormula()
+
+
+# end region
+
+# region Equation Parser
+
+
+def testParseSplitsSides() -> None:
+    parsed_reactants, parsed_products = EquationParser(
+        chemical_equation="CH4 + 2 O2 = CO2 + 2 H2O"
+    ).parse()
+    assert parsed_reactants == {
+        "(CH4)": Counter({"C": 1, "H": 4}),
+        "(O2)": Counter({"O": 2}),
+    }
+    assert parsed_products == {
+        "(CO2)": Counter({"C": 1, "O": 2}),
+        "(H2O)": Counter({"H": 2, "O": 1}),
+    }
+
+
+# end region
@@ -0,0 +1,75 @@
+import pytest
+from src.Batch import mapChunks
+from src.LinearEquationsSystem import Generator
+from src.Solver import Solver
+from src.Store import ResultStore
+from utils.Precompute import precomputeEntry, runPrecompute
+
+chemical_equations: list[str] = [
+    "H2 + O2 = H2O",
+    "O2 + H2 = H2O",
+    "C + O2 = CO + CO2",
+    "Xx = H2O",
+    "H2 = O2",
+    "CH4 + O2 = CO2 + H2O",
+]
+
+
+def squareChunk(values: list[int]) -> list[int]:
+    return [value * value for value in values]
+
+
+# region Precompute
+
+
+def testEntryIsAPlainRow() -> None:
+    generator: Generator = Generator(chemical_equation="H2 + O2 = H2O")
+    assert precomputeEntry("H2 + O2 = H2O") == (
+        ResultStore.canonicalEntry(
+            generator=generator, equation_solution=Solver(generator=generator).execute()
+        ),
+        "",
+    )
+
+
+def testSkippedEquationsGiveTheReason() -> None:
+    assert precomputeEntry("C + O2 = CO + CO2") == (None, "The balance is not unique")
+    entry, error_msg = precomputeEntry("Xx = H2O")
+    assert entry is None and error_msg.startswith("ValueError: Unknown element 'Xx'")
+    # an unbalanceable equation is stored with its error
+    entry, error_msg = precomputeEntry("H2 = O2")
+    assert (entry[1:], error_msg) == (("[]", "The chemical equation can not be balanced."), "")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def testStoreIsFilled(tmp_path, capsys, workers: int) -> None:
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text("\n".join(chemical_equations) + "\n")
+    database_path: str = str(tmp_path / "results.sqlite")
+    assert runPrecompute(
+        argv=[str(corpus_path), "--store", database_path, "-w", str(workers), "-c", "2"]
+    ) == 0
+    assert "6 equations, 3 new entries, 2 skipped" in capsys.readouterr().err
+    result_store: ResultStore = ResultStore(database_path=database_path)
+    try:
+        stored_solution = result_store.getByGenerator(
+            Generator(chemical_equation="CH4 + O2 = CO2 + H2O")
+        )
+        assert stored_solution.integer_coefficients == [1, 2, 1, 2]
+    finally:
+        result_store.close()
+
+
+# end region
+
+# region Map Chunks
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def testMapChunksKeepsTheInputOrder(workers: int) -> None:
+    assert list(
+        mapChunks(chunk_function=squareChunk, items=iter(range(50)), workers=workers, chunk_size=3)
+    ) == [value * value for value in range(50)]
+
+
+# end region
@@ -0,0 +1,125 @@
+import json
+import pytest
+import CREB
+from src.Budget import BalanceBudget
+from src.Result import BalanceResult
+
+
+@pytest.fixture(autouse=True)
+def emptyCache():
+    CREB.configureCache(max_size=1024)
+    yield
+    CREB.configureCache(max_size=1024)
+
+
+# region Balance Result
+
+
+@pytest.mark.parametrize(
+    "chemical_equation, status",
+    [
+        ("H2 + O2 = H2O", "balanced"),
+        ("C + O2 = CO + CO2", "ambiguous"),
+        ("H2 = O2", "unbalanceable"),
+        ("H2 + O2 + N2 = H2O", "unbalanceable"),
+        ("Xx = H2", "invalid"),
+    ],
+)
+def testStatus(chemical_equation: str, status: str) -> None:
+    # the second call may come from the cache
+    for _ in range(2):
+        assert CREB.balance(chemical_equation).status == status
+
+
+def testBudgetExceededStatus() -> None:
+    balance_result: BalanceResult = CREB.balance(
+        "CH4 + O2 = CO2 + H2O", budget=BalanceBudget(max_species_count=2)
+    )
+    assert balance_result.status == "budget_exceeded"
+    assert balance_result.error_msg.startswith("Budget exceeded: species_count 3 > 2")
+    assert balance_result.species_list == []
+
+
+@pytest.mark.parametrize(
+    "chemical_equation",
+    [
+        "H2 + O2 = H2O",
+        "O2 + H2 = H2O",
+        "KMnO4 + HCl = KCl + MnCl2 + H2O + Cl2",
+        "CuSO4·5H2O = CuSO4 + H2O",
+    ],
+)
+def testRenderMatchesExecute(chemical_equation: str) -> None:
+    expected: str = CREB.execute(chemical_equation, use_cache=False)
+    assert CREB.balance(chemical_equation, use_cache=False).render() == expected
+    # text and canonical cache hits
+    assert CREB.balance(chemical_equation).render() == expected
+    assert CREB.balance(chemical_equation).render() == expected
+
+
+def testRenderOfAnUnbalancedEquationFails() -> None:
+    balance_result: BalanceResult = CREB.balance("H2 = O2")
+    with pytest.raises(ValueError, match="can not be balanced"):
+        balance_result.render()
+    assert str(balance_result) == balance_result.error_msg
+
+
+@pytest.mark.parametrize(
+    "chemical_equation, status, error_msg",
+    [
+        ("C + O2 = CO + CO2", "ambiguous", "several independent balances"),
+        ("H2O + O2 = H2", "unbalanceable", "every coefficient positive"),
+        ("H2 + O2 + N2 = H2O", "unbalanceable", "every coefficient positive"),
+    ],
+)
+def testExecuteRejectsZeroAndNegativeCoefficients(
+    chemical_equation: str, status: str, error_msg: str
+) -> None:
+    balance_result: BalanceResult = CREB.balance(chemical_equation)
+    assert balance_result.status == status
+    assert balance_result.coefficients
+    # the second call may come from the cache
+    for _ in range(2):
+        with pytest.raises(ValueError, match=error_msg):
+            CREB.execute(chemical_equation)
+    with pytest.raises(ValueError, match=error_msg):
+        balance_result.render()
+    assert error_msg in str(balance_result)
+
+
+def testSerialization() -> None:
+    balance_result: BalanceResult = CREB.balance("H2 + O2 = H2O")
+    assert balance_result.integer_coefficients == (2, 1, 2)
+    assert [balance_result.side(index) for index in range(3)] == [
+        "reactant",
+        "reactant",
+        "product",
+    ]
+    assert balance_result.toTuple() == (
+        "balanced",
+        "",
+        (
+            ("(H2)", "reactant", 2, 1, 1),
+            ("(O2)", "reactant", 1, 1, 2),
+            ("(H2O)", "product", 2, 1, 1),
+        ),
+    )
+    assert json.loads(balance_result.toJson()) == balance_result.toDict()
+    assert balance_result.toDict()["species"][1] == {
+        "formula": "(O2)",
+        "side": "reactant",
+        "coefficient": 1,
+        "rational": [1, 2],
+    }
+
+
+def testInvalidResultSerializes() -> None:
+    assert CREB.balance("Xx = H2").toDict() == {
+        "chemical_equation": "Xx = H2",
+        "status": "invalid",
+        "error_msg": "Unknown element 'Xx' at position 0: Xx = H2",
+        "species": [],
+    }
+
+
+# end region
@@ -0,0 +1,74 @@
+import os
+import pytest
+from fractions import Fraction
+from src.LinearEquationsSystem import Generator
+from src.Solver import EquationSolution, Solver
+from utils.ChemicalEquationRewriter import Rewriter
+from utils.JsonHandler import Handler
+
+# region Rewriter
+
+
+def testRewriterFormat() -> None:
+    assert (
+        Rewriter().executeRewriter(
+            chemical_equation="H2 + O2 = H2O",
+            equation_solution=(Fraction(1), Fraction(1, 2), Fraction(1)),
+        )
+        == "(H2) + 1/2 (O2)  = (H2O) "
+    )
+
+
+def testRewriterWithoutSolutionOrFileFails() -> None:
+    with pytest.raises(ValueError, match="no JSON file"):
+        Rewriter().executeRewriter(chemical_equation="H2 + O2 = H2O")
+
+
+def testHandlerHasNoSharedDefaultFile() -> None:
+    with pytest.raises(TypeError):
+        Handler()
+
+
+def testFileMakersUseTheirOwnFiles() -> None:
+    file_makers: list = [
+        Generator.FileMaker(chemical_equation="H2 + O2 = H2O") for _ in range(2)
+    ]
+    assert file_makers[0].json_file_path != file_makers[1].json_file_path
+    assert file_makers[0].solver_file_path != file_makers[1].solver_file_path
+    for file_maker in file_makers:
+        assert os.path.dirname(file_maker.json_file_path) == file_maker.current_directory
+
+
+def testRewriterLoadsAnExportedSolution(tmp_path) -> None:
+    pytest.importorskip("sympy")
+    json_file_path: str = str(tmp_path / "solution.json")
+    equation_solution: EquationSolution = Solver(
+        generator=Generator(chemical_equation="H2 + O2 = H2O")
+    ).execute()
+    equation_solution.exportJson(file_path=json_file_path)
+    assert (
+        Rewriter(json_file_path=json_file_path).executeRewriter(
+            chemical_equation="H2 + O2 = H2O"
+        )
+        == "(H2) + 1/2 (O2)  = (H2O) "
+    )
+
+
+def testFileMakerRoundTrip() -> None:
+    pytest.importorskip("sympy")
+    file_maker = Generator.FileMaker(chemical_equation="H2 + O2 = H2O")
+    try:
+        file_maker.generateEquationAndSaveSolverFile()
+        file_maker.executeSolverFile()
+        assert not os.path.isfile(file_maker.solver_file_path)
+        assert (
+            Rewriter(json_file_path=file_maker.json_file_path).executeRewriter(
+                chemical_equation="H2 + O2 = H2O"
+            )
+            == "(H2) + 1/2 (O2)  = (H2O) "
+        )
+    finally:
+        Handler(file_path=file_maker.json_file_path, create_if_missing=False).removeJsonDataFile()
+
+
+# end region
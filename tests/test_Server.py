@@ -0,0 +1,131 @@
+import asyncio
+import json
+from functools import partial
+import CREB
+from src.Batch import BatchItemResult
+from utils.Server import BalanceServer
+
+
+async def exchange(balance_server: BalanceServer, requests_list: list) -> list[dict]:
+    host, port = balance_server.address()[:2]
+    reader, writer = await asyncio.open_connection(host=host, port=port)
+    for request in requests_list:
+        line: str = request if isinstance(request, str) else json.dumps(request)
+        writer.write((line + "\n").encode())
+    await writer.drain()
+    responses_list: list[dict] = [
+        json.loads(await reader.readline()) for _ in requests_list
+    ]
+    # the server closes its side once it has seen the end of the requests
+    writer.write_eof()
+    assert await reader.read() == b""
+    writer.close()
+    await writer.wait_closed()
+    return responses_list
+
+
+def runServer(*requests_lists: list, **server_options) -> tuple[list[dict], BalanceServer]:
+    """
+    Sends each list of requests on its own connection, one connection after
+    the other, and returns the responses of every connection.
+    """
+
+    server_options.setdefault(
+        "batch_function", partial(CREB.executeMany, workers=1, deduplicate=True)
+    )
+
+    async def main() -> tuple[list[dict], BalanceServer]:
+        balance_server: BalanceServer = BalanceServer(
+            stats_function=CREB.cacheStats, **server_options
+        )
+        await balance_server.start()
+        try:
+            responses_list: list[dict] = []
+            for requests_list in requests_lists:
+                responses_list += await exchange(balance_server, requests_list)
+            return responses_list, balance_server
+        finally:
+            await balance_server.stop()
+
+    return asyncio.run(main())
+
+
+# region Balance Server
+
+
+def testPipelinedRequestsAnswerInOrder() -> None:
+    chemical_equations: list[str] = ["H2 + O2 = H2O", "Xx = H2O", "CH4 + O2 = CO2 + H2O"]
+    responses_list, balance_server = runServer(
+        [
+            {"op": "balance", "equation": chemical_equation, "id": index}
+            for index, chemical_equation in enumerate(chemical_equations)
+        ]
+    )
+    assert [response["id"] for response in responses_list] == [0, 1, 2]
+    assert responses_list[0]["balanced_equation"] == CREB.execute("H2 + O2 = H2O")
+    assert responses_list[1]["error_msg"].startswith("ValueError: ")
+    assert "index" not in responses_list[0]
+    assert (balance_server.requests, balance_server.errors) == (3, 1)
+
+
+def testRequestsShareMicroBatches() -> None:
+    _, balance_server = runServer(
+        [{"equation": "H2 + O2 = H2O"}] * 20, batch_window=0.05, max_batch_size=64
+    )
+    assert balance_server.requests == 20
+    assert balance_server.batches < 20
+
+
+def testDuplicatesInABatchShareOneSolve() -> None:
+    stats_list: list[dict] = []
+
+    def recordingBatch(chemical_equations: list[str]) -> list[BatchItemResult]:
+        results_list, stats_dict = CREB.executeMany(
+            chemical_equations, workers=1, deduplicate=True, return_stats=True
+        )
+        stats_list.append(stats_dict)
+        return results_list
+
+    chemical_equations: list[str] = ["H2 + O2 = H2O", "O2 + H2 = H2O", "H2 + S2 = H2S"]
+    responses_list, balance_server = runServer(
+        [{"equation": chemical_equation} for chemical_equation in chemical_equations * 4],
+        batch_function=recordingBatch,
+        batch_window=0.05,
+    )
+    assert [response["balanced_equation"] for response in responses_list[:3]] == [
+        CREB.execute(chemical_equation) for chemical_equation in chemical_equations
+    ]
+    # the twelve equations share one composition matrix
+    assert sum(stats_dict["equations"] for stats_dict in stats_list) == 12
+    assert len(stats_list) == balance_server.batches < 12
+    assert all(
+        stats_dict["unique_matrices"] == stats_dict["cache_hits"] + stats_dict["solves"] == 1
+        for stats_dict in stats_list
+    )
+
+
+def testHealthStatsAndBadRequests() -> None:
+    responses_list, _ = runServer(
+        [
+            {"op": "health", "id": "h"},
+            {"op": "balance", "equation": "H2 + O2 = H2O"},
+        ],
+        [
+            {"op": "stats"},
+            {"op": "reverse"},
+            {"op": "balance"},
+            "not json",
+            "[1, 2]",
+        ]
+    )
+    assert responses_list[0]["id"] == "h" and responses_list[0]["status"] == "ok"
+    assert responses_list[2]["requests"] == 1 and "cache" in responses_list[2]
+    assert responses_list[3] == {"error_msg": "Unknown op: 'reverse'"}
+    assert responses_list[4] == {"error_msg": 'A balance request needs an "equation" string'}
+    assert responses_list[5]["error_msg"].startswith("Invalid request: ")
+    assert responses_list[6] == {
+        "error_msg": "Invalid request: A request must be a JSON object"
+    }
+
+
+# end region
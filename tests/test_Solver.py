@@ -0,0 +1,145 @@
+import json
+from collections import Counter
+from fractions import Fraction
+import pytest
+import CREB
+from benchmarks.Corpus import chainEquation
+from src.LinearEquationsSystem import Generator
+from src.Parser import EquationParser
+from src.Solver import EquationSolution, Solver
+from utils.ChemicalEquationRewriter import Rewriter
+
+
+def elementTotals(balanced_result, side: str) -> Counter:
+    element_totals: Counter = Counter()
+    generator: Generator = Generator(chemical_equation=balanced_result.chemical_equation)
+    parsed_species: dict = {**generator.parsed_reactants, **generator.parsed_products}
+    for index, (species, coefficient) in enumerate(
+        zip(balanced_result.species_list, balanced_result.integer_coefficients)
+    ):
+        if balanced_result.side(index) == side:
+            for element, count in parsed_species[species].items():
+                element_totals[element] += coefficient * count
+    return element_totals
+
+
+# region In-Memory Solver
+
+
+def testSolveWritesNoFiles(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    equation_solution: EquationSolution = Solver(
+        generator=Generator(chemical_equation="CH4 + O2 = CO2 + H2O")
+    ).execute()
+    assert equation_solution.integer_coefficients == [1, 2, 1, 2]
+    assert equation_solution.equation_solution == (
+        Fraction(1, 2),
+        Fraction(1),
+        Fraction(1, 2),
+        Fraction(1),
+    )
+    assert CREB.execute("CH4 + O2 = CO2 + H2O", use_cache=False)
+    assert list(tmp_path.iterdir()) == []
+
+
+def testUnbalanceableIsReportedInTheSolution() -> None:
+    equation_solution: EquationSolution = Solver(
+        generator=Generator(chemical_equation="H2 = O2")
+    ).execute()
+    assert equation_solution.error_msg == "The chemical equation can not be balanced."
+    assert equation_solution.equation_solution == ()
+    assert equation_solution.integer_coefficients == []
+
+
+def testUnknownSolverBackend() -> None:
+    with pytest.raises(ValueError, match="numpy"):
+        Solver(generator=Generator(chemical_equation="H2 + O2 = H2O"), backend="numpy")
+
+
+# end region
+
+# region Equation Solution
+
+
+def testSolutionIsHandedToTheRewriterInMemory(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    equation_solution: EquationSolution = Solver(
+        generator=Generator(chemical_equation="H2 + O2 = H2O")
+    ).execute()
+    assert (
+        Rewriter().executeRewriter(
+            chemical_equation="H2 + O2 = H2O",
+            equation_solution=equation_solution.equation_solution,
+        )
+        == "(H2) + 1/2 (O2)  = (H2O) "
+    )
+    assert list(tmp_path.iterdir()) == []
+
+
+def testExportIsOptIn(tmp_path) -> None:
+    json_file_path = tmp_path / "solution.json"
+    CREB.execute("H2 + O2 = H2O", export_file_path=str(json_file_path), use_cache=False)
+    assert json.loads(json_file_path.read_text()) == {
+        "equation_solution": "(1, 1/2, 1)",
+        "error_msg": "",
+    }
+
+
+# end region
+
+# region Shared Parser
+
+
+def testEquationIsParsedOnce(monkeypatch) -> None:
+    parse_calls: list[str] = []
+    original_parse = EquationParser.parse
+
+    def countingParse(equation_parser: EquationParser):
+        parse_calls.append(equation_parser.chemical_equation)
+        return original_parse(equation_parser)
+
+    monkeypatch.setattr(EquationParser, "parse", countingParse)
+    assert CREB.execute("C3H8 + O2 = CO2 + H2O", use_cache=False) == (
+        "1/4 (C3H8) + 5/4 (O2)  = 3/4 (CO2) + (H2O) "
+    )
+    assert parse_calls == ["C3H8 + O2 = CO2 + H2O"]
+
+
+def testGeneratorReusesTheGivenParser() -> None:
+    equation_parser: EquationParser = EquationParser(chemical_equation="H2 + O2 = H2O")
+    equation_parser.parse()
+    generator: Generator = Generator(
+        chemical_equation="H2 + O2 = H2O", equation_parser=equation_parser
+    )
+    assert generator.equation_parser is equation_parser
+
+
+# end region
+
+# region Indexed Unknowns
+
+
+def testUnknownsPastTheAlphabetAreIndexed() -> None:
+    generator: Generator = Generator(chemical_equation=chainEquation(61))
+    generator.assignParameter()
+    assert len(generator.reactants_list) + len(generator.products_list) == 61
+    assert list(generator.reactants_assigned_parameter_dict.values()) == [
+        f"x{index}" for index in range(60)
+    ]
+    assert list(generator.products_assigned_parameter_dict.values()) == ["x60"]
+    assert any("x59" in equation for equation in generator.generateLinearEquationsSystem())
+
+
+def testSixtySpeciesRoundTrip() -> None:
+    chemical_equation: str = chainEquation(61)
+    balanced_equation: str = CREB.execute(chemical_equation, use_cache=False)
+    assert balanced_equation.count(" + ") == 59
+    balance_result = CREB.balance(chemical_equation, use_cache=False)
+    assert balance_result.status == "balanced"
+    assert balance_result.render() == balanced_equation
+    assert elementTotals(balance_result, "reactant") == elementTotals(
+        balance_result, "product"
+    )
+
+
+# end region
@@ -0,0 +1,67 @@
+from collections import Counter
+from src.LinearEquationsSystem import Generator
+from src.Nullspace import IntegerNullspace
+from src.Solver import Solver
+from src.SparseMatrix import CompositionMatrix
+
+# region Composition Matrix
+
+
+def testRowsFollowTheElementsList() -> None:
+    composition_matrix: CompositionMatrix = CompositionMatrix.fromCompositions(
+        reactant_compositions=[{"O": 2}, {"H": 2}],
+        product_compositions=[{"H": 2, "O": 1}],
+    )
+    assert composition_matrix.elements_list == ["H", "O"]
+    assert composition_matrix.toDense() == [[0, 2, -2], [2, 0, -1]]
+    assert composition_matrix.sparseRows() == [{1: 2, 2: -2}, {0: 2, 2: -1}]
+    assert composition_matrix.nonzerosCount() == 4
+
+
+def testUnknownSymbolsComeAfterTheElementsList() -> None:
+    composition_matrix: CompositionMatrix = CompositionMatrix.fromCompositions(
+        reactant_compositions=[Counter({"Fe": 1, "charge": 3}), {"e": 1, "charge": -1}],
+        product_compositions=[{"Fe": 1, "charge": 2}],
+    )
+    assert composition_matrix.elements_list == ["Fe", "charge", "e"]
+    assert composition_matrix.toDense() == [[1, 0, -1], [3, -1, -2], [0, 1, 0]]
+
+
+def testZeroCountsAreNotStored() -> None:
+    composition_matrix: CompositionMatrix = CompositionMatrix.fromCompositions(
+        reactant_compositions=[{"H": 2, "O": 0}], product_compositions=[{"H": 1}]
+    )
+    assert composition_matrix.nonzerosCount() == 2
+    assert composition_matrix.elements_list == ["H"]
+
+
+def testMultiplyIsZeroForABalance() -> None:
+    composition_matrix: CompositionMatrix = CompositionMatrix.fromCompositions(
+        reactant_compositions=[{"C": 1, "H": 4}, {"O": 2}],
+        product_compositions=[{"C": 1, "O": 2}, {"H": 2, "O": 1}],
+    )
+    assert composition_matrix.multiply([1, 2, 1, 2]) == [0, 0, 0]
+    assert composition_matrix.multiply([1, 1, 1, 1]) == [2, 0, -1]
+
+
+def testSparseAndDenseMatricesHaveTheSameNullspace() -> None:
+    for chemical_equation in (
+        "KMnO4 + HCl = KCl + MnCl2 + H2O + Cl2",
+        "Ca5(PO4)3(OH) + H3PO4 = Ca(H2PO4)2 + H2O",
+        " + ".join(f"C{n}H{2 * n + 2}" for n in range(1, 4)) + " + O2 = CO2 + H2O",
+    ):
+        solver_object: Solver = Solver(
+            generator=Generator(chemical_equation=chemical_equation)
+        )
+        basis_list: list[list[list[int]]] = []
+        for matrix in (
+            solver_object.buildSparseCompositionMatrix(),
+            solver_object.buildCompositionMatrix(),
+        ):
+            integer_nullspace: IntegerNullspace = IntegerNullspace(matrix=matrix)
+            integer_nullspace.reduce()
+            basis_list.append(integer_nullspace.basis())
+        assert basis_list[0] == basis_list[1]
+
+
+# end region
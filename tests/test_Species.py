@@ -0,0 +1,50 @@
+from src.Species import SpeciesTable, elementId, extra_elements_list
+from utils import Assets
+
+# region Species Table
+
+
+def testElementIds() -> None:
+    assert elementId("H") == 0
+    assert elementId("O") == Assets.elements_list.index("O")
+    charge_id: int = elementId("charge")
+    assert charge_id >= len(Assets.elements_list)
+    assert extra_elements_list[charge_id - len(Assets.elements_list)] == "charge"
+    assert elementId("charge") == charge_id
+
+
+def testSpeciesAreStoredOnce() -> None:
+    species_table: SpeciesTable = SpeciesTable()
+    assert species_table.add(formula="(H2O)", element_counts={"O": 1, "H": 2}) == 0
+    assert species_table.add(formula="(O2)", element_counts={"O": 2, "N": 0}) == 1
+    assert species_table.add(formula="(H2O)", element_counts={"H": 2, "O": 1}) == 0
+    assert len(species_table) == 2
+    assert list(species_table.pairs(0)) == [(elementId("H"), 2), (elementId("O"), 1)]
+    assert list(species_table.pairs(1)) == [(elementId("O"), 2)]
+
+
+def testHugeCountsStayExact() -> None:
+    species_table: SpeciesTable = SpeciesTable()
+    species_table.add(formula="(H2)", element_counts={"H": 2})
+    species_table.add(formula="(C)", element_counts={"C": 10**30})
+    assert list(species_table.pairs(0)) == [(elementId("H"), 2)]
+    assert list(species_table.pairs(1)) == [(elementId("C"), 10**30)]
+
+
+def testCompositionMatrixOfAReaction() -> None:
+    species_table: SpeciesTable = SpeciesTable()
+    for formula, element_counts in (
+        ("(H2)", {"H": 2}),
+        ("(N2)", {"N": 2}),
+        ("(O2)", {"O": 2}),
+        ("(H2O)", {"H": 2, "O": 1}),
+    ):
+        species_table.add(formula=formula, element_counts=element_counts)
+    composition_matrix = species_table.compositionMatrix(
+        reactant_indices=[0, 2], product_indices=[3]
+    )
+    assert composition_matrix.elements_list == ["H", "O"]
+    assert composition_matrix.toDense() == [[2, 0, -2], [0, 2, -1]]
+
+
+# end region
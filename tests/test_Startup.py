@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+from utils import Startup
+
+
+# region Cold Start
+
+
+def testColdStartDoesNotImportSympy() -> None:
+    startup_report: dict = Startup.measureStartupTime(repeat=1)
+    assert startup_report["sympy_imported"] is False
+    assert startup_report["target"] == Startup.startup_time_target
+
+
+def testCommandLineDoesNotImportSympyOrMultiprocessing() -> None:
+    completed_process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, CREB; from utils import CommandLine; "
+            "print(sorted({'sympy', 'multiprocessing'} & set(sys.modules)))",
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(Startup.__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert completed_process.stdout.strip() == "[]"
+
+
+# end region
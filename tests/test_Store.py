@@ -0,0 +1,92 @@
+import sqlite3
+import threading
+import pytest
+import CREB
+from src.LinearEquationsSystem import Generator
+from src.Solver import EquationSolution, Solver
+from src.Store import ResultStore
+
+
+@pytest.fixture
+def result_store(tmp_path):
+    result_store: ResultStore = ResultStore(database_path=str(tmp_path / "results.sqlite"))
+    yield result_store
+    result_store.close()
+
+
+def storeSolution(result_store: ResultStore, chemical_equation: str) -> EquationSolution:
+    generator_object: Generator = Generator(chemical_equation=chemical_equation)
+    equation_solution: EquationSolution = Solver(generator=generator_object).execute()
+    result_store.put(generator=generator_object, equation_solution=equation_solution)
+    return equation_solution
+
+
+# region Result Store
+
+
+def testPermutedEquationHitsTheStore(result_store: ResultStore) -> None:
+    storeSolution(result_store, "CH4 + O2 = CO2 + H2O")
+    generator_object: Generator = Generator(chemical_equation="O2 + CH4 = H2O + CO2")
+    stored_solution: EquationSolution = result_store.getByGenerator(generator_object)
+    assert stored_solution.integer_coefficients == [2, 1, 2, 1]
+    assert stored_solution.integer_coefficients == (
+        Solver(generator=generator_object).execute().integer_coefficients
+    )
+    assert result_store.getByGenerator(Generator(chemical_equation="H2 + O2 = H2O")) is None
+    assert result_store.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def testResultsPersistAcrossStores(result_store: ResultStore) -> None:
+    storeSolution(result_store, "H2 + O2 = H2O")
+    storeSolution(result_store, "H2 + O2 = H2O")
+    other_store: ResultStore = ResultStore(database_path=result_store.database_path)
+    try:
+        assert other_store.stats()["entries"] == 1
+        assert other_store.getByGenerator(
+            Generator(chemical_equation="O2 + H2 = H2O")
+        ).integer_coefficients == [1, 2, 2]
+    finally:
+        other_store.close()
+
+
+def testCloseClosesTheConnectionsOfEveryThread(result_store: ResultStore) -> None:
+    storeSolution(result_store, "H2 + O2 = H2O")
+    connections_list: list[sqlite3.Connection] = []
+
+    def lookUp() -> None:
+        result_store.getByGenerator(Generator(chemical_equation="H2 + O2 = H2O"))
+        connections_list.append(result_store.connection())
+
+    threads_list: list[threading.Thread] = [threading.Thread(target=lookUp) for _ in range(4)]
+    for thread in threads_list:
+        thread.start()
+    for thread in threads_list:
+        thread.join()
+    connections_list.append(result_store.connection())
+    assert len(set(map(id, connections_list))) == 5
+
+    result_store.close()
+    for connection in connections_list:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+    # a later call opens a new connection
+    assert result_store.stats()["entries"] == 1
+
+
+def testExecuteReadsTheConfiguredStore(tmp_path) -> None:
+    CREB.configureCache(max_size=1024)
+    CREB.configureStore(database_path=str(tmp_path / "results.sqlite"))
+    try:
+        expected: str = CREB.execute("CH4 + O2 = CO2 + H2O")
+        CREB.configureCache(max_size=1024)
+        assert CREB.execute("O2 + CH4 = H2O + CO2") == CREB.execute(
+            "O2 + CH4 = H2O + CO2", use_cache=False
+        )
+        assert CREB.result_store.stats()["hits"] == 1
+        assert expected == "1/2 (CH4) + (O2)  = 1/2 (CO2) + (H2O) "
+    finally:
+        CREB.configureStore(database_path=None)
+        CREB.configureCache(max_size=1024)
+
+
+# end region
@@ -124,3 +124,6 @@ number_list: list[str] = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9"]
 
 parameter_symbols: str = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
 """str: A string containing lowercase and uppercase alphabetic characters used as parameter symbols."""
+
+element_ids: dict[str, int] = {element: index for index, element in enumerate(elements_list)}
+"""dict[str, int]: The position of each element symbol in elements_list, used as its integer id."""
@@ -1,5 +1,4 @@
 import os
-from sympy import sympify
 from src.Parser import EquationParser
 from utils.JsonHandler import Handler
 
@@ -11,6 +10,9 @@ class Rewriter:
     Attributes:
         parent_folder_directory : str
             The directory of the parent folder.
+        json_file_path : str
+            The JSON file a solution is loaded from when none is given, None
+            when the solution is always passed in.
         equation_solution : tuple
             The solution of the equation.
         chemical_formulas_dict : dict
@@ -27,19 +29,29 @@ class Rewriter:
     Methods:
         loadEquationSolutionInformation() -> None:
             Loads the equation solution information from a JSON file.
-        loadChemicalFormulasDictionary(chemical_equation: str) -> None:
+        loadChemicalFormulasDictionary(chemical_equation: str, equation_parser: EquationParser = None) -> None:
             Loads the chemical formulas dictionary from the given chemical equation.
         assignCoefficientsToChemicalFormulas() -> None:
             Assigns coefficients to the chemical formulas.
-        executeRewriter(chemical_equation: str) -> str:
+        executeRewriter(chemical_equation: str, equation_solution: tuple = None, equation_parser: EquationParser = None) -> str:
             Executes the rewriter and returns the balanced chemical equation.
+        assignCoefficient(chemical_formula: str, coefficient) -> str:
+            Writes a chemical formula with its coefficient.
+        joinSides(assigned_reactants_list: list[str], assigned_products_list: list[str]) -> str:
+            Joins the written reactants and products into the balanced equation.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, json_file_path: str = None) -> None:
         """
         Constructs all the necessary attributes for the Rewriter object.
+
+        Parameters:
+            json_file_path : str
+                The JSON file a solution is loaded from when none is given,
+                e.g. the json_file_path of a Generator.FileMaker.
         """
         self.parent_folder_directory: str = os.path.dirname(__file__)
+        self.json_file_path: str = json_file_path
         self.equation_solution: tuple = ()
         self.chemical_formulas_dict = {}
         self.reactants_list: list[str] = []
@@ -51,27 +63,38 @@ class Rewriter:
 
     def loadEquationSolutionInformation(self) -> None:
         """
-        Loads the equation solution information from a JSON file (data.json).
+        Loads the equation solution information from the JSON file given to
+        the Rewriter; there is no shared default file.
         """
-        json_handler_object = Handler()
+        if self.json_file_path is None:
+            raise ValueError("No equation solution given and no JSON file to load it from")
+        from sympy import sympify
+
+        json_handler_object = Handler(file_path=self.json_file_path, create_if_missing=False)
         json_handler_object.read()
         self.equation_solution: tuple = sympify(
             json_handler_object.content["equation_solution"]
         )
 
-    def loadChemicalFormulasDictionary(self, chemical_equation: str):
+    def loadChemicalFormulasDictionary(
+        self, chemical_equation: str, equation_parser: EquationParser = None
+    ):
         """
         Loads the chemical formulas dictionary from the given chemical equation.
 
         Parameters:
             chemical_equation : str
                 The chemical equation to be parsed.
+            equation_parser : EquationParser
+                An already parsed equation; when given, the equation is not
+                split again.
         """
 
-        equation_parser_object: object = EquationParser(
-            chemical_equation=chemical_equation
-        )
-        equation_parser_object.parse()
+        equation_parser_object: EquationParser = equation_parser
+        if equation_parser_object is None:
+            # only the species are needed here, not their element counts
+            equation_parser_object = EquationParser(chemical_equation=chemical_equation)
+            equation_parser_object.splitIntoChemicalSpecies()
 
         for reactant in equation_parser_object.reactants_list:
             self.chemical_formulas_dict[reactant] = 0
@@ -93,46 +116,103 @@ class Rewriter:
             ]
 
         for reactant in self.reactants_list:
-            if self.chemical_formulas_dict[reactant] == 1:
-                self.assigned_reactants_list.append(reactant)
-            else:
-                self.assigned_reactants_list.append(
-                    f"{self.chemical_formulas_dict[reactant]} {reactant}"
+            self.assigned_reactants_list.append(
+                self.assignCoefficient(
+                    chemical_formula=reactant,
+                    coefficient=self.chemical_formulas_dict[reactant],
                 )
+            )
 
         for product in self.products_list:
-            if self.chemical_formulas_dict[product] == 1:
-                self.assigned_products_list.append(product)
-            else:
-                self.assigned_products_list.append(
-                    f"{self.chemical_formulas_dict[product]} {product}"
+            self.assigned_products_list.append(
+                self.assignCoefficient(
+                    chemical_formula=product,
+                    coefficient=self.chemical_formulas_dict[product],
                 )
+            )
 
-    def executeRewriter(self, chemical_equation: str) -> str:
+    @staticmethod
+    def assignCoefficient(chemical_formula: str, coefficient) -> str:
         """
-        Executes the rewriter and returns the balanced chemical equation.
+        Writes a chemical formula with its coefficient, which is left out when
+        it is 1.
 
         Parameters:
-            chemical_equation : str
-                The chemical equation to be balanced.
+            chemical_formula : str
+                The chemical formula, e.g. "(O2)".
+            coefficient
+                Its coefficient, e.g. Fraction(1, 2).
 
         Returns:
-            str: The balanced chemical equation.
+            str: The written species, e.g. "1/2 (O2)".
         """
-        self.loadEquationSolutionInformation()
-        self.loadChemicalFormulasDictionary(chemical_equation=chemical_equation)
-        self.assignCoefficientsToChemicalFormulas()
+        if coefficient == 1:
+            return chemical_formula
+        return f"{coefficient} {chemical_formula}"
+
+    @staticmethod
+    def joinSides(
+        assigned_reactants_list: list[str], assigned_products_list: list[str]
+    ) -> str:
+        """
+        Joins the written reactants and products into the balanced equation,
+        e.g. "(H2) + 1/2 (O2)  = (H2O) ". Every balanced string is built here,
+        so all of them share one format.
+
+        Parameters:
+            assigned_reactants_list : list[str]
+                The reactants with their coefficients.
+            assigned_products_list : list[str]
+                The products with their coefficients.
 
+        Returns:
+            str: The balanced chemical equation.
+        """
         reactants_string: str = ""
         products_string: str = ""
 
-        for reactant in self.assigned_reactants_list:
+        for reactant in assigned_reactants_list:
             reactants_string += f"{reactant} + "
 
-        for product in self.assigned_products_list:
+        for product in assigned_products_list:
             products_string += f"{product} + "
 
         reactants_string = reactants_string[:-2]
         products_string = products_string[:-2]
 
         return f"{reactants_string} = {products_string}"
+
+    def executeRewriter(
+        self,
+        chemical_equation: str,
+        equation_solution: tuple = None,
+        equation_parser: EquationParser = None,
+    ) -> str:
+        """
+        Executes the rewriter and returns the balanced chemical equation.
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation to be balanced.
+            equation_solution : tuple
+                The solution of the equation. If it is not given, it is loaded
+                from json_file_path.
+            equation_parser : EquationParser
+                An already parsed equation, shared with the Generator.
+
+        Returns:
+            str: The balanced chemical equation.
+        """
+        if equation_solution is None:
+            self.loadEquationSolutionInformation()
+        else:
+            self.equation_solution = equation_solution
+        self.loadChemicalFormulasDictionary(
+            chemical_equation=chemical_equation, equation_parser=equation_parser
+        )
+        self.assignCoefficientsToChemicalFormulas()
+
+        return self.joinSides(
+            assigned_reactants_list=self.assigned_reactants_list,
+            assigned_products_list=self.assigned_products_list,
+        )
@@ -0,0 +1,129 @@
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable, Iterator
+from src.Batch import BatchBalancer
+from src.Dedup import DeduplicatingBalancer
+
+
+def readEquations(file_paths: list[str]) -> Iterator[str]:
+    """
+    Reads chemical equations line by line, skipping blank lines, so the input
+    is never loaded into memory at once.
+
+    Parameters:
+        file_paths : list[str]
+            Files to read in order; "-" (or no file at all) means stdin.
+
+    Yields:
+        str: One chemical equation per line.
+    """
+    for file_path in file_paths or ["-"]:
+        file = sys.stdin if file_path == "-" else open(file_path, "r")
+        try:
+            for line in file:
+                if line.strip():
+                    yield line.strip()
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+
+def buildArgumentParser() -> argparse.ArgumentParser:
+    """
+    Builds the parser of the command-line arguments.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser.
+    """
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="CREB",
+        description="Balance chemical equations read line by line and write one JSON result per line.",
+    )
+    argument_parser.add_argument(
+        "files", nargs="*", help='input files, one equation per line ("-" or none for stdin)'
+    )
+    argument_parser.add_argument(
+        "-o", "--output", default="-", help='output file ("-" for stdout, the default)'
+    )
+    argument_parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="worker processes (default: 1)"
+    )
+    argument_parser.add_argument(
+        "-c", "--chunk-size", type=int, default=256, help="equations per chunk (default: 256)"
+    )
+    argument_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="do not report the throughput on stderr"
+    )
+    argument_parser.add_argument(
+        "-d",
+        "--dedup",
+        action="store_true",
+        help="solve equations sharing a composition matrix once (reported as the dedup ratio)",
+    )
+    return argument_parser
+
+
+def runCommandLine(argv: list[str], balance_function: Callable[[str], str]) -> int:
+    """
+    Streams equations from the input files (or stdin) through the balancer and
+    writes one JSON result per line as each chunk completes, then reports the
+    throughput on stderr. With --dedup, equations are grouped by composition
+    matrix and balanced by a DeduplicatingBalancer instead of balance_function.
+
+    Parameters:
+        argv : list[str]
+            The command-line arguments, without the program name.
+        balance_function : Callable[[str], str]
+            The function balancing a single equation (CREB.execute).
+
+    Returns:
+        int: The exit status, 1 when at least one equation failed.
+    """
+    arguments: argparse.Namespace = buildArgumentParser().parse_args(argv)
+    if arguments.dedup:
+        batch_balancer: "BatchBalancer | DeduplicatingBalancer" = DeduplicatingBalancer(
+            workers=arguments.workers, chunk_size=arguments.chunk_size
+        )
+    else:
+        batch_balancer = BatchBalancer(
+            balance_function=balance_function,
+            workers=arguments.workers,
+            chunk_size=arguments.chunk_size,
+        )
+
+    output_file = (
+        sys.stdout if arguments.output == "-" else open(arguments.output, "w")
+    )
+    equations_count: int = 0
+    errors_count: int = 0
+    start_time: float = time.perf_counter()
+    try:
+        for batch_item_result in batch_balancer.iterate(
+            chemical_equations=readEquations(file_paths=arguments.files)
+        ):
+            output_file.write(json.dumps(batch_item_result.toDict()) + "\n")
+            equations_count += 1
+            if batch_item_result.error_msg:
+                errors_count += 1
+            if equations_count % arguments.chunk_size == 0:
+                output_file.flush()
+    finally:
+        output_file.flush()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    elapsed_time: float = time.perf_counter() - start_time
+    if not arguments.quiet:
+        print(
+            f"{equations_count} equations ({errors_count} errors) in {elapsed_time:.3f} s, "
+            f"{equations_count / elapsed_time if elapsed_time else 0.0:.1f} equations/s"
+            + (
+                f", dedup ratio {batch_balancer.stats()['dedup_ratio']}"
+                if arguments.dedup
+                else ""
+            ),
+            file=sys.stderr,
+        )
+    return 1 if errors_count else 0
@@ -13,7 +13,7 @@ class Handler:
             The path to the JSON file.
 
     Methods:
-        write(content: dict = {"equation_solution": "", "error_msg": ""}) -> None:
+        write(content: dict = None) -> None:
             Writes the given content to the JSON file.
         read() -> None:
             Reads the content from the JSON file.
@@ -23,23 +23,33 @@ class Handler:
             Removes the JSON data file if it exists.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, file_path: str, create_if_missing: bool = True) -> None:
         """
         Constructs all the necessary attributes for the Handler object.
+
+        Parameters:
+            file_path : str
+                The path to the JSON file; there is no shared default, so that
+                concurrent balances never write to the same file.
+            create_if_missing : bool
+                Whether to write the default content when the file does not exist.
         """
         self.content = {"equation_solution": "", "error_msg": ""}
-        self.file_path: str = rf"src\data.json"
-        if not os.path.isfile(self.file_path):
+        self.file_path: str = file_path
+        if create_if_missing and not os.path.isfile(self.file_path):
             self.write(content=self.content)
 
-    def write(self, content: dict = {"equation_solution": "", "error_msg": ""}) -> None:
+    def write(self, content: dict = None) -> None:
         """
         Writes the given content to the JSON file.
 
         Parameters:
             content : dict
-                The content to be written to the JSON file.
+                The content to be written to the JSON file, an empty solution
+                when not given.
         """
+        if content is None:
+            content = {"equation_solution": "", "error_msg": ""}
         with open(self.file_path, "w") as file:
             json.dump(content, file)
 
@@ -0,0 +1,297 @@
+import heapq
+import threading
+import time
+from collections.abc import Callable
+
+# region Stage Metrics
+
+
+class StageMetrics:
+    """
+    A class to record the stage timings and counters of one balance call.
+
+    Attributes:
+        chemical_equation : str
+            The chemical equation being balanced.
+        stage_timings : dict[str, float]
+            Seconds spent in each stage, in the order the stages ran.
+        counters : dict[str, int]
+            Counters such as species_count, element_count, matrix_rank or
+            cache_hit.
+        error_msg : str
+            The error message, empty when balancing succeeded.
+
+    Methods:
+        mark(stage: str) -> None:
+            Charges the time since the previous mark to the given stage.
+        count(name: str, value: int) -> None:
+            Sets a counter.
+        fail(error_msg: str) -> None:
+            Records the error that ended the call.
+        totalTime() -> float:
+            Returns the seconds spent in all stages.
+    """
+
+    def __init__(self, chemical_equation: str) -> None:
+        """
+        Constructs all the necessary attributes for the StageMetrics object.
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation being balanced.
+        """
+        self.chemical_equation: str = chemical_equation
+        self.stage_timings: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self.error_msg: str = ""
+        self.last_time: float = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """
+        Charges the time since the previous mark (or the creation) to a stage.
+
+        Parameters:
+            stage : str
+                The name of the stage that just ended.
+        """
+        current_time: float = time.perf_counter()
+        self.stage_timings[stage] = (
+            self.stage_timings.get(stage, 0.0) + current_time - self.last_time
+        )
+        self.last_time = current_time
+
+    def count(self, name: str, value: int) -> None:
+        """
+        Sets a counter.
+
+        Parameters:
+            name : str
+                The name of the counter.
+            value : int
+                Its value.
+        """
+        self.counters[name] = value
+
+    def fail(self, error_msg: str) -> None:
+        """
+        Records the error that ended the call.
+
+        Parameters:
+            error_msg : str
+                The error message.
+        """
+        self.error_msg = error_msg
+
+    def totalTime(self) -> float:
+        """
+        Returns the seconds spent in all stages.
+
+        Returns:
+            float: The total time.
+        """
+        return sum(self.stage_timings.values())
+
+
+class DisabledStageMetrics(StageMetrics):
+    """
+    A StageMetrics that records nothing, handed out while the instrumentation
+    is off so the pipeline can mark stages without checking first.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(chemical_equation="")
+
+    def mark(self, stage: str) -> None:
+        pass
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+    def fail(self, error_msg: str) -> None:
+        pass
+
+
+disabled_stage_metrics: DisabledStageMetrics = DisabledStageMetrics()
+"""DisabledStageMetrics: The shared no-op metrics returned while the instrumentation is off."""
+
+# end region
+
+# region Instrumentation
+
+
+class Instrumentation:
+    """
+    A class to hand the metrics of every balance call to registered exporters.
+
+    Instrumentation is off until an exporter is added: while it is off,
+    start() returns a shared no-op StageMetrics, so no clock is read and
+    nothing is allocated per call.
+
+    Attributes:
+        enabled : bool
+            Whether metrics are recorded.
+        exporters_list : list[Callable[[StageMetrics], None]]
+            The callbacks receiving the metrics of each call.
+
+    Methods:
+        addExporter(exporter: Callable[[StageMetrics], None]) -> None:
+            Registers an exporter and enables the instrumentation.
+        removeExporter(exporter: Callable[[StageMetrics], None]) -> None:
+            Unregisters an exporter, disabling the instrumentation with the last one.
+        start(chemical_equation: str) -> StageMetrics:
+            Returns a new StageMetrics, or the no-op one when disabled.
+        finish(stage_metrics: StageMetrics) -> None:
+            Hands the metrics of a finished call to every exporter.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructs all the necessary attributes for the Instrumentation object.
+        """
+        self.enabled: bool = False
+        self.exporters_list: list[Callable[[StageMetrics], None]] = []
+        self.lock: threading.Lock = threading.Lock()
+
+    def addExporter(self, exporter: Callable[[StageMetrics], None]) -> None:
+        """
+        Registers an exporter and enables the instrumentation.
+
+        Parameters:
+            exporter : Callable[[StageMetrics], None]
+                Called with the StageMetrics of every balance call.
+        """
+        with self.lock:
+            self.exporters_list = self.exporters_list + [exporter]
+            self.enabled = True
+
+    def removeExporter(self, exporter: Callable[[StageMetrics], None]) -> None:
+        """
+        Unregisters an exporter; the instrumentation is disabled when no
+        exporter is left.
+
+        Parameters:
+            exporter : Callable[[StageMetrics], None]
+                A previously registered exporter.
+        """
+        with self.lock:
+            self.exporters_list = [
+                registered for registered in self.exporters_list if registered != exporter
+            ]
+            self.enabled = bool(self.exporters_list)
+
+    def start(self, chemical_equation: str) -> StageMetrics:
+        """
+        Returns a new StageMetrics, or the shared no-op one when the
+        instrumentation is off.
+
+        Parameters:
+            chemical_equation : str
+                The chemical equation being balanced.
+
+        Returns:
+            StageMetrics: The metrics of the call.
+        """
+        if not self.enabled:
+            return disabled_stage_metrics
+        return StageMetrics(chemical_equation=chemical_equation)
+
+    def finish(self, stage_metrics: StageMetrics) -> None:
+        """
+        Hands the metrics of a finished call to every exporter.
+
+        Parameters:
+            stage_metrics : StageMetrics
+                The metrics of the call.
+        """
+        if stage_metrics is disabled_stage_metrics:
+            return
+        # the list is replaced, never mutated, so it can be read without the lock
+        for exporter in self.exporters_list:
+            exporter(stage_metrics)
+
+
+# end region
+
+# region Statistics Exporter
+
+
+class StatisticsExporter:
+    """
+    An exporter aggregating call counts, per-stage time and the slowest inputs.
+
+    Attributes:
+        slowest_count : int
+            Number of slowest calls kept to spot outlier inputs.
+        calls : int
+            Number of recorded calls.
+        errors : int
+            Number of calls that failed.
+        stage_seconds : dict[str, float]
+            Total seconds spent in each stage.
+        counter_totals : dict[str, int]
+            Sum of each counter over all calls.
+        slowest_calls : list[tuple[float, str]]
+            Heap of the slowest calls as (seconds, chemical equation).
+
+    Methods:
+        snapshot() -> dict:
+            Returns the aggregated statistics.
+    """
+
+    def __init__(self, slowest_count: int = 10) -> None:
+        """
+        Constructs all the necessary attributes for the StatisticsExporter object.
+
+        Parameters:
+            slowest_count : int
+                Number of slowest calls kept to spot outlier inputs.
+        """
+        self.slowest_count: int = slowest_count
+        self.calls: int = 0
+        self.errors: int = 0
+        self.stage_seconds: dict[str, float] = {}
+        self.counter_totals: dict[str, int] = {}
+        self.slowest_calls: list[tuple[float, str]] = []
+        self.lock: threading.Lock = threading.Lock()
+
+    def __call__(self, stage_metrics: StageMetrics) -> None:
+        total_time: float = stage_metrics.totalTime()
+        with self.lock:
+            self.calls += 1
+            if stage_metrics.error_msg:
+                self.errors += 1
+            for stage, seconds in stage_metrics.stage_timings.items():
+                self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+            for name, value in stage_metrics.counters.items():
+                self.counter_totals[name] = self.counter_totals.get(name, 0) + value
+            if len(self.slowest_calls) < self.slowest_count:
+                heapq.heappush(
+                    self.slowest_calls, (total_time, stage_metrics.chemical_equation)
+                )
+            elif self.slowest_calls and total_time > self.slowest_calls[0][0]:
+                heapq.heapreplace(
+                    self.slowest_calls, (total_time, stage_metrics.chemical_equation)
+                )
+
+    def snapshot(self) -> dict:
+        """
+        Returns the aggregated statistics.
+
+        Returns:
+            dict: Calls, errors, per-stage seconds, counter totals and the
+            slowest calls (slowest first).
+        """
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "stage_seconds": dict(self.stage_seconds),
+                "counter_totals": dict(self.counter_totals),
+                "slowest_calls": sorted(self.slowest_calls, reverse=True),
+            }
+
+
+# end region
+
+instrumentation: Instrumentation = Instrumentation()
+"""Instrumentation: The instrumentation of the balance pipeline, shared by the whole process."""
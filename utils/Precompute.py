@@ -0,0 +1,106 @@
+import argparse
+import sys
+import time
+from src.Batch import mapChunks
+from src.LinearEquationsSystem import Generator
+from src.Solver import Solver
+from src.Store import ResultStore
+from utils.CommandLine import readEquations
+
+
+def precomputeEntry(chemical_equation: str) -> tuple[tuple[str, str, str], str]:
+    """
+    Solves one equation and returns its result store row, or the reason it
+    is skipped: invalid equations and ambiguous balances, which depend on the
+    species order, are not stored.
+
+    Parameters:
+        chemical_equation : str
+            The chemical equation to be balanced.
+
+    Returns:
+        tuple[tuple[str, str, str], str]: The row (canonical key, coefficients,
+        error message) and "", or None and the reason it is skipped.
+    """
+    try:
+        generator: Generator = Generator(chemical_equation=chemical_equation)
+        solver: Solver = Solver(generator=generator)
+        equation_solution = solver.execute()
+    except Exception as error:
+        return None, f"{type(error).__name__}: {error}"
+    if solver.nullity > 1:
+        return None, "The balance is not unique"
+    return (
+        ResultStore.canonicalEntry(generator=generator, equation_solution=equation_solution),
+        "",
+    )
+
+
+def precomputeChunk(chemical_equations: list[str]) -> list[tuple[tuple[str, str, str], str]]:
+    """
+    Runs precomputeEntry over a chunk of equations in one worker call.
+    """
+    return [precomputeEntry(chemical_equation) for chemical_equation in chemical_equations]
+
+
+def runPrecompute(argv: list[str]) -> int:
+    """
+    Balances a corpus (one equation per line) with worker processes and
+    writes every unique result into a result store, one transaction per chunk.
+
+    Parameters:
+        argv : list[str]
+            The command-line arguments, without the program name.
+
+    Returns:
+        int: The exit status, 0 even when some equations were skipped.
+    """
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="CREB precompute",
+        description="Balance a corpus into a persistent CREB result store.",
+    )
+    argument_parser.add_argument(
+        "files", nargs="*", help='input files, one equation per line ("-" or none for stdin)'
+    )
+    argument_parser.add_argument("-s", "--store", required=True, help="the SQLite store file")
+    argument_parser.add_argument("-w", "--workers", type=int, default=1)
+    argument_parser.add_argument("-c", "--chunk-size", type=int, default=256)
+    arguments: argparse.Namespace = argument_parser.parse_args(argv)
+
+    result_store: ResultStore = ResultStore(database_path=arguments.store)
+    equations_count: int = 0
+    skipped_count: int = 0
+    added_count: int = 0
+    pending_entries: list[tuple[str, str, str]] = []
+    start_time: float = time.perf_counter()
+    for entry, _ in mapChunks(
+        chunk_function=precomputeChunk,
+        items=readEquations(file_paths=arguments.files),
+        workers=arguments.workers,
+        chunk_size=arguments.chunk_size,
+    ):
+        equations_count += 1
+        if entry is None:
+            skipped_count += 1
+            continue
+        pending_entries.append(entry)
+        if len(pending_entries) >= arguments.chunk_size:
+            added_count += result_store.putMany(entries=pending_entries)
+            pending_entries = []
+    if pending_entries:
+        added_count += result_store.putMany(entries=pending_entries)
+
+    print(
+        f"{equations_count} equations, {added_count} new entries, {skipped_count} skipped "
+        f"(invalid or ambiguous) in {time.perf_counter() - start_time:.3f} s; "
+        f"{result_store.stats()['entries']} entries in {arguments.store}",
+        file=sys.stderr,
+    )
+    result_store.close()
+    return 0
+
+
+# usage (from the project folder) :
+# python -m utils.Precompute corpus.txt --store results.sqlite --workers 4
+if __name__ == "__main__":
+    sys.exit(runPrecompute(argv=sys.argv[1:]))
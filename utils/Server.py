@@ -0,0 +1,375 @@
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from src.Batch import BatchItemResult
+
+# region Balance Server
+
+
+class BalanceServer:
+    """
+    A long-running local server balancing equations sent over a socket.
+
+    The protocol is one JSON object per line in both directions:
+        {"op": "balance", "equation": "H2 + O2 = H2O", "id": 7}
+            -> {"id": 7, "balanced_equation": "...", "error_msg": "", ...}
+        {"op": "health"} -> {"status": "ok", "uptime": ...}
+        {"op": "stats"}  -> request, batch and cache counters
+    "op" defaults to "balance" and "id" is echoed back when given. A client
+    may pipeline requests; the responses of a connection come back in the
+    order of its requests.
+
+    The process stays up, so the parser, the balance cache and the solver
+    are warm for every request. Balance requests arriving within batch_window
+    seconds of each other, from any connection, are merged into one
+    micro-batch balanced by batch_function on a worker thread, keeping the
+    event loop free for I/O. With CREB.executeMany and deduplicate=True, the
+    equations of a batch that share a composition matrix are solved once.
+
+    Attributes:
+        batch_function : Callable[[list[str]], list[BatchItemResult]]
+            The function balancing a batch of equations, returning one result
+            per equation in order (CREB.executeMany with deduplicate=True).
+        stats_function : Callable[[], dict]
+            Returns extra statistics for the stats endpoint (CREB.cacheStats).
+        host : str
+            The TCP host, ignored when unix_path is given.
+        port : int
+            The TCP port; 0 picks a free one.
+        unix_path : str
+            The Unix socket path, None for TCP.
+        batch_window : float
+            Seconds to wait for more requests after the first of a batch.
+        max_batch_size : int
+            Maximum number of equations per batch.
+        requests : int
+            Number of balance requests answered.
+        errors : int
+            Number of balance requests that failed.
+        batches : int
+            Number of micro-batches run.
+
+    Methods:
+        start() -> None:
+            Starts listening and the batching loop.
+        stop() -> None:
+            Stops listening and the batching loop.
+        address() -> str | tuple:
+            Returns the address the server listens on.
+        handleRequest(request: dict) -> dict:
+            Answers one decoded request.
+        handleConnection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            Serves the requests of one client connection.
+        runBatches() -> None:
+            Collects pending requests into micro-batches and balances them.
+        stats() -> dict:
+            Returns the server counters.
+    """
+
+    def __init__(
+        self,
+        batch_function: Callable[[list[str]], list[BatchItemResult]],
+        stats_function: Callable[[], dict] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        unix_path: str = None,
+        batch_window: float = 0.002,
+        max_batch_size: int = 64,
+    ) -> None:
+        """
+        Constructs all the necessary attributes for the BalanceServer object.
+
+        Parameters:
+            batch_function : Callable[[list[str]], list[BatchItemResult]]
+                The function balancing a batch of equations, in order.
+            stats_function : Callable[[], dict]
+                Returns extra statistics for the stats endpoint.
+            host : str
+                The TCP host, ignored when unix_path is given.
+            port : int
+                The TCP port; 0 picks a free one.
+            unix_path : str
+                The Unix socket path, None for TCP.
+            batch_window : float
+                Seconds to wait for more requests after the first of a batch.
+            max_batch_size : int
+                Maximum number of equations per batch.
+        """
+        self.batch_function: Callable[[list[str]], list[BatchItemResult]] = (
+            batch_function
+        )
+        self.stats_function: Callable[[], dict] = stats_function
+        self.host: str = host
+        self.port: int = port
+        self.unix_path: str = unix_path
+        self.batch_window: float = batch_window
+        self.max_batch_size: int = max_batch_size
+        self.requests: int = 0
+        self.errors: int = 0
+        self.batches: int = 0
+        self.start_time: float = time.monotonic()
+        self.pending_queue: asyncio.Queue = None
+        self.server: asyncio.AbstractServer = None
+        self.batch_task: asyncio.Task = None
+
+    async def start(self) -> None:
+        """
+        Starts listening and the batching loop.
+        """
+        self.pending_queue = asyncio.Queue()
+        self.batch_task = asyncio.create_task(self.runBatches())
+        if self.unix_path:
+            self.server = await asyncio.start_unix_server(
+                self.handleConnection, path=self.unix_path
+            )
+        else:
+            self.server = await asyncio.start_server(
+                self.handleConnection, host=self.host, port=self.port
+            )
+        self.start_time = time.monotonic()
+
+    async def stop(self) -> None:
+        """
+        Stops listening and the batching loop.
+        """
+        self.server.close()
+        await self.server.wait_closed()
+        self.batch_task.cancel()
+
+    def address(self) -> "str | tuple":
+        """
+        Returns the address the server listens on.
+
+        Returns:
+            str | tuple: The Unix socket path or the (host, port) pair.
+        """
+        return self.server.sockets[0].getsockname()
+
+    def stats(self) -> dict:
+        """
+        Returns the server counters, with the extra statistics of
+        stats_function under "cache".
+
+        Returns:
+            dict: The server statistics.
+        """
+        stats_dict: dict = {
+            "uptime": round(time.monotonic() - self.start_time, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": round(self.requests / self.batches, 2)
+            if self.batches
+            else 0.0,
+            "pending": self.pending_queue.qsize() if self.pending_queue else 0,
+        }
+        if self.stats_function is not None:
+            stats_dict["cache"] = self.stats_function()
+        return stats_dict
+
+    async def handleRequest(self, request: dict) -> dict:
+        """
+        Answers one decoded request. Balance requests are queued for the next
+        micro-batch; health and stats are answered right away.
+
+        Parameters:
+            request : dict
+                The decoded JSON request.
+
+        Returns:
+            dict: The response, without the echoed id.
+        """
+        operation: str = request.get("op", "balance")
+        if operation == "health":
+            return {"status": "ok", "uptime": round(time.monotonic() - self.start_time, 3)}
+        if operation == "stats":
+            return self.stats()
+        if operation != "balance":
+            return {"error_msg": f"Unknown op: {operation!r}"}
+        chemical_equation = request.get("equation")
+        if not isinstance(chemical_equation, str):
+            return {"error_msg": 'A balance request needs an "equation" string'}
+
+        result_future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self.pending_queue.put((chemical_equation, result_future))
+        batch_item_result: BatchItemResult = await result_future
+        response: dict = batch_item_result.toDict()
+        del response["index"]
+        return response
+
+    async def handleConnection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serves the requests of one client connection. Every line is handled in
+        its own task so pipelined requests share batches; a writer task sends
+        the responses back in request order.
+
+        Parameters:
+            reader : asyncio.StreamReader
+                The incoming side of the connection.
+            writer : asyncio.StreamWriter
+                The outgoing side of the connection.
+        """
+        responses_queue: asyncio.Queue = asyncio.Queue()
+
+        async def writeResponses() -> None:
+            while True:
+                response_task: asyncio.Task = await responses_queue.get()
+                if response_task is None:
+                    break
+                writer.write((json.dumps(await response_task) + "\n").encode())
+                await writer.drain()
+
+        async def answerLine(line: bytes) -> dict:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("A request must be a JSON object")
+            except ValueError as error:
+                return {"error_msg": f"Invalid request: {error}"}
+            response: dict = await self.handleRequest(request=request)
+            if "id" in request:
+                response = {"id": request["id"], **response}
+            return response
+
+        writer_task: asyncio.Task = asyncio.create_task(writeResponses())
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    await responses_queue.put(asyncio.create_task(answerLine(line)))
+        finally:
+            await responses_queue.put(None)
+            try:
+                await writer_task
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def runBatches(self) -> None:
+        """
+        Collects pending requests into micro-batches: after the first request
+        of a batch it waits at most batch_window seconds (or until
+        max_batch_size requests) for more, then balances the batch with
+        batch_function on a worker thread and resolves every waiting request.
+        """
+        event_loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        while True:
+            batch_list: list[tuple[str, asyncio.Future]] = [await self.pending_queue.get()]
+            deadline: float = event_loop.time() + self.batch_window
+            while len(batch_list) < self.max_batch_size:
+                try:
+                    batch_list.append(self.pending_queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout: float = deadline - event_loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch_list.append(
+                        await asyncio.wait_for(self.pending_queue.get(), timeout=timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            results_list: list[BatchItemResult] = await event_loop.run_in_executor(
+                None,
+                self.batch_function,
+                [chemical_equation for chemical_equation, _ in batch_list],
+            )
+            self.batches += 1
+            for (_, result_future), batch_item_result in zip(batch_list, results_list):
+                self.requests += 1
+                if batch_item_result.error_msg:
+                    self.errors += 1
+                if not result_future.done():
+                    result_future.set_result(batch_item_result)
+
+
+# end region
+
+
+def buildArgumentParser() -> argparse.ArgumentParser:
+    """
+    Builds the parser of the server arguments.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser.
+    """
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="CREB server",
+        description="Serve CREB over a local socket, one JSON request and response per line.",
+    )
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=8765)
+    argument_parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    argument_parser.add_argument(
+        "--batch-window", type=float, default=0.002, help="seconds to gather a batch"
+    )
+    argument_parser.add_argument("--max-batch-size", type=int, default=64)
+    argument_parser.add_argument(
+        "--max-formula-length", type=int, help="characters allowed per species"
+    )
+    argument_parser.add_argument(
+        "--max-atom-count", type=int, help="atoms allowed per species, after multipliers"
+    )
+    argument_parser.add_argument(
+        "--max-species-count", type=int, help="species allowed per equation"
+    )
+    argument_parser.add_argument(
+        "--max-seconds", type=float, help="wall-clock seconds allowed per equation"
+    )
+    return argument_parser
+
+
+async def serveForever(balance_server: BalanceServer) -> None:
+    """
+    Starts a server and runs it until the task is cancelled.
+
+    Parameters:
+        balance_server : BalanceServer
+            The server to run.
+    """
+    await balance_server.start()
+    try:
+        await balance_server.server.serve_forever()
+    finally:
+        await balance_server.stop()
+
+
+# usage (from the project folder) :
+# python -m utils.Server --port 8765 --max-seconds 0.5
+# echo '{"op": "balance", "equation": "H2 + O2 = H2O"}' | nc 127.0.0.1 8765
+if __name__ == "__main__":
+    from functools import partial
+    import CREB
+
+    arguments: argparse.Namespace = buildArgumentParser().parse_args()
+    CREB.configureBudget(
+        max_formula_length=arguments.max_formula_length,
+        max_atom_count=arguments.max_atom_count,
+        max_species_count=arguments.max_species_count,
+        max_seconds=arguments.max_seconds,
+    )
+    try:
+        asyncio.run(
+            serveForever(
+                BalanceServer(
+                    # one process: duplicates within a batch share a solve
+                    batch_function=partial(
+                        CREB.executeMany, workers=1, deduplicate=True
+                    ),
+                    stats_function=CREB.cacheStats,
+                    host=arguments.host,
+                    port=arguments.port,
+                    unix_path=arguments.unix,
+                    batch_window=arguments.batch_window,
+                    max_batch_size=arguments.max_batch_size,
+                )
+            )
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+
+startup_time_target: float = 0.1
+"""float: Upper bound, in seconds, for importing CREB and balancing one simple equation in a fresh interpreter."""
+
+startup_probe: str = """
+import json, sys, time
+start = time.perf_counter()
+import CREB
+CREB.execute(input_chemical_equation="H2 + O2 = H2O")
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "sympy_imported": "sympy" in sys.modules}))
+"""
+"""str: Code run in a fresh interpreter to measure the cold start of CREB."""
+
+
+def measureStartupTime(repeat: int = 5) -> dict:
+    """
+    Measures the cold start of CREB (import plus one simple balance) in fresh
+    interpreters and keeps the fastest run, which is the least noisy one.
+
+    Parameters:
+        repeat : int
+            Number of fresh interpreters to start.
+
+    Returns:
+        dict: The best elapsed time, the target and whether sympy was imported.
+    """
+    project_directory: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs_list: list[dict] = []
+    for _ in range(repeat):
+        completed_process = subprocess.run(
+            [sys.executable, "-c", startup_probe],
+            cwd=project_directory,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        runs_list.append(json.loads(completed_process.stdout))
+
+    return {
+        "elapsed": min(run["elapsed"] for run in runs_list),
+        "target": startup_time_target,
+        "sympy_imported": any(run["sympy_imported"] for run in runs_list),
+    }
+
+
+# usage (from the project folder) : python -m utils.Startup
+# exits with status 1 when the cold start misses the target or imports sympy
+if __name__ == "__main__":
+    startup_report: dict = measureStartupTime()
+    print(json.dumps(startup_report))
+    if (
+        startup_report["elapsed"] > startup_report["target"]
+        or startup_report["sympy_imported"]
+    ):
+        sys.exit(1)